@@ -0,0 +1,228 @@
+"""
+Пакетный прогон BIM Core по нескольким моделям в пуле процессов.
+
+Задания берутся из манифеста или из папки с IFC:
+
+  # манифест: [{"ifc": ..., "tz": ..., "out": ...}, ...] или {"jobs": [...]};
+  # относительные пути считаются от папки манифеста, вместо "ifc" можно "spaces"
+  python batch_run.py --manifest jobs.json --jobs 4
+
+  # все *.ifc папки против одного ТЗ: результаты в <out>/<имя модели>/
+  python batch_run.py --ifc-dir models/ --tz result.json --out runs/batch --jobs 4
+
+Каждое задание — обычный run.run_pipeline в отдельном процессе: в своей папке
+out появляются stubs.json, match_report.json и spaces.json (с индексом
+spaces.spatial.json). Ошибка одного задания не останавливает остальные.
+Сводка со временем каждого задания и общим временем пишется в
+batch_summary.json (или --summary).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.append(os.path.dirname(__file__))
+
+from run import SUGGESTIONS_LIMIT, run_pipeline
+from stub_collisions import COLLISION_MODES, STUB_TOLERANCE, tolerance_arg
+
+BATCH_JOBS = int(os.environ.get("BIM_BATCH_JOBS", str(os.cpu_count() or 1)))
+
+
+def load_manifest(path):
+    """Задания манифеста с путями, разрешёнными относительно его папки."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    items = data.get("jobs", []) if isinstance(data, dict) else data
+    base = path.resolve().parent
+    jobs = []
+    for i, item in enumerate(items):
+        if "tz" not in item or "out" not in item or not (item.get("ifc") or item.get("spaces")):
+            raise ValueError(f"Задание {i} манифеста {path}: нужны tz, out и ifc или spaces")
+        job = {}
+        for key in ("ifc", "spaces", "tz", "out"):
+            if item.get(key):
+                job[key] = str(base / item[key])
+        jobs.append(job)
+    return jobs
+
+
+def jobs_from_dir(ifc_dir, tz_path, out_dir):
+    """Задание на каждый *.ifc папки; результаты — в out_dir/<имя модели>/."""
+    jobs = []
+    for ifc in sorted(Path(ifc_dir).glob("*.ifc")):
+        jobs.append({"ifc": str(ifc), "tz": str(tz_path), "out": str(Path(out_dir) / ifc.stem)})
+    return jobs
+
+
+def run_job(job, options):
+    """Выполняется в процессе пула; исключения превращаются в статус error."""
+    started = time.perf_counter()
+    result = dict(job)
+    try:
+        summary = run_pipeline(
+            job["tz"],
+            job["out"],
+            ifc_path=job.get("ifc"),
+            spaces_path=job.get("spaces"),
+            spaces_file=os.path.join(job["out"], "spaces.json"),
+            **options,
+        )
+        result.update(summary)
+        result["status"] = "ok"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _failed(job, error):
+    """Результат задания, которое не удалось выполнить в пуле (сбой процесса, pickle)."""
+    result = dict(job)
+    result["status"] = "error"
+    result["error"] = f"{type(error).__name__}: {error}"
+    result["seconds"] = 0.0
+    return result
+
+
+def run_batch(jobs, workers=None, options=None):
+    """
+    Прогоняет задания в пуле из workers процессов; возвращает сводку.
+    Результаты заданий — в порядке манифеста, независимо от порядка завершения.
+    Сбой пула (BrokenProcessPool, непиклируемое задание) записывается ошибкой
+    тех заданий, которых он коснулся; остальные выполняются.
+    """
+    workers = max(1, min(workers or BATCH_JOBS, len(jobs) or 1))
+    options = dict(options or {})
+    # потоки геометрии делят ядра между процессами пула
+    if options.get("geometry_workers") is None:
+        options["geometry_workers"] = max(1, (os.cpu_count() or 1) // workers)
+
+    started = time.perf_counter()
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for i, job in enumerate(jobs):
+            try:
+                futures[pool.submit(run_job, job, options)] = i
+            except Exception as e:
+                results[i] = _failed(job, e)
+                print(f"⚠️ [{i + 1}/{len(jobs)}] {job.get('ifc') or job.get('spaces')}: {e}")
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = _failed(jobs[i], e)
+            results[i] = result
+            name = jobs[i].get("ifc") or jobs[i].get("spaces")
+            if result["status"] == "ok":
+                print(
+                    f"✅ [{i + 1}/{len(jobs)}] {name}: сопоставлено {result['matched']} "
+                    f"из {result['spaces']} за {result['seconds']:.2f} с"
+                )
+            else:
+                print(f"⚠️ [{i + 1}/{len(jobs)}] {name}: {result['error']}")
+    wall = time.perf_counter() - started
+
+    timings = [r["seconds"] for r in results]
+    ok = [r for r in results if r["status"] == "ok"]
+    return {
+        "workers": workers,
+        "total": len(results),
+        "ok": len(ok),
+        "failed": len(results) - len(ok),
+        "spaces": sum(r["spaces"] for r in ok),
+        "matched": sum(r["matched"] for r in ok),
+        "unmatched": sum(r["unmatched"] for r in ok),
+        "collisions": sum(r["collisions"] for r in ok),
+        "timings": {
+            "wall_seconds": round(wall, 3),
+            "job_seconds_total": round(sum(timings), 3),
+            "job_seconds_max": max(timings, default=0.0),
+            "job_seconds_mean": round(sum(timings) / len(timings), 3) if timings else 0.0,
+        },
+        "jobs": results,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description="Пакетный прогон BIM Core")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--manifest", help="JSON со списком заданий {ifc|spaces, tz, out}")
+    src.add_argument("--ifc-dir", help="Папка с *.ifc (нужны --tz и --out)")
+    p.add_argument("--tz", help="ТЗ для всех моделей --ifc-dir")
+    p.add_argument("--out", help="Папка результатов для --ifc-dir")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Процессов в пуле (по умолчанию BIM_BATCH_JOBS или число CPU)",
+    )
+    p.add_argument("--summary", default=None, help="Путь сводки (по умолчанию batch_summary.json)")
+    p.add_argument("--geometry-workers", type=int, default=None)
+    p.add_argument("--geometry", choices=("exact", "fast", "stream"), default="exact")
+    p.add_argument("--no-cache", action="store_true")
+    p.add_argument("--refresh", action="store_true")
+    p.add_argument("--cache-dir", default=None)
+    p.add_argument("--cache-max-mb", type=int, default=None)
+    p.add_argument("--suggestions", type=int, default=SUGGESTIONS_LIMIT)
+    p.add_argument("--mapping-db", default=None)
+    p.add_argument("--no-mappings", action="store_true")
+    p.add_argument("--stub-tolerance", type=tolerance_arg, default=STUB_TOLERANCE)
+    p.add_argument("--stub-collisions", choices=COLLISION_MODES, default="flag")
+    p.add_argument("--columnar", action="store_true")
+    args = p.parse_args()
+
+    if args.manifest:
+        jobs = load_manifest(args.manifest)
+        summary_path = args.summary or str(Path(args.manifest).resolve().parent / "batch_summary.json")
+    else:
+        if not args.tz or not args.out:
+            p.error("--ifc-dir требует --tz и --out")
+        jobs = jobs_from_dir(args.ifc_dir, args.tz, args.out)
+        summary_path = args.summary or os.path.join(args.out, "batch_summary.json")
+    if not jobs:
+        print("⚠️ Нет заданий для пакетного прогона")
+        return 1
+
+    summary = run_batch(
+        jobs,
+        workers=args.jobs,
+        options={
+            "geometry_workers": args.geometry_workers,
+            "geometry": args.geometry,
+            "use_cache": not args.no_cache,
+            "refresh": args.refresh,
+            "cache_dir": args.cache_dir,
+            "cache_max_mb": args.cache_max_mb,
+            "suggestions": args.suggestions,
+            "mapping_db": args.mapping_db,
+            "use_mappings": not args.no_mappings,
+            "stub_tolerance": args.stub_tolerance,
+            "stub_collisions": args.stub_collisions,
+            "columnar": args.columnar,
+        },
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    mark = "⚠️" if summary["failed"] else "✅"
+    print(
+        f"{mark} Пакет: {summary['ok']} из {summary['total']} заданий за "
+        f"{summary['timings']['wall_seconds']:.2f} с ({summary['workers']} процессов), "
+        f"сводка: {summary_path}"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
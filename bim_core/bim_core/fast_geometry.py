@@ -0,0 +1,240 @@
+"""
+Быстрая геометрия помещения без триангуляции B-rep ядром ifcopenshell.
+
+Положение помещения берётся из цепочки ObjectPlacement, форма — из
+параметров представления:
+  - IfcExtrudedAreaSolid с профилем IfcRectangleProfileDef или
+    IfcArbitraryClosedProfileDef (IfcPolyline / IfcIndexedPolyCurve из отрезков);
+  - IfcFacetedBrep из плоских граней IfcPolyLoop (в том числе с отверстиями);
+  - IfcBoundingBox (представление «Box»).
+
+Из параметров строится простая оболочка (призма или грани B-rep, веером
+на треугольники) в мировых координатах и метрах, по ней считается та же
+статистика, что и в geometry_stats. Если представление не распознано,
+возвращается None — такие помещения считаются точным путём.
+"""
+
+import numpy as np
+import ifcopenshell.util.placement
+import ifcopenshell.util.unit
+
+from geometry_stats import compute_stats
+
+REPRESENTATIONS = ("Body", "Box")
+
+
+def unit_scale(model):
+    """Множитель длин модели в метры."""
+    return ifcopenshell.util.unit.calculate_unit_scale(model)
+
+
+def _placement_matrix(product):
+    placement = product.ObjectPlacement
+    if placement is None:
+        return np.eye(4)
+    return ifcopenshell.util.placement.get_local_placement(placement)
+
+
+def _axis_matrix(placement):
+    if placement is None:
+        return np.eye(4)
+    return ifcopenshell.util.placement.get_axis2placement(placement)
+
+
+def _profile_points(profile):
+    """Контур профиля [(x, y), ...] в системе профиля или None."""
+    if profile.is_a("IfcRectangleProfileDef"):
+        hx, hy = profile.XDim / 2.0, profile.YDim / 2.0
+        points = np.array([[-hx, -hy], [hx, -hy], [hx, hy], [-hx, hy]], dtype=float)
+        position = getattr(profile, "Position", None)
+        if position is not None:
+            m = _axis_matrix(position)
+            points = points @ m[:2, :2].T + m[:2, 3]
+        return points
+
+    if profile.is_a("IfcArbitraryClosedProfileDef") and not profile.is_a(
+        "IfcArbitraryProfileDefWithVoids"
+    ):
+        curve = profile.OuterCurve
+        if curve.is_a("IfcPolyline"):
+            points = [p.Coordinates[:2] for p in curve.Points]
+        elif curve.is_a("IfcIndexedPolyCurve"):
+            segments = curve.Segments
+            if segments and any(not s.is_a("IfcLineIndex") for s in segments):
+                return None
+            coords = curve.Points.CoordList
+            if segments:
+                order = []
+                for s in segments:
+                    for i in s.wrappedValue:
+                        if not order or order[-1] != i:
+                            order.append(i)
+                points = [coords[i - 1][:2] for i in order]
+            else:
+                points = [c[:2] for c in coords]
+        else:
+            return None
+        points = np.array(points, dtype=float)
+        if len(points) > 1 and np.allclose(points[0], points[-1]):
+            points = points[:-1]
+        return points if len(points) >= 3 else None
+    return None
+
+
+def _fan(start, count, reverse=False):
+    """
+    Треугольники веером для многоугольника из count вершин, начиная с индекса start.
+    Для невыпуклого контура часть треугольников вывернута, но их знаковые
+    площади и объёмы в сумме дают точный результат.
+    """
+    tris = [(start, start + i, start + i + 1) for i in range(1, count - 1)]
+    return [(a, c, b) for a, b, c in tris] if reverse else tris
+
+
+def _prism(points, extrusion):
+    """Вершины, треугольники и номера граней призмы: контур points (n, 3) и вектор выдавливания."""
+    n = len(points)
+    verts = np.vstack([points, points + extrusion])
+    faces = _fan(0, n, reverse=True) + _fan(n, n)
+    face_ids = [0] * (n - 2) + [1] * (n - 2)
+    for i in range(n):
+        j = (i + 1) % n
+        faces += [(i, j, n + j), (i, n + j, n + i)]
+        face_ids += [2 + i, 2 + i]
+    return verts, faces, face_ids
+
+
+def _extruded_solid(item):
+    points = _profile_points(item.SweptArea)
+    if points is None:
+        return None
+    direction = np.array(item.ExtrudedDirection.DirectionRatios, dtype=float)
+    direction = direction / np.linalg.norm(direction)
+    points3 = np.column_stack([points, np.zeros(len(points))])
+    verts, faces, face_ids = _prism(points3, direction * item.Depth)
+    m = _axis_matrix(getattr(item, "Position", None))
+    return verts @ m[:3, :3].T + m[:3, 3], faces, face_ids
+
+
+def _loop_normal(loop):
+    """Нормаль контура по формуле Ньюэлла (длина — удвоенная площадь)."""
+    points = np.asarray(loop, dtype=float)
+    nxt = np.roll(points, -1, axis=0)
+    return np.cross(points, nxt).sum(axis=0)
+
+
+def _faceted_brep(item):
+    verts = []
+    faces = []
+    face_ids = []
+    for n, face in enumerate(item.Outer.CfsFaces):
+        outer = None
+        # внешний контур первым: по нему ориентируются отверстия
+        bounds = sorted(face.Bounds, key=lambda b: not b.is_a("IfcFaceOuterBound"))
+        for bound in bounds:
+            if not bound.Bound.is_a("IfcPolyLoop"):
+                return None
+            loop = [p.Coordinates for p in bound.Bound.Polygon]
+            if not bound.Orientation:
+                loop = loop[::-1]
+            if len(loop) < 3:
+                continue
+            if outer is None:
+                outer = _loop_normal(loop)
+            elif np.dot(_loop_normal(loop), outer) > 0:
+                # отверстие обходится против внешнего контура, чтобы его
+                # треугольники вычитались из площади и объёма грани
+                loop = loop[::-1]
+            faces += _fan(len(verts), len(loop))
+            face_ids += [n] * (len(loop) - 2)
+            verts += loop
+    if not faces:
+        return None
+    return np.array(verts, dtype=float), faces, face_ids
+
+
+def _bounding_box(item):
+    corner = np.array(item.Corner.Coordinates, dtype=float)
+    points = corner + np.array(
+        [[0, 0, 0], [item.XDim, 0, 0], [item.XDim, item.YDim, 0], [0, item.YDim, 0]],
+        dtype=float,
+    )
+    return _prism(points, np.array([0.0, 0.0, item.ZDim]))
+
+
+_ITEM_HANDLERS = {
+    "IfcExtrudedAreaSolid": _extruded_solid,
+    "IfcFacetedBrep": _faceted_brep,
+    "IfcBoundingBox": _bounding_box,
+}
+
+
+def _representation_mesh(representation):
+    verts = []
+    faces = []
+    face_ids = []
+    offset = 0
+    face_offset = 0
+    for item in representation.Items:
+        handler = _ITEM_HANDLERS.get(item.is_a())
+        mesh = handler(item) if handler else None
+        if mesh is None:
+            return None
+        item_verts, item_faces, item_face_ids = mesh
+        verts.append(item_verts)
+        faces += [(a + offset, b + offset, c + offset) for a, b, c in item_faces]
+        face_ids += [i + face_offset for i in item_face_ids]
+        offset += len(item_verts)
+        face_offset += max(item_face_ids) + 1
+    if not verts:
+        return None
+    return np.vstack(verts), faces, face_ids
+
+
+def shape_mesh(shape):
+    """
+    Оболочка (verts, faces, face_ids) представления Body или Box формы
+    IfcProductDefinitionShape в системе помещения, в единицах модели, или None.
+    shape — сущность ifcopenshell или любой объект с тем же интерфейсом
+    (атрибуты IFC и is_a), например step_scanner.StepEntity.
+    """
+    if shape is None:
+        return None
+    by_id = {r.RepresentationIdentifier: r for r in shape.Representations if r is not None}
+    for identifier in REPRESENTATIONS:
+        representation = by_id.get(identifier)
+        if representation is None:
+            continue
+        try:
+            mesh = _representation_mesh(representation)
+        except (AttributeError, TypeError, ValueError, IndexError):
+            mesh = None
+        if mesh is not None:
+            verts, faces, face_ids = mesh
+            return verts, np.array(faces, dtype=np.int64), np.array(face_ids, dtype=np.int64)
+    return None
+
+
+def place_mesh(mesh, matrix, scale=1.0):
+    """Оболочка в мировых координатах и метрах: matrix — размещение помещения (4x4)."""
+    verts, faces, face_ids = mesh
+    return (verts @ matrix[:3, :3].T + matrix[:3, 3]) * scale, faces, face_ids
+
+
+def space_mesh(space, scale=1.0):
+    """Упрощённая оболочка помещения (verts, faces, face_ids) в мировых координатах, в метрах, или None."""
+    mesh = shape_mesh(space.Representation)
+    if mesh is None:
+        return None
+    return place_mesh(mesh, _placement_matrix(space), scale)
+
+
+def fast_space_geometry(space, scale=1.0):
+    """Статистика геометрии (как geometry_stats) без триангуляции или None."""
+    try:
+        mesh = space_mesh(space, scale)
+    except Exception:
+        return None
+    if mesh is None:
+        return None
+    return compute_stats(*mesh)
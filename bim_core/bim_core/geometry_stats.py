@@ -0,0 +1,90 @@
+"""
+Статистика геометрии помещения по буферам вершин и граней ifcopenshell.
+
+Буферы триангуляции (verts_buffer / faces_buffer) просматриваются как
+массивы NumPy без поэлементного копирования в списки Python, и за один
+векторный проход считаются:
+  - centroid   — центр масс объёма (по знаковым объёмам тетраэдров
+                 «начало координат — треугольник»); для незамкнутых
+                 оболочек — среднее вершин;
+  - bbox       — габаритный прямоугольник по осям;
+  - floor_area — площадь пола: проекция на XY граней, обращённых вниз;
+  - volume     — объём замкнутой оболочки.
+"""
+
+import numpy as np
+
+# грань считается обращённой вниз, если |nz| не меньше этой доли длины нормали
+_FLOOR_NORMAL_Z = 0.9
+_MIN_VOLUME = 1e-9
+
+
+def shape_arrays(geometry):
+    """(verts (n, 3) float64, faces (m, 3) int32) триангуляции ifcopenshell."""
+    verts_buffer = getattr(geometry, "verts_buffer", None)
+    faces_buffer = getattr(geometry, "faces_buffer", None)
+    if verts_buffer is not None and faces_buffer is not None:
+        verts = np.frombuffer(verts_buffer, dtype=np.float64)
+        faces = np.frombuffer(faces_buffer, dtype=np.int32)
+    else:  # старые версии ifcopenshell без буферов
+        verts = np.asarray(geometry.verts, dtype=np.float64)
+        faces = np.asarray(geometry.faces, dtype=np.int32)
+    return verts.reshape(-1, 3), faces.reshape(-1, 3)
+
+
+def compute_stats(verts, faces, face_ids=None):
+    """
+    Словарь centroid/bbox/floor_area/volume или None для пустой геометрии.
+    face_ids — номер исходной грани для каждого треугольника: нормали
+    треугольников одной грани суммируются (так грань с отверстием,
+    разбитая веером со знаковыми треугольниками, даёт верную площадь).
+    """
+    if len(verts) == 0:
+        return None
+
+    lo = verts.min(axis=0)
+    hi = verts.max(axis=0)
+    centroid = verts.mean(axis=0)
+    volume = 0.0
+    floor_area = 0.0
+
+    if len(faces):
+        a = verts[faces[:, 0]]
+        b = verts[faces[:, 1]]
+        c = verts[faces[:, 2]]
+        normals = np.cross(b - a, c - a)
+
+        # знаковые объёмы тетраэдров (0, a, b, c), умноженные на 6
+        signed = np.einsum("ij,ij->i", a, np.cross(b, c))
+        total = signed.sum()
+        if abs(total) > 6 * _MIN_VOLUME:
+            volume = abs(total) / 6.0
+            centroid = (signed[:, None] * (a + b + c)).sum(axis=0) / (4.0 * total)
+            # ориентация граней наружу: при обратной ориентации знак объёма отрицательный
+            nz = normals[:, 2] * np.sign(total)
+        else:
+            nz = normals[:, 2]
+
+        if face_ids is not None:
+            summed = np.zeros((int(face_ids.max()) + 1, 3))
+            np.add.at(summed, face_ids, normals)
+            normals = summed
+            summed_nz = np.zeros(len(summed))
+            np.add.at(summed_nz, face_ids, nz)
+            nz = summed_nz
+        length = np.linalg.norm(normals, axis=1)
+        down = (nz < 0) & (-nz >= _FLOOR_NORMAL_Z * length)
+        floor_area = float(-nz[down].sum() / 2.0)
+
+    return {
+        "centroid": [float(x) for x in centroid],
+        "bbox": {"min": [float(x) for x in lo], "max": [float(x) for x in hi]},
+        "floor_area": floor_area,
+        "volume": float(volume),
+    }
+
+
+def geometry_stats(geometry):
+    """Статистика по объекту триангуляции ifcopenshell (shape.geometry)."""
+    verts, faces = shape_arrays(geometry)
+    return compute_stats(verts, faces)
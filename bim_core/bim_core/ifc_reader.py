@@ -4,74 +4,234 @@ import json
 import argparse
 import os
 
+from fast_geometry import fast_space_geometry, unit_scale
+from geometry_stats import geometry_stats
+from spaces_columnar import spaces_columnar_path, write_spaces_columnar
+from spatial_index import SpatialIndex, spatial_index_path
+from step_scanner import scan
 
-def get_space_coordinates(space):
-    """Вычисление координат центра помещения"""
+# Потоков для триангуляции помещений (1 — последовательно, через create_shape)
+GEOMETRY_WORKERS = int(os.environ.get("BIM_GEOMETRY_WORKERS", str(os.cpu_count() or 1)))
+
+
+GEOMETRY_MODES = ("exact", "fast", "stream")
+
+# система координат помещений в spaces.json: во всех режимах мировая, в метрах
+COORDINATES_FRAME = "world"
+
+
+def _geom_settings(world_coords=True):
+    settings = ifcopenshell.geom.settings()
+    if world_coords:
+        settings.set("use-world-coords", True)
+    return settings
+
+
+def get_space_geometry(space, world_coords=True):
+    """
+    Статистика геометрии помещения (см. geometry_stats) или None, если триангуляция не удалась.
+    По умолчанию в мировых координатах — в той же системе, что режимы fast и stream.
+    """
     try:
-        # Пытаемся получить геометрию через ifcopenshell.geom
-        settings = ifcopenshell.geom.settings()
+        settings = _geom_settings(world_coords)
         shape = ifcopenshell.geom.create_shape(settings, space)
-        verts = shape.geometry.verts  # список координат вершин (x1,y1,z1, x2,y2,z2, …)
-
-        xs = verts[0::3]
-        ys = verts[1::3]
-        zs = verts[2::3]
-
-        # Возвращаем центр (среднее по осям)
-        return [
-            float(sum(xs) / len(xs)),
-            float(sum(ys) / len(ys)),
-            float(sum(zs) / len(zs)),
-        ]
+        return geometry_stats(shape.geometry)
     except Exception:
-        # Если не удалось, возвращаем [0,0,0] как заглушку
-        return [0.0, 0.0, 0.0]
+        return None
 
 
-def export_spaces(ifc_path, out_path):
+def get_space_coordinates(space):
+    """Вычисление координат центра помещения"""
+    stats = get_space_geometry(space)
+    # Если не удалось, возвращаем [0,0,0] как заглушку
+    return stats["centroid"] if stats else [0.0, 0.0, 0.0]
+
+
+def _iter_space_shapes(model, spaces, workers, world_coords=True):
+    """Пары (id сущности, триангуляция) от многопоточного итератора геометрии, только IfcSpace."""
+    settings = _geom_settings(world_coords)
+    iterator = ifcopenshell.geom.iterator(settings, model, workers, include=spaces)
+    if not iterator.initialize():
+        return
+    while True:
+        shape = iterator.get()
+        yield shape.id, shape.geometry
+        if not iterator.next():
+            break
+
+
+def get_spaces_geometry(model, spaces, workers=None, world_coords=True):
+    """
+    Статистика геометрии всех помещений: {id сущности: dict или None}.
+    При workers > 1 помещения триангулируются пакетно итератором ifcopenshell
+    с теми же настройками, что и create_shape, поэтому результат совпадает
+    с последовательным get_space_geometry. Помещения, которые итератор
+    не смог обработать, считаются последовательно. Координаты мировые,
+    в метрах (как в fast и stream), если не передан world_coords=False.
+    """
+    workers = GEOMETRY_WORKERS if workers is None else workers
+    stats = {}
+    if workers > 1 and spaces:
+        try:
+            shapes = _iter_space_shapes(model, spaces, workers, world_coords)
+            for space_id, geometry in shapes:
+                result = geometry_stats(geometry)
+                if result:
+                    stats[space_id] = result
+        except Exception as e:
+            print(f"⚠️ Итератор геометрии недоступен ({e}), считаю последовательно")
+            stats = {}
+    for space in spaces:
+        if space.id() not in stats:
+            stats[space.id()] = get_space_geometry(space, world_coords)
+    return stats
+
+
+def get_spaces_geometry_fast(model, spaces, workers=None):
+    """
+    Быстрый режим: {id: (статистика или None, режим)}. Координаты мировые,
+    из цепочки ObjectPlacement и параметров представления (fast_geometry);
+    нераспознанные помещения триангулируются точным путём в мировых координатах.
+    """
+    scale = unit_scale(model)
+    result = {}
+    unresolved = []
+    for space in spaces:
+        stats = fast_space_geometry(space, scale)
+        if stats:
+            result[space.id()] = (stats, "fast")
+        else:
+            unresolved.append(space)
+    exact = get_spaces_geometry(model, unresolved, workers)
+    for space in unresolved:
+        stats = exact[space.id()]
+        result[space.id()] = (stats, "exact" if stats else "failed")
+    return result
+
+
+def _space_record(space_id, name, longname, description, storey, coords, stats, mode):
+    # Приоритет: LongName → Name → Description
+    display_name = longname or name or description or f"Space_{space_id}"
+    return {
+        "id": space_id,
+        "name": display_name,
+        "storey": storey,
+        "coordinates": coords,
+        "geometry": stats,
+        "geometry_mode": mode,
+    }
+
+
+def _write_spaces(spaces, out_path, index, columnar=False):
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"frame": COORDINATES_FRAME, "spaces": spaces}, f, ensure_ascii=False, indent=2)
+    index.save(spatial_index_path(out_path))
+    bin_path = spaces_columnar_path(out_path)
+    if columnar:
+        write_spaces_columnar(spaces, bin_path, frame=COORDINATES_FRAME)
+    elif os.path.exists(bin_path):
+        # spaces.bin от прошлого прогона не должен расходиться со spaces.json
+        os.remove(bin_path)
+
+    modes = {}
+    for sp in spaces:
+        modes[sp["geometry_mode"]] = modes.get(sp["geometry_mode"], 0) + 1
+    print(f"✅ Успешно сохранено {len(spaces)} помещений в {out_path} (геометрия: {modes})")
+
+
+def export_spaces_stream(ifc_path, out_path, columnar=False):
+    """
+    spaces.json потоковым сканером STEP (step_scanner) без загрузки модели:
+    память не растёт с размером файла. Геометрия считается по параметрам
+    формы, как в режиме fast (geometry_mode "fast"); если представление не
+    распознано, geometry — null, координаты — начало ObjectPlacement
+    помещения в мировых координатах и метрах (geometry_mode "placement").
+    """
+    result = scan(ifc_path)
+    index = SpatialIndex.from_scan(result)
+    spaces = []
+    for rid, global_id, name, description, longname, origin in result.space_origins():
+        stats = result.space_geometry(rid)
+        spaces.append(
+            _space_record(
+                global_id or "",
+                name or "",
+                longname or "",
+                description or "",
+                index.storey_name(global_id),
+                stats["centroid"] if stats else origin,
+                stats,
+                "fast" if stats else "placement",
+            )
+        )
+    _write_spaces(spaces, out_path, index, columnar)
+
+
+def export_spaces(ifc_path, out_path, workers=None, geometry="exact", columnar=False):
+    """columnar — дополнительно записать spaces.bin (spaces_columnar) рядом со spaces.json."""
+    if geometry not in GEOMETRY_MODES:
+        raise ValueError(f"Неизвестный режим геометрии: {geometry}")
+    if geometry == "stream":
+        export_spaces_stream(ifc_path, out_path, columnar)
+        return
     model = ifcopenshell.open(ifc_path)
 
+    ifc_spaces = model.by_type("IfcSpace")
+    index = SpatialIndex.from_model(model, unit_scale(model))
+    if geometry == "fast":
+        space_geometry = get_spaces_geometry_fast(model, ifc_spaces, workers)
+    else:
+        space_geometry = {
+            space_id: (stats, "exact" if stats else "failed")
+            for space_id, stats in get_spaces_geometry(model, ifc_spaces, workers).items()
+        }
+
     spaces = []
-    for space in model.by_type("IfcSpace"):
+    for space in ifc_spaces:
         space_id = space.GlobalId
         name = getattr(space, "Name", "") or ""
         longname = getattr(space, "LongName", "") or ""
         description = getattr(space, "Description", "") or ""
 
-        # Приоритет: LongName → Name → Description
-        display_name = longname or name or description or f"Space_{space_id}"
-
-        coords = get_space_coordinates(space)
+        stats, mode = space_geometry[space.id()]
+        # Если геометрию получить не удалось, координаты [0,0,0] как заглушка
+        coords = stats["centroid"] if stats else [0.0, 0.0, 0.0]
 
-        # Получаем этаж (если привязан)
-        storey = None
-        try:
-            rel = space.Decomposes[0].RelatingObject
-            if rel.is_a("IfcBuildingStorey"):
-                storey = rel.Name
-        except Exception:
-            storey = None
+        # Ближайший этаж по индексу (в том числе через зоны и вложенные помещения)
+        storey = index.storey_name(space_id)
 
         spaces.append(
-            {
-                "id": space_id,
-                "name": display_name,
-                "storey": storey,
-                "coordinates": coords,
-            }
+            _space_record(space_id, name, longname, description, storey, coords, stats, mode)
         )
 
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump({"spaces": spaces}, f, ensure_ascii=False, indent=2)
-
-    print(f"✅ Успешно сохранено {len(spaces)} помещений в {out_path}")
+    _write_spaces(spaces, out_path, index, columnar)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--ifc", required=True, help="Путь к IFC файлу")
     parser.add_argument("--out", required=True, help="Путь для сохранения spaces.json")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Потоков для геометрии помещений (по умолчанию BIM_GEOMETRY_WORKERS или число CPU)",
+    )
+    parser.add_argument(
+        "--geometry",
+        choices=GEOMETRY_MODES,
+        default="exact",
+        help="exact — триангуляция помещений; fast — по ObjectPlacement и параметрам формы; "
+        "stream — потоковое чтение файла без загрузки модели, геометрия как в fast",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Дополнительно записать spaces.bin — колоночный формат с отображением в память",
+    )
     args = parser.parse_args()
 
-    export_spaces(args.ifc, args.out)
+    export_spaces(
+        args.ifc, args.out, workers=args.workers, geometry=args.geometry, columnar=args.columnar
+    )
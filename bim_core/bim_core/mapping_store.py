@@ -0,0 +1,273 @@
+"""
+Локальное хранилище подтверждённых сопоставлений названий (SQLite).
+
+Хранит пары «название → цель» для двух видов сопоставления:
+  - "space_spec" — помещение модели → помещение ТЗ (run.find_spec_for_space);
+  - "zone_room"  — зона → помещение (match_zones.match).
+
+Названия хранятся нормализованными (как их сравнивают сами сопоставители),
+поэтому поиск — точный, по первичному ключу, O(1) на название, до любой
+нечёткой оценки. Сопоставители при поиске видят только подтверждённые
+инженером записи (импорт с "confirmed": true): результат прогона не
+зависит от истории прошлых прогонов. Автоматически принятые нечёткие
+сопоставления зон записываются неподтверждёнными, с оценкой (confidence
+0..1), — как подсказки: их можно выгрузить экспортом, проверить и
+импортировать обратно подтверждёнными. Подтверждённые записи не
+вытесняются и не перезаписываются автоматикой.
+
+Вытеснение: неподтверждённые записи, не использованные дольше max_age_days
+или с оценкой ниже min_confidence, удаляются; сверх max_entries остаются
+подтверждённые и самые уверенные/свежие.
+
+Запуск из командной строки:
+  python mapping_store.py import mappings.json
+  python mapping_store.py export mappings.json
+  python mapping_store.py evict --max-age-days 180 --min-confidence 0.8
+  python mapping_store.py stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from room_classifier import lower_name, normalize_name
+
+DEFAULT_DB = Path(
+    os.environ.get(
+        "BIM_MAPPING_DB", Path.home() / ".local" / "share" / "draftai" / "bim" / "mappings.sqlite"
+    )
+)
+MAX_AGE_DAYS = float(os.environ.get("BIM_MAPPING_MAX_AGE_DAYS", "365"))
+MIN_CONFIDENCE = float(os.environ.get("BIM_MAPPING_MIN_CONFIDENCE", "0.0"))
+MAX_ENTRIES = int(os.environ.get("BIM_MAPPING_MAX_ENTRIES", "100000"))
+
+SPACE_SPEC = "space_spec"
+ZONE_ROOM = "zone_room"
+
+# нормализация ключа — та же, что у соответствующего сопоставителя
+_KEY = {
+    SPACE_SPEC: normalize_name,
+    ZONE_ROOM: lambda s: lower_name(s).strip(),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mappings (
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    matched_by TEXT,
+    confidence REAL NOT NULL,
+    confirmed INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (kind, source)
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = (
+    "kind",
+    "source",
+    "target",
+    "matched_by",
+    "confidence",
+    "confirmed",
+    "hits",
+    "created",
+    "last_used",
+)
+
+
+class MappingStore:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else DEFAULT_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # timeout: в пакетном прогоне базу одновременно пишут несколько процессов
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def key(kind, name):
+        return _KEY[kind](name)
+
+    def lookup_many(self, kind, names, confirmed_only=True):
+        """
+        {название: (цель, matched_by)} для найденных названий; отмечает использование.
+        По умолчанию — только подтверждённые записи.
+        """
+        keys = {}
+        for name in names:
+            key = self.key(kind, name)
+            if key:
+                keys.setdefault(key, []).append(name)
+        found = {}
+        hits = []
+        items = list(keys)
+        # ограничение SQLite на число параметров — запросы пачками
+        for start in range(0, len(items), 500):
+            batch = items[start : start + 500]
+            rows = self.conn.execute(
+                f"SELECT source, target, matched_by FROM mappings "
+                f"WHERE kind = ? AND source IN ({','.join('?' * len(batch))})"
+                + (" AND confirmed = 1" if confirmed_only else ""),
+                [kind, *batch],
+            )
+            for source, target, matched_by in rows:
+                for name in keys[source]:
+                    found[name] = (target, matched_by)
+                hits.append(source)
+        if hits:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE mappings SET hits = hits + 1, last_used = ? WHERE kind = ? AND source = ?",
+                [(now, kind, source) for source in hits],
+            )
+            self.conn.commit()
+        return found
+
+    def lookup(self, kind, name, confirmed_only=True):
+        return self.lookup_many(kind, [name], confirmed_only).get(name)
+
+    def record_many(self, kind, items, confirmed=False):
+        """
+        items: [(название, цель, matched_by, confidence)]. Подтверждённую
+        запись автоматика не меняет; неподтверждённую с другой целью
+        заменяет только не менее уверенное сопоставление.
+        """
+        now = time.time()
+        rows = []
+        for name, target, matched_by, confidence in items:
+            key = self.key(kind, name)
+            if key and target:
+                rows.append((kind, key, target, matched_by, float(confidence), int(confirmed), now))
+        self.conn.executemany(
+            """
+            INSERT INTO mappings
+                (kind, source, target, matched_by, confidence, confirmed, hits, created, last_used)
+            VALUES (?1, ?2, ?3, ?4, ?5, ?6, 0, ?7, ?7)
+            ON CONFLICT (kind, source) DO UPDATE SET
+                target = excluded.target,
+                matched_by = excluded.matched_by,
+                confidence = CASE WHEN target = excluded.target
+                    THEN max(confidence, excluded.confidence) ELSE excluded.confidence END,
+                confirmed = max(confirmed, excluded.confirmed),
+                last_used = excluded.last_used
+            WHERE excluded.confirmed = 1
+               OR (confirmed = 0 AND (target = excluded.target
+                                      OR excluded.confidence >= confidence))
+            """,
+            rows,
+        )
+        self.conn.commit()
+
+    def record(self, kind, name, target, matched_by=None, confidence=1.0, confirmed=False):
+        self.record_many(kind, [(name, target, matched_by, confidence)], confirmed=confirmed)
+
+    def evict(self, max_age_days=None, min_confidence=None, max_entries=None):
+        """
+        Удаляет устаревшие и неуверенные неподтверждённые записи и лишние
+        сверх max_entries (подтверждённые не удаляются никогда); возвращает
+        число удалённых.
+        """
+        max_age_days = MAX_AGE_DAYS if max_age_days is None else max_age_days
+        min_confidence = MIN_CONFIDENCE if min_confidence is None else min_confidence
+        max_entries = MAX_ENTRIES if max_entries is None else max_entries
+        before = self.conn.total_changes
+        self.conn.execute(
+            "DELETE FROM mappings WHERE confirmed = 0 AND (last_used < ? OR confidence < ?)",
+            (time.time() - max_age_days * 86400, min_confidence),
+        )
+        self.conn.execute(
+            """
+            DELETE FROM mappings WHERE confirmed = 0 AND (kind, source) NOT IN (
+                SELECT kind, source FROM mappings
+                ORDER BY confirmed DESC, confidence DESC, last_used DESC
+                LIMIT ?
+            )
+            """,
+            (max_entries,),
+        )
+        self.conn.commit()
+        return self.conn.total_changes - before
+
+    def export_json(self, path):
+        rows = self.conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM mappings ORDER BY kind, source")
+        data = [dict(zip(_COLUMNS, row)) for row in rows]
+        for item in data:
+            item["confirmed"] = bool(item["confirmed"])
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"mappings": data}, f, ensure_ascii=False, indent=2)
+        return len(data)
+
+    def import_json(self, path):
+        """
+        Импорт {"mappings": [{"kind", "source", "target", ...}]}; "source" —
+        исходное или нормализованное название. По умолчанию записи
+        считаются подтверждёнными ("confirmed": true).
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        items = data.get("mappings", data) if isinstance(data, dict) else data
+        count = 0
+        for item in items:
+            kind = item.get("kind", SPACE_SPEC)
+            if kind not in _KEY:
+                raise ValueError(f"Неизвестный вид сопоставления: {kind}")
+            self.record(
+                kind,
+                item["source"],
+                item["target"],
+                matched_by=item.get("matched_by"),
+                confidence=item.get("confidence", 1.0),
+                confirmed=item.get("confirmed", True),
+            )
+            count += 1
+        return count
+
+    def stats(self):
+        rows = self.conn.execute(
+            "SELECT kind, count(*), sum(confirmed), sum(hits) FROM mappings GROUP BY kind"
+        )
+        return {
+            kind: {"entries": n, "confirmed": confirmed or 0, "hits": hits or 0}
+            for kind, n, confirmed, hits in rows
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Хранилище сопоставлений BIM Core")
+    parser.add_argument("--db", default=None, help="Путь к базе (по умолчанию BIM_MAPPING_DB)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("import", help="Импорт JSON").add_argument("path")
+    sub.add_parser("export", help="Экспорт JSON").add_argument("path")
+    evict_parser = sub.add_parser("evict", help="Вытеснение устаревших записей")
+    evict_parser.add_argument("--max-age-days", type=float, default=None)
+    evict_parser.add_argument("--min-confidence", type=float, default=None)
+    evict_parser.add_argument("--max-entries", type=int, default=None)
+    sub.add_parser("stats", help="Число записей")
+    args = parser.parse_args()
+
+    with MappingStore(args.db) as store:
+        if args.command == "import":
+            print(f"✅ Импортировано сопоставлений: {store.import_json(args.path)}")
+        elif args.command == "export":
+            print(f"✅ Экспортировано сопоставлений: {store.export_json(args.path)} в {args.path}")
+        elif args.command == "evict":
+            removed = store.evict(args.max_age_days, args.min_confidence, args.max_entries)
+            print(f"✅ Удалено записей: {removed}")
+        else:
+            print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
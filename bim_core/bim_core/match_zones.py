@@ -1,27 +1,220 @@
-from rapidfuzz import fuzz
+"""
+Сопоставление зон модели с помещениями ТЗ.
 
+Матрица оценок token_set_ratio считается одним пакетным вызовом
+rapidfuzz.process.cdist по заранее нормализованным строкам на всех ядрах,
+затем решается задача о назначениях: пары «зона — помещение» один к одному
+с максимальной суммой оценок среди пар не ниже cutoff. В отличие от
+жадного прохода, порядок зон не влияет на результат.
 
-def match(zone_names, room_names, cutoff=65):
+Пары ниже cutoff обнуляются, и задача распадается на компоненты
+связности двудольного графа «зона — помещение» с ненулевой оценкой:
+зоны и помещения без допустимых пар отбрасываются, каждая компонента
+решается отдельно. На реальных названиях компоненты маленькие. Компонента
+решается scipy.optimize.linear_sum_assignment (scipy — в
+bim_core/requirements.txt), без scipy — венгерским алгоритмом на NumPy; на плотной
+матрице, где всё связано в одну компоненту, он заметно медленнее.
+
+Если передано хранилище сопоставлений (mapping_store), зоны с
+подтверждённым инженером помещением назначаются точным поиском до
+построения матрицы; нечёткая оценка считается только для оставшихся зон
+и помещений, а принятые ею пары записываются в хранилище
+неподтверждёнными подсказками (оценка — confidence) и на следующие
+прогоны не влияют, пока их не подтвердят.
+"""
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from mapping_store import ZONE_ROOM
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy необязателен
+    linear_sum_assignment = None
+
+
+def _normalize(name):
+    return (name or "").lower()
+
+
+def _hungarian(cost):
+    """
+    Минимальное назначение для прямоугольной матрицы (n <= m): (rows, cols).
+    Венгерский алгоритм с потенциалами, O(n^2 m), внутренний цикл векторизован.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    way = np.zeros(m + 1, dtype=np.int64)
+    p = np.zeros(m + 1, dtype=np.int64)  # p[j] — строка (с 1), назначенная столбцу j
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            used_idx = np.nonzero(used)[0]
+            u[p[used_idx]] += delta
+            v[used_idx] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def _solve(cost):
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+    if cost.shape[0] <= cost.shape[1]:
+        return _hungarian(cost)
+    cols, rows = _hungarian(cost.T)
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def components(mask):
+    """
+    Компоненты связности двудольного графа (строки x столбцы, ребро — mask):
+    [(строки, столбцы)], только компоненты с хотя бы одним ребром.
+    """
+    n, m = mask.shape
+    col_label = np.full(m, -1, dtype=np.int64)
+    fresh = 0
+    for i in range(n):
+        js = np.flatnonzero(mask[i])
+        if not js.size:
+            continue
+        labels = np.unique(col_label[js])
+        labels = labels[labels >= 0]
+        if labels.size:
+            label = labels[0]
+            if labels.size > 1:
+                col_label[np.isin(col_label, labels)] = label
+        else:
+            label = fresh
+            fresh += 1
+        col_label[js] = label
+    row_label = np.full(n, -1, dtype=np.int64)
+    rows, cols = np.nonzero(mask)
+    row_label[rows] = col_label[cols]
+    return [
+        (np.flatnonzero(row_label == label), np.flatnonzero(col_label == label))
+        for label in np.unique(col_label[col_label >= 0])
+    ]
+
+
+def assign(scores):
+    """
+    Пары (строка, столбец) с максимальной суммой оценок, один к одному,
+    только по ненулевым оценкам; задача решается по компонентам связности.
+    """
+    pairs_rows, pairs_cols = [], []
+    for rows, cols in components(scores > 0):
+        if rows.size == 1 or cols.size == 1:
+            # одна строка или один столбец — лучшая оценка без решателя
+            sub = scores[np.ix_(rows, cols)]
+            r, c = np.unravel_index(int(np.argmax(sub)), sub.shape)
+            pairs_rows.append(rows[[r]])
+            pairs_cols.append(cols[[c]])
+            continue
+        r, c = _solve(-scores[np.ix_(rows, cols)].astype(np.float64))
+        pairs_rows.append(rows[r])
+        pairs_cols.append(cols[c])
+    if not pairs_rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    rows = np.concatenate(pairs_rows)
+    cols = np.concatenate(pairs_cols)
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def score_matrix(zone_names, room_names, cutoff=0):
+    """Матрица token_set_ratio (зоны x помещения); оценки ниже cutoff — 0."""
+    return process.cdist(
+        [_normalize(z) for z in zone_names],
+        [_normalize(r) for r in room_names],
+        scorer=fuzz.token_set_ratio,
+        processor=None,
+        score_cutoff=cutoff,
+        dtype=np.uint8,
+        workers=-1,
+    )
+
+
+def match(zone_names, room_names, cutoff=65, store=None):
     mapping = {}
     report = {"pairs": [], "unmatched_zones": [], "unmatched_rooms": []}
-    used = set()
-    for zn in zone_names:
-        bs = 0
-        br = None
-        for rn in room_names:
-            if rn in used:
-                continue
-            sc = fuzz.token_set_ratio(zn.lower(), rn.lower())
-            if sc > bs:
-                bs = sc
-                br = rn
-        if br and bs >= cutoff:
-            mapping[zn] = br
-            used.add(br)
-            report["pairs"].append({"zone": zn, "room": br, "score": int(bs)})
+    # одинаковые названия помещений — одно помещение, как и раньше
+    rooms = list(dict.fromkeys(room_names))
+
+    # точные совпадения из хранилища — до нечёткой оценки
+    learned = {}
+    if store is not None:
+        room_index = {rn: r for r, rn in enumerate(rooms)}
+        taken = set()
+        found = store.lookup_many(ZONE_ROOM, zone_names)
+        for z, zn in enumerate(zone_names):
+            r = room_index.get(found.get(zn, (None,))[0])
+            if r is not None and r not in taken:
+                learned[z] = r
+                taken.add(r)
+
+    zone_rest = [z for z in range(len(zone_names)) if z not in learned]
+    taken = set(learned.values())
+    room_rest = [r for r in range(len(rooms)) if r not in taken]
+    scores = score_matrix([zone_names[z] for z in zone_rest], [rooms[r] for r in room_rest])
+    matched = np.where(scores >= cutoff, scores, 0)
+
+    assigned = {}
+    for z, r in zip(*assign(matched)):
+        if matched[z, r] > 0:
+            assigned[int(z)] = int(r)
+
+    free = np.ones(len(room_rest), dtype=bool)
+    free[list(assigned.values())] = False
+    row = {z: i for i, z in enumerate(zone_rest)}
+    accepted = []
+    for z, zn in enumerate(zone_names):
+        if z in learned:
+            room = rooms[learned[z]]
+            mapping[zn] = room
+            report["pairs"].append({"zone": zn, "room": room, "score": 100, "source": "store"})
+            continue
+        i = row[z]
+        r = assigned.get(i)
+        if r is not None:
+            room = rooms[room_rest[r]]
+            score = int(scores[i, r])
+            mapping[zn] = room
+            report["pairs"].append({"zone": zn, "room": room, "score": score, "source": "fuzzy"})
+            accepted.append((zn, room, "fuzzy", score / 100))
         else:
-            report["pairs"].append({"zone": zn, "room": None, "score": int(bs)})
+            # лучшая оценка среди свободных помещений — для диагностики
+            best = int(scores[i, free].max()) if free.any() else 0
+            report["pairs"].append({"zone": zn, "room": None, "score": best, "source": None})
             report["unmatched_zones"].append(zn)
+    if store is not None and accepted:
+        store.record_many(ZONE_ROOM, accepted)
+    used = set(mapping.values())
     for rn in room_names:
         if rn not in used:
             report["unmatched_rooms"].append(rn)
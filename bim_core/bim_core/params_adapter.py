@@ -1,4 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from room_classifier import class_classifier
 
 SYN = {
     "офис": "Офис",
@@ -11,12 +13,24 @@ SYN = {
 }
 
 
+DEFAULT_CLASS = "Офис"
+
+_classifier = None
+
+
+def classify_name(n: str) -> Tuple[str, Optional[str]]:
+    """(класс помещения, сработавший синоним или None для класса по умолчанию)."""
+    global _classifier
+    if _classifier is None:
+        _classifier = class_classifier(SYN)
+    hit = _classifier.classify(n)
+    if hit is None:
+        return DEFAULT_CLASS, None
+    return hit.label, hit.synonym
+
+
 def cls_from_name(n: str) -> str:
-    s = (n or "").lower()
-    for k, v in SYN.items():
-        if k in s:
-            return v
-    return "Офис"
+    return classify_name(n)[0]
 
 
 def build(user: Dict, space_names: List[str]) -> Dict:
@@ -27,9 +41,9 @@ def build(user: Dict, space_names: List[str]) -> Dict:
     schedule = (user.get("heating_system") or {}).get("temperature") or ""
     zones = []
     for nm in space_names:
-        cls = cls_from_name(nm)
+        cls, matched_by = classify_name(nm)
         t = temps.get(cls, 22.0)
-        zones.append({"name": nm, "class": cls, "temp_c": t})
+        zones.append({"name": nm, "class": cls, "temp_c": t, "matched_by": matched_by})
     return {
         "project": user.get("project_name") or "Проект",
         "system_type": (user.get("heating_system") or {}).get("system_name")
@@ -0,0 +1,139 @@
+"""
+Классификатор названий помещений по словарям синонимов.
+
+Шаблоны (params_adapter.SYN либо названия помещений ТЗ с их синонимами
+из synonyms.SYNONYMS) компилируются один раз в автомат Ахо — Корасик; название
+помещения нормализуется (с мемоизацией) и просматривается за один проход,
+независимо от числа шаблонов. Из всех найденных вхождений выбирается
+шаблон с наименьшим приоритетом — так сохраняется порядок прежних
+линейных проверок «первый подходящий».
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+
+from synonyms import SYNONYMS
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(s):
+    """Название без цифр, в нижнем регистре (как run.normalize)."""
+    return re.sub(r"\d+", "", s or "").strip().lower()
+
+
+@lru_cache(maxsize=65536)
+def lower_name(s):
+    return (s or "").lower()
+
+
+class Match:
+    __slots__ = ("label", "synonym", "priority")
+
+    def __init__(self, label, synonym, priority):
+        self.label = label  # класс помещения или спецификация ТЗ
+        self.synonym = synonym  # какой синоним сработал (в исходном написании)
+        self.priority = priority
+
+    def __repr__(self):
+        return f"Match({self.label!r}, synonym={self.synonym!r})"
+
+
+class RoomClassifier:
+    def __init__(self, normalize=normalize_name):
+        self.normalize = normalize
+        self._patterns = {}  # нормализованный шаблон -> лучший Match
+        self._compiled = False
+
+    def add(self, pattern, label, priority, synonym=None):
+        """Шаблон ищется как подстрока нормализованного названия."""
+        key = self.normalize(pattern)
+        if not key:
+            return
+        current = self._patterns.get(key)
+        if current is None or priority < current.priority:
+            if synonym is None:
+                synonym = pattern
+            self._patterns[key] = Match(label, synonym, priority)
+        self._compiled = False
+
+    def _compile(self):
+        goto = [{}]
+        fail = [0]
+        out = [None]  # лучший Match среди шаблонов, оканчивающихся в состоянии
+        for key, match in self._patterns.items():
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append(None)
+                state = nxt
+            out[state] = match
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # вхождения по суффиксной ссылке тоже заканчиваются здесь
+                inherited = out[fail[nxt]]
+                if inherited is not None and (
+                    out[nxt] is None or inherited.priority < out[nxt].priority
+                ):
+                    out[nxt] = inherited
+        self._goto, self._fail, self._out = goto, fail, out
+        self._compiled = True
+
+    def classify(self, name):
+        """Лучший Match для названия или None."""
+        if not self._compiled:
+            self._compile()
+        return self._scan(self.normalize(name))
+
+    def _scan(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        best = None
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = out[state]
+            if hit is not None and (best is None or hit.priority < best.priority):
+                best = hit
+        return best
+
+
+def class_classifier(classes):
+    """
+    Классификатор по классам помещений: подстроки classes ({подстрока: класс},
+    по порядку, первая подходящая). Нормализация — только нижний регистр.
+    synonyms.SYNONYMS сюда не входят: короткие синонимы («кор», «wc», «hall»)
+    как подстроки находятся внутри посторонних слов («Корпус», «Декоративная»).
+    """
+    classifier = RoomClassifier(lower_name)
+    for i, (pattern, cls) in enumerate(classes.items()):
+        classifier.add(pattern, cls, i)
+    return classifier
+
+
+def spec_classifier(specs):
+    """
+    Классификатор помещений ТЗ: label — спецификация. Приоритет — порядок
+    спецификаций, внутри спецификации — название, затем её синонимы
+    из synonyms.SYNONYMS по порядку.
+    """
+    classifier = RoomClassifier(normalize_name)
+    for i, spec in enumerate(specs):
+        base = normalize_name(spec["name"])
+        classifier.add(spec["name"], spec, (i, 0), synonym=spec["name"])
+        for k, syn in enumerate(SYNONYMS.get(base, [])):
+            classifier.add(syn, spec, (i, k + 1))
+    return classifier
@@ -11,8 +11,17 @@ try:
 except ImportError:
     raise ImportError("ifc_reader.py not found. IFC parsing unavailable.")
 
-from synonyms import SYNONYMS
-from rapidfuzz import process
+from mapping_store import SPACE_SPEC, MappingStore
+from room_classifier import normalize_name, spec_classifier
+from spaces_cache import SpacesCache, reader_fingerprint
+from spaces_columnar import ColumnarSpaces, spaces_columnar_path
+from stub_collisions import COLLISION_MODES, STUB_TOLERANCE, resolve_collisions, tolerance_arg
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+# подсказки для несопоставленных помещений: сколько и с какой минимальной оценкой
+SUGGESTIONS_LIMIT = 3
+SUGGESTIONS_CUTOFF = 60
 
 
 def load_json(path):
@@ -20,8 +29,25 @@ def load_json(path):
         return json.load(f)
 
 
+def load_spaces(path):
+    """
+    (названия, id, record, frame) помещений из spaces.json или spaces.bin;
+    record(i) — словарь помещения i, frame — система координат (None
+    для файлов старого формата). Из spaces.bin читаются только столбцы
+    названий и id, словарь строится лишь по запросу (для сопоставленных).
+    """
+    if path.endswith(".bin"):
+        table = ColumnarSpaces(path)
+        return table.column("name"), table.column("id"), table.record, table.frame
+    spaces = load_json(path)
+    frame = spaces.get("frame") if isinstance(spaces, dict) else None
+    spaces_list = spaces.get("spaces", spaces)
+    names = [sp.get("name", "") for sp in spaces_list]
+    return names, [sp.get("id") for sp in spaces_list], spaces_list.__getitem__, frame
+
+
 def normalize(s: str) -> str:
-    return re.sub(r"\d+", "", s or "").strip().lower()
+    return normalize_name(s)
 
 
 def parse_t_in_out(tz: dict):
@@ -69,65 +95,186 @@ def build_room_specs(tz_data: dict):
     return specs
 
 
-def find_spec_for_space(space_name: str, specs: list):
-    sname = normalize(space_name)
-    for spec in specs:
-        base = normalize(spec["name"])
-        if base and base in sname:
-            return spec, spec["name"]
-        syns = SYNONYMS.get(base, [])
-        for syn in syns:
-            if normalize(syn) and normalize(syn) in sname:
-                return spec, syn
-    return None, None
+def learned_specs(store, space_names, specs):
+    """
+    {название помещения: (спецификация, matched_by)} из подтверждённых
+    записей хранилища сопоставлений — одним запросом; цели, которых нет
+    в текущем ТЗ, пропускаются.
+    """
+    by_name = {spec["name"]: spec for spec in specs}
+    learned = {}
+    for name, (target, matched_by) in store.lookup_many(SPACE_SPEC, space_names).items():
+        spec = by_name.get(target)
+        if spec is not None:
+            learned[name] = (spec, matched_by or target)
+    return learned
 
 
-def suggest_match(space_name, specs):
+def find_spec_for_space(space_name: str, specs: list, classifier=None, store=None):
+    """
+    (спецификация ТЗ, сработавшее название или синоним) или (None, None).
+    classifier — spec_classifier(specs), построенный один раз на прогон;
+    store — MappingStore, точный поиск подтверждённых записей выполняется первым.
+    """
+    if store is not None:
+        hit = learned_specs(store, [space_name], specs).get(space_name)
+        if hit is not None:
+            return hit
+    if classifier is None:
+        classifier = spec_classifier(specs)
+    hit = classifier.classify(space_name)
+    if hit is None:
+        return None, None
+    return hit.label, hit.synonym
+
+
+def suggest_matches(space_names, specs, limit=SUGGESTIONS_LIMIT, cutoff=SUGGESTIONS_CUTOFF):
+    """
+    Top-k подсказок для каждого названия: [[{"name", "score"}, ...], ...].
+    Все названия оцениваются против всех помещений ТЗ одной матрицей
+    process.cdist (WRatio, все ядра) по заранее обработанным строкам.
+    """
     candidates = [spec["name"] for spec in specs]
-    if not candidates:
-        return None
-    best = process.extractOne(space_name, candidates, score_cutoff=60)
-    if best:
-        return best[0]
-    return None
+    if not candidates or not space_names or limit <= 0:
+        return [[] for _ in space_names]
+    scores = process.cdist(
+        [utils.default_process(n or "") for n in space_names],
+        [utils.default_process(c) for c in candidates],
+        scorer=fuzz.WRatio,
+        processor=None,
+        score_cutoff=cutoff,
+        dtype=np.float64,
+        workers=-1,
+    )
+    # ранжирование по точным оценкам, как у process.extract; устойчивая
+    # сортировка: при равных оценках — порядок помещений в ТЗ
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :limit]
+    suggestions = []
+    for row, idx in zip(scores, order):
+        suggestions.append(
+            [
+                {"name": candidates[j], "score": int(row[j] + 0.5)}
+                for j in idx
+                if row[j] and row[j] >= cutoff
+            ]
+        )
+    return suggestions
 
 
-def main():
-    p = argparse.ArgumentParser()
-    p.add_argument("--ifc", required=False)
-    p.add_argument("--tz", required=True)
-    p.add_argument("--spaces", required=False)
-    p.add_argument("--out", required=True)
-    args = p.parse_args()
+def suggest_match(space_name, specs):
+    best = suggest_matches([space_name], specs, limit=1)[0]
+    return best[0]["name"] if best else None
 
+
+def export_spaces_cached(
+    ifc_path,
+    spaces_file,
+    workers=None,
+    geometry="exact",
+    use_cache=True,
+    refresh=False,
+    cache_dir=None,
+    cache_max_mb=None,
+    columnar=False,
+):
+    """
+    spaces.json для IFC с учётом кэша (см. spaces_cache): при попадании IFC
+    не открывается и геометрия не считается. Возвращает True, если взят из кэша.
+    columnar — рядом записать и spaces.bin (spaces_columnar).
+    """
+    cache = None
+    if use_cache:
+        cache = SpacesCache(cache_dir, cache_max_mb)
+        key = cache.key(ifc_path, reader_fingerprint(geometry, columnar))
+        if not refresh and cache.get(key, spaces_file, columnar):
+            print(f"✅ spaces.json взят из кэша: {spaces_file}")
+            return True
+
+    export_spaces(ifc_path, spaces_file, workers=workers, geometry=geometry, columnar=columnar)
+    if cache is not None:
+        cache.put(key, spaces_file, columnar)
+    return False
+
+
+def run_pipeline(
+    tz_path,
+    out_dir,
+    ifc_path=None,
+    spaces_path=None,
+    spaces_file=None,
+    geometry_workers=None,
+    geometry="exact",
+    use_cache=True,
+    refresh=False,
+    cache_dir=None,
+    cache_max_mb=None,
+    suggestions=SUGGESTIONS_LIMIT,
+    mapping_db=None,
+    use_mappings=True,
+    stub_tolerance=STUB_TOLERANCE,
+    stub_collisions="flag",
+    columnar=False,
+):
+    """
+    Один прогон «IFC/spaces.json + ТЗ → stubs.json, match_report.json» в out_dir.
+    spaces_file — куда писать spaces.json из IFC (по умолчанию bim_core/runs).
+    columnar — писать spaces.bin и читать помещения из него (spaces_columnar);
+    spaces_path с расширением .bin читается как колоночный всегда.
+    Возвращает краткую сводку: число помещений, сопоставленных и несопоставленных.
+    """
+    from_cache = False
     # Если указан IFC, генерируем spaces.json автоматически
-    if args.ifc:
-        module_dir = os.path.dirname(__file__)  # папка bim_core/bim_core
-        runs_dir = os.path.join(
-            module_dir, "..", "runs"
-        )  # bim_core/runs (или os.path.join(module_dir, "runs"))
-        runs_dir = os.path.normpath(runs_dir)
-        os.makedirs(runs_dir, exist_ok=True)
-        spaces_file = os.path.join(runs_dir, "spaces.json")
-        export_spaces(args.ifc, spaces_file)
-        args.spaces = spaces_file
-
-    if not args.spaces:
+    if ifc_path:
+        if spaces_file is None:
+            module_dir = os.path.dirname(__file__)  # папка bim_core/bim_core
+            runs_dir = os.path.join(
+                module_dir, "..", "runs"
+            )  # bim_core/runs (или os.path.join(module_dir, "runs"))
+            runs_dir = os.path.normpath(runs_dir)
+            spaces_file = os.path.join(runs_dir, "spaces.json")
+        os.makedirs(os.path.dirname(os.path.abspath(spaces_file)), exist_ok=True)
+        from_cache = export_spaces_cached(
+            ifc_path,
+            spaces_file,
+            workers=geometry_workers,
+            geometry=geometry,
+            use_cache=use_cache,
+            refresh=refresh,
+            cache_dir=cache_dir,
+            cache_max_mb=cache_max_mb,
+            columnar=columnar,
+        )
+        spaces_path = spaces_columnar_path(spaces_file) if columnar else spaces_file
+
+    if not spaces_path:
         raise ValueError("No spaces.json provided or generated from IFC.")
 
-    tz = load_json(args.tz)
-    spaces = load_json(args.spaces)
-    spaces_list = spaces.get("spaces", spaces)
+    tz = load_json(tz_path)
+    names, ids, space_record, frame = load_spaces(spaces_path)
 
     specs = build_room_specs(tz)
+    classifier = spec_classifier(specs)
+
+    # подтверждённые сопоставления — точный поиск до классификатора
+    store = MappingStore(mapping_db) if use_mappings else None
+    learned = {}
+    if store is not None:
+        learned = learned_specs(store, names, specs)
 
     stubs = []
+    stub_spaces = []
     matched = []
     unmatched_spaces = []
 
-    for sp in spaces_list:
-        spec, matched_by = find_spec_for_space(sp.get("name", ""), specs)
+    for i, name in enumerate(names):
+        hit = learned.get(name)
+        source = "store"
+        if hit is None:
+            hit = find_spec_for_space(name, specs, classifier)
+            source = "classifier"
+        spec, matched_by = hit
         if spec:
+            sp = space_record(i)
             stub = {
                 "id": sp.get("id"),
                 "name": spec["name"],
@@ -139,6 +286,7 @@ def main():
                 "coordinates": sp.get("coordinates", [0, 0, 0]),
             }
             stubs.append(stub)
+            stub_spaces.append(sp)
             matched.append(
                 {
                     "space": sp,
@@ -150,29 +298,93 @@ def main():
                         "radiator_type": spec.get("radiator_type"),
                     },
                     "matched_by": matched_by,
+                    "source": source,
                 }
             )
         else:
-            suggestion = suggest_match(sp.get("name", ""), specs)
-            unmatched_spaces.append(
-                {
-                    "id": sp.get("id"),
-                    "name": sp.get("name"),
-                    "suggested_match": suggestion,
-                }
-            )
+            unmatched_spaces.append({"id": ids[i], "name": name})
+
+    # подсказки для всех несопоставленных помещений — одним пакетом
+    top_k = suggest_matches(
+        [sp.get("name") or "" for sp in unmatched_spaces], specs, limit=suggestions
+    )
+    for sp, top in zip(unmatched_spaces, top_k):
+        sp["suggested_match"] = top[0]["name"] if top else None
+        sp["suggestions"] = top
+
+    # совпадающие заглушки — до отправки на MCP
+    stubs, collisions = resolve_collisions(
+        stubs, stub_spaces, tolerance=stub_tolerance, mode=stub_collisions, frame=frame
+    )
 
-    os.makedirs(args.out, exist_ok=True)
-    with open(os.path.join(args.out, "stubs.json"), "w", encoding="utf-8") as f:
+    if store is not None:
+        store.evict()
+        store.close()
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "stubs.json"), "w", encoding="utf-8") as f:
         json.dump(stubs, f, ensure_ascii=False, indent=2)
-    with open(os.path.join(args.out, "match_report.json"), "w", encoding="utf-8") as f:
+    with open(os.path.join(out_dir, "match_report.json"), "w", encoding="utf-8") as f:
         json.dump(
-            {"matched": matched, "unmatched_spaces": unmatched_spaces},
+            {
+                "matched": matched,
+                "unmatched_spaces": unmatched_spaces,
+                "stub_collisions": collisions,
+            },
             f,
             ensure_ascii=False,
             indent=2,
         )
 
+    return {
+        "spaces": len(names),
+        "matched": len(matched),
+        "unmatched": len(unmatched_spaces),
+        "stubs": len(stubs),
+        "collisions": len(collisions["collisions"]),
+        "from_cache": from_cache,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--ifc", required=False)
+    p.add_argument("--tz", required=True)
+    p.add_argument("--spaces", required=False)
+    p.add_argument("--out", required=True)
+    p.add_argument("--geometry-workers", type=int, default=None)
+    p.add_argument("--geometry", choices=("exact", "fast", "stream"), default="exact")
+    p.add_argument("--no-cache", action="store_true")
+    p.add_argument("--refresh", action="store_true")
+    p.add_argument("--cache-dir", default=None)
+    p.add_argument("--cache-max-mb", type=int, default=None)
+    p.add_argument("--suggestions", type=int, default=SUGGESTIONS_LIMIT)
+    p.add_argument("--mapping-db", default=None)
+    p.add_argument("--no-mappings", action="store_true")
+    p.add_argument("--stub-tolerance", type=tolerance_arg, default=STUB_TOLERANCE)
+    p.add_argument("--stub-collisions", choices=COLLISION_MODES, default="flag")
+    p.add_argument("--columnar", action="store_true")
+    args = p.parse_args()
+
+    run_pipeline(
+        args.tz,
+        args.out,
+        ifc_path=args.ifc,
+        spaces_path=args.spaces,
+        geometry_workers=args.geometry_workers,
+        geometry=args.geometry,
+        use_cache=not args.no_cache,
+        refresh=args.refresh,
+        cache_dir=args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        suggestions=args.suggestions,
+        mapping_db=args.mapping_db,
+        use_mappings=not args.no_mappings,
+        stub_tolerance=args.stub_tolerance,
+        stub_collisions=args.stub_collisions,
+        columnar=args.columnar,
+    )
+
 
 if __name__ == "__main__":
     main()
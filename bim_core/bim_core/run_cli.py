@@ -20,6 +20,13 @@ import importlib.util
 import runpy
 
 
+def positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {value}")
+    return number
+
+
 def parse_args():
     p = argparse.ArgumentParser(description="BIM Core CLI wrapper")
     p.add_argument("--tz", help="Path to TZ JSON (from NLP)", required=False)
@@ -32,6 +39,74 @@ def parse_args():
         required=True,
     )
     p.add_argument("--config", help="Optional config path", required=False)
+    p.add_argument(
+        "--geometry-workers",
+        type=int,
+        help="Threads for IfcSpace tessellation (default: BIM_GEOMETRY_WORKERS or CPU count)",
+        required=False,
+    )
+    p.add_argument(
+        "--geometry",
+        choices=("exact", "fast", "stream"),
+        help="Space geometry mode: exact tessellation (default), fast placement-based, "
+        "or stream (low-memory STEP scan, same shape-parameter geometry as fast)",
+        required=False,
+    )
+    p.add_argument(
+        "--no-cache", action="store_true", help="Do not read or write the spaces.json cache"
+    )
+    p.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore a cached spaces.json, re-read the IFC and overwrite the cache entry",
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=None,
+        help="spaces.json cache folder (default: BIM_CACHE_DIR or ~/.cache/draftai/bim)",
+    )
+    p.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=None,
+        help="spaces.json cache size limit in MB, LRU eviction (default: BIM_CACHE_MAX_MB or 256)",
+    )
+    p.add_argument(
+        "--suggestions",
+        type=int,
+        default=None,
+        help="Top-k suggestions per unmatched space in match_report.json (default: 3)",
+    )
+    p.add_argument(
+        "--mapping-db",
+        default=None,
+        help="Learned mappings SQLite file (default: BIM_MAPPING_DB or "
+        "~/.local/share/draftai/bim/mappings.sqlite)",
+    )
+    p.add_argument(
+        "--no-mappings",
+        action="store_true",
+        help="Do not consult or update the learned mappings store",
+    )
+    p.add_argument(
+        "--stub-tolerance",
+        type=positive_float,
+        default=None,
+        help="Distance in metres below which stubs on one storey collide "
+        "(default: BIM_STUB_TOLERANCE or 0.3)",
+    )
+    p.add_argument(
+        "--stub-collisions",
+        choices=("flag", "merge"),
+        default=None,
+        help="Only report colliding stubs in match_report.json (flag, default) "
+        "or merge stubs of the same TZ room into one (merge)",
+    )
+    p.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Also write spaces.bin (columnar, memory-mapped) and read spaces from it",
+    )
     p.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
     return p.parse_args()
 
@@ -184,6 +259,30 @@ def main():
     argv += ["--out", str(out_path)]
     if args.config:
         argv += ["--config", str(args.config)]
+    if args.geometry_workers is not None:
+        argv += ["--geometry-workers", str(args.geometry_workers)]
+    if args.geometry:
+        argv += ["--geometry", args.geometry]
+    if args.no_cache:
+        argv += ["--no-cache"]
+    if args.refresh:
+        argv += ["--refresh"]
+    if args.cache_dir:
+        argv += ["--cache-dir", str(args.cache_dir)]
+    if args.cache_max_mb is not None:
+        argv += ["--cache-max-mb", str(args.cache_max_mb)]
+    if args.suggestions is not None:
+        argv += ["--suggestions", str(args.suggestions)]
+    if args.mapping_db:
+        argv += ["--mapping-db", str(args.mapping_db)]
+    if args.no_mappings:
+        argv += ["--no-mappings"]
+    if args.stub_tolerance is not None:
+        argv += ["--stub-tolerance", str(args.stub_tolerance)]
+    if args.stub_collisions:
+        argv += ["--stub-collisions", args.stub_collisions]
+    if args.columnar:
+        argv += ["--columnar"]
 
     try:
         # Module may define main() that uses argparse internally (your run.py does).
@@ -0,0 +1,172 @@
+"""
+Кэш spaces.json, адресуемый по содержимому IFC.
+
+Ключ — sha256 файла IFC плюс отпечаток читателя: исходники модулей,
+которые строят spaces.json (ifc_reader, fast_geometry, geometry_stats,
+step_scanner, spatial_index, spaces_columnar), версия ifcopenshell, режим
+геометрии и запись spaces.bin. Число потоков в
+ключ не входит: результат от него не зависит. Любая правка читателя даёт новый ключ,
+старые записи перестают находиться и со временем вытесняются.
+
+Записи — готовые файлы spaces.json, индекс пространственной структуры
+рядом с ним (spatial_index) и, если запрошен, колоночный spaces.bin
+(spaces_columnar); запись копируется целиком или не копируется вовсе,
+при попадании IFC не открывается. Время изменения файла служит меткой
+последнего использования (LRU), при превышении лимита размера удаляются
+самые давно использованные записи — все их файлы вместе.
+"""
+
+import hashlib
+import os
+import shutil
+from importlib import metadata
+from pathlib import Path
+
+from spaces_columnar import spaces_columnar_path
+from spatial_index import spatial_index_path
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("BIM_CACHE_DIR", Path.home() / ".cache" / "draftai" / "bim")
+)
+DEFAULT_MAX_MB = int(os.environ.get("BIM_CACHE_MAX_MB", "256"))
+
+# модули, от которых зависит содержимое spaces.json
+READER_MODULES = (
+    "ifc_reader.py",
+    "fast_geometry.py",
+    "geometry_stats.py",
+    "step_scanner.py",
+    "spatial_index.py",
+    "spaces_columnar.py",
+)
+
+_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def reader_fingerprint(geometry="exact", columnar=False):
+    """Отпечаток читателя IFC и настроек геометрии."""
+    h = hashlib.sha256()
+    here = Path(__file__).resolve().parent
+    for name in READER_MODULES:
+        h.update(name.encode())
+        h.update((here / name).read_bytes())
+    for part in (_package_version("ifcopenshell"), geometry):
+        h.update(repr(part).encode())
+    if columnar:
+        h.update(b"columnar")
+    return h.hexdigest()
+
+
+class SpacesCache:
+    def __init__(self, directory=None, max_mb=None):
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.max_bytes = (DEFAULT_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+
+    def key(self, ifc_path, fingerprint):
+        return hashlib.sha256(f"{file_digest(ifc_path)}:{fingerprint}".encode()).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def _files(self, key, columnar):
+        """Файлы записи: индекс, spaces.bin (если columnar) и spaces.json последним."""
+        path = self._path(key)
+        files = [Path(spatial_index_path(str(path)))]
+        if columnar:
+            files.append(Path(spaces_columnar_path(str(path))))
+        files.append(path)
+        return files
+
+    @staticmethod
+    def _targets(spaces_path, columnar):
+        files = [Path(spatial_index_path(str(spaces_path)))]
+        if columnar:
+            files.append(Path(spaces_columnar_path(str(spaces_path))))
+        files.append(Path(spaces_path))
+        return files
+
+    @staticmethod
+    def _copy_all(pairs):
+        """Копирует все файлы или ни одного: сначала во временные, затем os.replace."""
+        tmps = []
+        try:
+            for src, dst in pairs:
+                tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+                tmps.append(tmp)
+                shutil.copyfile(src, tmp)
+            for tmp, (_, dst) in zip(tmps, pairs):
+                os.replace(tmp, dst)
+        finally:
+            for tmp in tmps:
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+
+    def get(self, key, out_path, columnar=False):
+        """
+        Копирует запись в out_path (индекс и spaces.bin — рядом); False, если
+        записи нет или она неполная (для columnar — без spaces.bin).
+        """
+        files = self._files(key, columnar)
+        if not all(path.exists() for path in files):
+            return False
+        try:
+            self._copy_all(list(zip(files, self._targets(out_path, columnar))))
+        except OSError:
+            return False
+        for entry in files:
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+        return True
+
+    def put(self, key, spaces_path, columnar=False):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._copy_all(
+                list(zip(self._targets(spaces_path, columnar), self._files(key, columnar)))
+            )
+            self.evict()
+        except OSError as e:
+            print(f"⚠️ Не удалось записать кэш spaces.json в {self.directory}: {e}")
+
+    def evict(self):
+        """Удаляет самые давно использованные записи целиком (json, индекс и spaces.bin)."""
+        entries = {}
+        for path in self.directory.iterdir():
+            if path.suffix not in (".json", ".bin"):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            key = path.name.split(".", 1)[0]
+            mtime, size, files = entries.get(key, (0.0, 0, []))
+            entries[key] = (max(mtime, st.st_mtime), size + st.st_size, files + [path])
+        total = sum(size for _, size, _ in entries.values())
+        for _, size, files in sorted(entries.values(), key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            for path in files:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
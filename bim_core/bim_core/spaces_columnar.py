@@ -0,0 +1,289 @@
+"""
+Компактный колоночный формат помещений (spaces.bin) с отображением в память.
+
+Тот же набор данных, что spaces.json, но по столбцам:
+  - числа — массивы float64: coordinates (n x 3), centroid, bbox_min,
+    bbox_max (n x 3), floor_area, volume (n); has_geometry (uint8) отличает
+    geometry: null от посчитанной геометрии;
+  - id, name — таблицы строк: смещения int64 (n + 1) и общий буфер UTF-8;
+  - у id, name и coordinates — маска <столбец>.valid (uint8): 0 — null
+    (в столбце coordinates на месте null — NaN);
+  - storey, geometry_mode — словарные столбцы: коды int32 (-1 — null)
+    и таблица уникальных значений.
+
+Файл: сигнатура BIMSPC01, длина заголовка (uint64 LE), заголовок JSON
+с описанием столбцов и данные, выровненные по 64 байтам. Файл
+открывается через mmap: столбец превращается в массив NumPy поверх
+отображения только при обращении к нему, строки декодируются по
+одной при чтении — без разбора JSON и без словаря на каждое помещение.
+
+spaces.json по-прежнему пишется для людей; spaces.bin — рядом с ним
+(spaces_columnar_path).
+"""
+
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"BIMSPC01"
+FORMAT_VERSION = 2
+# версия 1 — без масок null, читается как «всё заполнено»
+_READ_VERSIONS = (1, 2)
+_ALIGN = 64
+
+_VECTORS = ("coordinates",)
+_GEOMETRY_VECTORS = ("centroid", "bbox_min", "bbox_max")
+_GEOMETRY_SCALARS = ("floor_area", "volume")
+_STRINGS = ("id", "name")
+_CATEGORIES = ("storey", "geometry_mode")
+
+
+def spaces_columnar_path(spaces_path):
+    """Путь рядом со spaces.json: runs/spaces.json → runs/spaces.bin."""
+    return os.path.splitext(spaces_path)[0] + ".bin"
+
+
+def _encode_strings(values):
+    data = [("" if v is None else str(v)).encode("utf-8") for v in values]
+    offsets = np.zeros(len(data) + 1, dtype="<i8")
+    np.cumsum([len(b) for b in data], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(data), dtype=np.uint8)
+
+
+def write_spaces_columnar(spaces, path, frame=None):
+    """
+    Записывает список помещений (как в spaces.json) в колоночный файл;
+    frame — система координат (поле "frame" spaces.json).
+    """
+    n = len(spaces)
+    arrays = {}
+
+    coords = np.full((n, 3), np.nan, dtype="<f8")
+    coords_valid = np.zeros(n, dtype=np.uint8)
+    for i, sp in enumerate(spaces):
+        c = sp.get("coordinates")
+        if c is not None:
+            coords[i] = c[:3]
+            coords_valid[i] = 1
+    arrays["coordinates"] = coords
+    arrays["coordinates.valid"] = coords_valid
+
+    has_geometry = np.zeros(n, dtype=np.uint8)
+    geometry = {k: np.full((n, 3), np.nan, dtype="<f8") for k in _GEOMETRY_VECTORS}
+    geometry.update({k: np.full(n, np.nan, dtype="<f8") for k in _GEOMETRY_SCALARS})
+    for i, sp in enumerate(spaces):
+        g = sp.get("geometry")
+        if not g:
+            continue
+        has_geometry[i] = 1
+        geometry["centroid"][i] = g["centroid"]
+        geometry["bbox_min"][i] = g["bbox"]["min"]
+        geometry["bbox_max"][i] = g["bbox"]["max"]
+        geometry["floor_area"][i] = g["floor_area"]
+        geometry["volume"][i] = g["volume"]
+    arrays["has_geometry"] = has_geometry
+    arrays.update(geometry)
+
+    columns = {}
+    for name in _VECTORS + ("has_geometry",) + _GEOMETRY_VECTORS + _GEOMETRY_SCALARS:
+        columns[name] = {"kind": "array"}
+    for name in _STRINGS:
+        values = [sp.get(name) for sp in spaces]
+        offsets, data = _encode_strings(values)
+        arrays[f"{name}.offsets"] = offsets
+        arrays[f"{name}.data"] = data
+        arrays[f"{name}.valid"] = np.fromiter((v is not None for v in values), np.uint8, n)
+        columns[name] = {"kind": "strings"}
+    for name in _CATEGORIES:
+        table = {}
+        codes = np.full(n, -1, dtype="<i4")
+        for i, sp in enumerate(spaces):
+            value = sp.get(name)
+            if value is not None:
+                codes[i] = table.setdefault(value, len(table))
+        offsets, data = _encode_strings(table)
+        arrays[f"{name}.codes"] = codes
+        arrays[f"{name}.offsets"] = offsets
+        arrays[f"{name}.data"] = data
+        columns[name] = {"kind": "category"}
+
+    # смещения считаются от начала данных, сразу после заголовка
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        offset = -(-offset // _ALIGN) * _ALIGN
+        layout[key] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset += array.nbytes
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "count": n,
+            "frame": frame,
+            "columns": columns,
+            "arrays": layout,
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+    start = -(-(len(MAGIC) + 8 + len(header)) // _ALIGN) * _ALIGN
+    header += b" " * (start - len(MAGIC) - 8 - len(header))
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for key, array in arrays.items():
+            f.seek(start + layout[key]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        # пустые столбцы в конце тоже должны лежать внутри файла
+        f.truncate(start + offset)
+    os.replace(tmp, path)
+
+
+class StringColumn:
+    """Строки столбца поверх отображения; декодируются при обращении."""
+
+    def __init__(self, offsets, data, codes=None, valid=None):
+        self._offsets = offsets
+        self._data = data
+        self._codes = codes
+        self._valid = valid
+        self._table = None
+
+    def __len__(self):
+        return len(self._codes) if self._codes is not None else len(self._offsets) - 1
+
+    def _decode(self, i):
+        return bytes(self._data[self._offsets[i] : self._offsets[i + 1]]).decode("utf-8")
+
+    def __getitem__(self, i):
+        if self._codes is None:
+            if self._valid is not None and not self._valid[i]:
+                return None
+            return self._decode(i)
+        # словарный столбец: уникальных значений мало, таблица декодируется один раз
+        if self._table is None:
+            self._table = [self._decode(k) for k in range(len(self._offsets) - 1)]
+        code = self._codes[i]
+        return self._table[code] if code >= 0 else None
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tolist(self):
+        return list(self)
+
+
+class ColumnarSpaces:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Не колоночный файл помещений: {path}")
+        (size,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self._mm[start : start + size])
+        if header.get("version") not in _READ_VERSIONS:
+            raise ValueError(f"Неподдерживаемая версия формата: {header.get('version')}")
+        self._base = start + size
+        self.count = header["count"]
+        self.frame = header.get("frame")
+        self.columns = header["columns"]
+        self._layout = header["arrays"]
+        self._cache = {}
+
+    def close(self):
+        self._cache.clear()
+        try:
+            self._mm.close()
+        except BufferError:
+            # снаружи ещё живы массивы поверх отображения — закроется сборщиком мусора
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _array(self, key):
+        spec = self._layout[key]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        array = np.frombuffer(self._mm, dtype=dtype, count=count, offset=self._base + spec["offset"])
+        return array.reshape(spec["shape"])
+
+    def _valid(self, name):
+        """Маска заполненных значений столбца или None (все заполнены)."""
+        key = f"{name}.valid"
+        return self._array(key) if key in self._layout else None
+
+    def column(self, name):
+        """
+        Массив NumPy (только чтение) или StringColumn; читается только этот столбец.
+        Null в строковых столбцах — None, в coordinates — строка из NaN.
+        """
+        if name not in self._cache:
+            kind = self.columns[name]["kind"]
+            if kind == "array":
+                value = self._array(name)
+            elif kind == "strings":
+                value = StringColumn(
+                    self._array(f"{name}.offsets"),
+                    self._array(f"{name}.data"),
+                    valid=self._valid(name),
+                )
+            else:
+                value = StringColumn(
+                    self._array(f"{name}.offsets"),
+                    self._array(f"{name}.data"),
+                    codes=self._array(f"{name}.codes"),
+                )
+            self._cache[name] = value
+        return self._cache[name]
+
+    def record(self, i):
+        """Помещение i в виде словаря spaces.json."""
+        geometry = None
+        if self.column("has_geometry")[i]:
+            geometry = {
+                "centroid": self.column("centroid")[i].tolist(),
+                "bbox": {
+                    "min": self.column("bbox_min")[i].tolist(),
+                    "max": self.column("bbox_max")[i].tolist(),
+                },
+                "floor_area": float(self.column("floor_area")[i]),
+                "volume": float(self.column("volume")[i]),
+            }
+        return {
+            "id": self.column("id")[i],
+            "name": self.column("name")[i],
+            "storey": self.column("storey")[i],
+            "coordinates": self._coordinates(i),
+            "geometry": geometry,
+            "geometry_mode": self.column("geometry_mode")[i],
+        }
+
+    def _coordinates(self, i):
+        if "coordinates.valid" not in self._cache:
+            self._cache["coordinates.valid"] = self._valid("coordinates")
+        valid = self._cache["coordinates.valid"]
+        if valid is not None and not valid[i]:
+            return None
+        return self.column("coordinates")[i].tolist()
+
+    def records(self):
+        return [self.record(i) for i in range(self.count)]
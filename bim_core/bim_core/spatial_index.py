@@ -0,0 +1,221 @@
+"""
+Индекс пространственной структуры IFC: проект → участок → здание → этаж → помещение.
+
+Строится за один проход по IfcRelAggregates и IfcRelContainedInSpatialStructure
+(из модели ifcopenshell или из результата step_scanner). Узлы хранятся по
+GlobalId; для каждого узла заранее вычислены ближайшие участок, здание и
+этаж, поэтому запросы «помещение → этаж → здание» — O(1) и работают при
+любой глубине вложенности (помещение → зона → этаж, помещение в помещении).
+
+Индекс сохраняется рядом со spaces.json (<имя>.spatial.json), чтобы
+следующие этапы группировали помещения по этажам без открытия IFC.
+"""
+
+import json
+import os
+
+INDEX_VERSION = 1
+
+# типы, для которых у каждого узла запоминается ближайший предок
+_LEVELS = (("site", "IfcSite"), ("building", "IfcBuilding"), ("storey", "IfcBuildingStorey"))
+
+_SPATIAL_CLASSES = ("IfcProject", "IfcSpatialStructureElement", "IfcSpatialElement")
+
+
+def spatial_index_path(spaces_path):
+    """Путь индекса рядом со spaces.json: runs/spaces.json → runs/spaces.spatial.json."""
+    return os.path.splitext(spaces_path)[0] + ".spatial.json"
+
+
+def _is_spatial(entity):
+    return any(entity.is_a(cls) for cls in _SPATIAL_CLASSES)
+
+
+class SpatialIndex:
+    def __init__(self, nodes):
+        """
+        nodes: {GlobalId: {"type", "name", "elevation", "parent"}}; дети
+        и ближайшие участок/здание/этаж вычисляются здесь.
+        """
+        self.nodes = {}
+        for gid, node in nodes.items():
+            self.nodes[gid] = {
+                "type": node["type"],
+                "name": node.get("name"),
+                "elevation": node.get("elevation"),
+                "parent": node.get("parent") if node.get("parent") in nodes else None,
+                "children": [],
+            }
+        for gid, node in self.nodes.items():
+            if node["parent"] is not None:
+                self.nodes[node["parent"]]["children"].append(gid)
+        for gid in self.nodes:
+            self._resolve(gid)
+
+    def _resolve(self, gid):
+        """Ближайшие участок/здание/этаж узла (сам узел не считается)."""
+        node = self.nodes[gid]
+        if "storey" in node:
+            return node
+        # итеративный подъём: вложенность может быть глубокой
+        chain = []
+        current = gid
+        while current is not None and "storey" not in self.nodes[current]:
+            if current in chain:  # цикл в битых связях
+                break
+            chain.append(current)
+            current = self.nodes[current]["parent"]
+        for cid in reversed(chain):
+            parent_id = self.nodes[cid]["parent"]
+            parent = self.nodes[parent_id] if parent_id is not None else None
+            for key, ifc_type in _LEVELS:
+                if parent is None or "storey" not in parent:
+                    self.nodes[cid][key] = None
+                elif parent["type"] == ifc_type:
+                    self.nodes[cid][key] = parent_id
+                else:
+                    self.nodes[cid][key] = parent[key]
+        return node
+
+    @classmethod
+    def from_model(cls, model, scale=1.0):
+        """Индекс по модели ifcopenshell; scale — множитель длин в метры (для отметок)."""
+        nodes = {}
+        order = {}
+
+        def add(entity):
+            gid = entity.GlobalId
+            if gid not in nodes:
+                order[gid] = entity.id()
+                elevation = None
+                if entity.is_a("IfcBuildingStorey"):
+                    elevation = getattr(entity, "Elevation", None)
+                nodes[gid] = {
+                    "type": entity.is_a(),
+                    "name": getattr(entity, "Name", None),
+                    "elevation": elevation * scale if elevation is not None else None,
+                    "parent": None,
+                }
+            return nodes[gid]
+
+        for rel in model.by_type("IfcRelAggregates"):
+            if not _is_spatial(rel.RelatingObject):
+                continue
+            parent = rel.RelatingObject
+            add(parent)
+            for child in rel.RelatedObjects:
+                if _is_spatial(child):
+                    add(child)["parent"] = parent.GlobalId
+        for rel in model.by_type("IfcRelContainedInSpatialStructure"):
+            parent = rel.RelatingStructure
+            for child in rel.RelatedElements:
+                if _is_spatial(child):
+                    add(parent)
+                    node = add(child)
+                    if node["parent"] is None:
+                        node["parent"] = parent.GlobalId
+        # помещения и этажи без связей — корни
+        for cls_name in ("IfcBuildingStorey", "IfcSpace"):
+            for entity in model.by_type(cls_name):
+                add(entity)
+        # порядок файла — как у from_scan
+        return cls({gid: nodes[gid] for gid in sorted(nodes, key=order.get)})
+
+    @classmethod
+    def from_scan(cls, scan):
+        """Индекс по результату step_scanner.scan (уже в памяти, без второго чтения)."""
+        by_rid = {}
+        for rid, (ifc_type, gid, name, elevation) in scan.structure.items():
+            if elevation is not None:
+                elevation *= scan.length_scale
+            by_rid[rid] = (gid, {"type": ifc_type, "name": name, "elevation": elevation})
+        for rid, space in scan.spaces.items():
+            by_rid[rid] = (space[0], {"type": "IfcSpace", "name": space[1], "elevation": None})
+        nodes = {}
+        for rid in sorted(by_rid):
+            gid, node = by_rid[rid]
+            parent = by_rid.get(scan.parent.get(rid))
+            node["parent"] = parent[0] if parent else None
+            nodes[gid] = node
+        return cls(nodes)
+
+    # --- запросы ---
+
+    def node(self, gid):
+        return self.nodes.get(gid)
+
+    def parent(self, gid):
+        node = self.nodes.get(gid)
+        return node["parent"] if node else None
+
+    def children(self, gid):
+        node = self.nodes.get(gid)
+        return list(node["children"]) if node else []
+
+    def storey(self, gid):
+        """GlobalId ближайшего этажа или None."""
+        node = self.nodes.get(gid)
+        return node["storey"] if node else None
+
+    def building(self, gid):
+        node = self.nodes.get(gid)
+        return node["building"] if node else None
+
+    def site(self, gid):
+        node = self.nodes.get(gid)
+        return node["site"] if node else None
+
+    def storey_name(self, gid):
+        storey = self.storey(gid)
+        return self.nodes[storey]["name"] if storey else None
+
+    def elevation(self, gid):
+        """Отметка этажа узла (или самого этажа) в метрах."""
+        node = self.nodes.get(gid)
+        if node is None:
+            return None
+        if node["type"] == "IfcBuildingStorey":
+            return node["elevation"]
+        storey = node["storey"]
+        return self.nodes[storey]["elevation"] if storey else None
+
+    def storeys(self):
+        """GlobalId этажей, отсортированные по отметке."""
+        ids = [gid for gid, n in self.nodes.items() if n["type"] == "IfcBuildingStorey"]
+        return sorted(
+            ids,
+            key=lambda gid: (
+                self.nodes[gid]["elevation"] is None,
+                self.nodes[gid]["elevation"] or 0.0,
+            ),
+        )
+
+    def spaces_by_storey(self):
+        """{GlobalId этажа или None: [GlobalId помещений]}."""
+        groups = {}
+        for gid, node in self.nodes.items():
+            if node["type"] == "IfcSpace":
+                groups.setdefault(node["storey"], []).append(gid)
+        return groups
+
+    # --- сериализация ---
+
+    def to_dict(self):
+        return {"version": INDEX_VERSION, "nodes": self.nodes}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Неподдерживаемая версия индекса: {data.get('version')}")
+        index = cls.__new__(cls)
+        index.nodes = data["nodes"]
+        return index
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
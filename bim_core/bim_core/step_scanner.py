@@ -0,0 +1,472 @@
+"""
+Потоковый сканер STEP (ISO 10303-21) для очень больших IFC.
+
+Файл читается блоками, без ifcopenshell.open: разбираются только записи
+пространственной структуры (проект, участок, здание, этаж, зона, помещение),
+IfcRelAggregates / IfcRelContainedInSpatialStructure, единицы длины и
+записи, достижимые по ссылкам от помещений: цепочки размещения
+(IfcLocalPlacement → IfcAxis2Placement3D → IfcCartesianPoint / IfcDirection)
+и представления Body / Box (IfcExtrudedAreaSolid, IfcFacetedBrep,
+IfcBoundingBox и их профили, контуры и точки). Стены, воздуховоды, мебель,
+их размещения и геометрия не запоминаются, а записи чужих типов
+пропускаются по имени типа, не разбирая аргументов, — память ограничена
+размером помещений, а не модели.
+
+Запись запоминается, только если на неё уже сослалась нужная запись.
+Экспортёры обычно пишут записи раньше ссылок на них, поэтому недостающие
+добираются следующими проходами по файлу — тоже потоковыми и только по
+нужным номерам; проходов столько, какова глубина цепочек ссылок.
+
+По найденным записям геометрия помещения считается так же, как в
+fast_geometry (та же оболочка по параметрам формы, те же мировые
+координаты и метры); если представление не распознано, у помещения
+остаётся только начало размещения.
+"""
+
+import re
+
+import numpy as np
+
+from fast_geometry import REPRESENTATIONS, place_mesh, shape_mesh
+from geometry_stats import compute_stats
+
+_CHUNK = 1 << 20
+# одна запись до ';' вне строковых литералов (развёрнутый цикл, без возвратов)
+_STATEMENT = re.compile(r"[^';]*(?:'[^']*(?:''[^']*)*'[^';]*)*;")
+_HEADER_MAX = 128
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<str>'(?:[^']|'')*')"
+    r"|(?P<ref>#\d+)"
+    r"|(?P<enum>\.[A-Za-z0-9_]+\.)"
+    r"|(?P<num>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<typed>[A-Za-z][A-Za-z0-9_]*)\s*\("
+    r"|(?P<open>\()"
+    r"|(?P<close>\))"
+    r"|(?P<comma>,)"
+    r"|(?P<null>[$*])"
+    r")"
+)
+
+# элементы пространственной структуры кроме помещений: ТИП -> тип IFC
+SPATIAL_TYPES = {
+    "IFCPROJECT": "IfcProject",
+    "IFCSITE": "IfcSite",
+    "IFCBUILDING": "IfcBuilding",
+    "IFCBUILDINGSTOREY": "IfcBuildingStorey",
+    "IFCSPATIALZONE": "IfcSpatialZone",
+}
+_RELATIONS = {"IFCRELAGGREGATES", "IFCRELCONTAINEDINSPATIALSTRUCTURE"}
+_STRUCTURE = {"IFCSPACE"} | set(SPATIAL_TYPES) | _RELATIONS
+_UNITS = {"IFCSIUNIT", "IFCCONVERSIONBASEDUNIT"}
+
+# записи, которые добираются по ссылкам от помещений: ТИП -> (тип IFC, атрибуты)
+ENTITIES = {
+    "IFCLOCALPLACEMENT": ("IfcLocalPlacement", ("PlacementRelTo", "RelativePlacement")),
+    "IFCAXIS2PLACEMENT3D": ("IfcAxis2Placement3D", ("Location", "Axis", "RefDirection")),
+    "IFCAXIS2PLACEMENT2D": ("IfcAxis2Placement2D", ("Location", "RefDirection")),
+    "IFCCARTESIANPOINT": ("IfcCartesianPoint", ("Coordinates",)),
+    "IFCDIRECTION": ("IfcDirection", ("DirectionRatios",)),
+    "IFCPRODUCTDEFINITIONSHAPE": (
+        "IfcProductDefinitionShape",
+        ("Name", "Description", "Representations"),
+    ),
+    "IFCSHAPEREPRESENTATION": (
+        "IfcShapeRepresentation",
+        ("ContextOfItems", "RepresentationIdentifier", "RepresentationType", "Items"),
+    ),
+    "IFCEXTRUDEDAREASOLID": (
+        "IfcExtrudedAreaSolid",
+        ("SweptArea", "Position", "ExtrudedDirection", "Depth"),
+    ),
+    "IFCRECTANGLEPROFILEDEF": (
+        "IfcRectangleProfileDef",
+        ("ProfileType", "ProfileName", "Position", "XDim", "YDim"),
+    ),
+    "IFCARBITRARYCLOSEDPROFILEDEF": (
+        "IfcArbitraryClosedProfileDef",
+        ("ProfileType", "ProfileName", "OuterCurve"),
+    ),
+    "IFCPOLYLINE": ("IfcPolyline", ("Points",)),
+    "IFCINDEXEDPOLYCURVE": ("IfcIndexedPolyCurve", ("Points", "Segments", "SelfIntersect")),
+    "IFCCARTESIANPOINTLIST2D": ("IfcCartesianPointList2D", ("CoordList",)),
+    "IFCCARTESIANPOINTLIST3D": ("IfcCartesianPointList3D", ("CoordList",)),
+    "IFCFACETEDBREP": ("IfcFacetedBrep", ("Outer",)),
+    "IFCCLOSEDSHELL": ("IfcClosedShell", ("CfsFaces",)),
+    "IFCFACE": ("IfcFace", ("Bounds",)),
+    "IFCFACEOUTERBOUND": ("IfcFaceOuterBound", ("Bound", "Orientation")),
+    "IFCFACEBOUND": ("IfcFaceBound", ("Bound", "Orientation")),
+    "IFCPOLYLOOP": ("IfcPolyLoop", ("Polygon",)),
+    "IFCBOUNDINGBOX": ("IfcBoundingBox", ("Corner", "XDim", "YDim", "ZDim")),
+}
+# индексы отрезков IfcIndexedPolyCurve — целые числа
+_INDEX_TYPES = {"IFCLINEINDEX", "IFCARCINDEX"}
+
+_SI_PREFIX = {
+    "EXA": 1e18,
+    "PETA": 1e15,
+    "TERA": 1e12,
+    "GIGA": 1e9,
+    "MEGA": 1e6,
+    "KILO": 1e3,
+    "HECTO": 1e2,
+    "DECA": 1e1,
+    "DECI": 1e-1,
+    "CENTI": 1e-2,
+    "MILLI": 1e-3,
+    "MICRO": 1e-6,
+    "NANO": 1e-9,
+}
+_CONVERSION_UNITS = {"FOOT": 0.3048, "INCH": 0.0254, "YARD": 0.9144, "MILE": 1609.344}
+
+
+class Ref(int):
+    """Ссылка #N на другую запись."""
+
+
+class Enum(str):
+    """Значение перечисления .VALUE. без точек."""
+
+
+class Typed(list):
+    """Типизированное значение IFCLABEL('x'): список аргументов и тип в type."""
+
+    type = None
+
+
+def decode_string(raw):
+    """Строка STEP без кавычек → str (\\X2\\, \\X\\, \\S\\ и '')."""
+    s = raw.replace("''", "'")
+    if "\\" not in s:
+        return s
+    out = []
+    i = 0
+    while i < len(s):
+        if s.startswith("\\X2\\", i):
+            end = s.find("\\X0\\", i + 4)
+            if end < 0:
+                break
+            hexs = s[i + 4 : end]
+            out.append(bytes.fromhex(hexs).decode("utf-16-be", errors="replace"))
+            i = end + 4
+        elif s.startswith("\\X4\\", i):
+            end = s.find("\\X0\\", i + 4)
+            if end < 0:
+                break
+            out.append(bytes.fromhex(s[i + 4 : end]).decode("utf-32-be", errors="replace"))
+            i = end + 4
+        elif s.startswith("\\X\\", i):
+            out.append(bytes.fromhex(s[i + 3 : i + 5]).decode("latin-1"))
+            i += 5
+        elif s.startswith("\\S\\", i) and i + 3 < len(s):
+            out.append(chr(ord(s[i + 3]) + 128))
+            i += 4
+        elif s.startswith("\\P", i) and s.startswith("\\", i + 3):
+            i += 4  # смена кодовой страницы ISO 8859 — для латиницы не важна
+        elif s.startswith("\\\\", i):
+            out.append("\\")
+            i += 2
+        else:
+            out.append(s[i])
+            i += 1
+    return "".join(out)
+
+
+def parse_args(text):
+    """Аргументы записи (текст внутри внешних скобок) → список значений."""
+    stack = [[]]
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            if text[pos:].strip():
+                raise ValueError(f"Не удалось разобрать STEP: {text[pos:pos + 40]!r}")
+            break
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "str":
+            stack[-1].append(decode_string(m.group("str")[1:-1]))
+        elif kind == "ref":
+            stack[-1].append(Ref(m.group("ref")[1:]))
+        elif kind == "enum":
+            stack[-1].append(Enum(m.group("enum")[1:-1]))
+        elif kind == "num":
+            stack[-1].append(float(m.group("num")))
+        elif kind == "typed":
+            # типизированное значение IFCLABEL('x') — список из одного элемента с типом
+            typed = Typed()
+            typed.type = m.group("typed").upper()
+            stack.append(typed)
+        elif kind == "open":
+            stack.append([])
+        elif kind == "close":
+            value = stack.pop()
+            stack[-1].append(value)
+        elif kind == "null":
+            stack[-1].append(None)
+    return stack[0]
+
+
+def _header_pattern(types):
+    names = "|".join(sorted(types, key=len, reverse=True))
+    return re.compile(r"#(\d+)\s*=\s*(" + names + r")\s*\(")
+
+
+def iter_records(path, types, accept=None):
+    """
+    (id, ТИП, аргументы) для записей с типами из types; остальные записи
+    (и те, что отклонил accept(id, ТИП)) пропускаются без разбора: заголовки
+    нужных типов ищутся одним регулярным выражением по блоку. Файл читается
+    блоками, в памяти — только текущий блок.
+    """
+    header = _header_pattern(types)
+    tail = ""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), ""):
+            data = tail + chunk
+            done = 0
+            for m in header.finditer(data):
+                if m.start() < done:
+                    continue
+                rid = int(m.group(1))
+                kind = m.group(2)
+                if accept is not None and not accept(rid, kind):
+                    continue
+                end = _STATEMENT.match(data, m.end())
+                if not end:
+                    # запись не поместилась в блок — дочитаем со следующим
+                    done = m.start()
+                    break
+                done = end.end()
+                body = data[m.end() : data.rfind(")", m.end(), done)]
+                yield rid, kind, parse_args(body)
+            else:
+                # заголовок записи мог разорваться на границе блоков
+                done = max(done, len(data) - _HEADER_MAX)
+            tail = data[done:]
+
+
+def _refs(value):
+    """Все ссылки #N в значении (в том числе во вложенных списках)."""
+    if isinstance(value, Ref):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _refs(item)
+
+
+class TypedValue:
+    """Типизированное значение с интерфейсом ifcopenshell (is_a, wrappedValue)."""
+
+    __slots__ = ("type", "wrappedValue")
+
+    def __init__(self, type_name, value):
+        self.type = type_name
+        self.wrappedValue = value
+
+    def is_a(self, name=None):
+        return self.type if name is None else self.type == name.upper()
+
+
+class StepEntity:
+    """
+    Запись из StepScan.records с интерфейсом сущности ifcopenshell: атрибуты
+    по именам IFC и is_a — чтобы считать оболочку теми же функциями
+    fast_geometry. Ссылки разворачиваются в StepEntity при обращении;
+    ссылка на незапомненную запись — None.
+    """
+
+    __slots__ = ("_scan", "_rid")
+
+    def __init__(self, scan, rid):
+        self._scan = scan
+        self._rid = rid
+
+    def id(self):
+        return self._rid
+
+    def is_a(self, name=None):
+        ifc_type = ENTITIES[self._scan.records[self._rid][0]][0]
+        return ifc_type if name is None else ifc_type == name
+
+    def __getattr__(self, attr):
+        kind, args = self._scan.records[self._rid]
+        names = ENTITIES[kind][1]
+        if attr not in names:
+            raise AttributeError(attr)
+        i = names.index(attr)
+        return self._scan.value(args[i]) if i < len(args) else None
+
+
+class StepScan:
+    """Результат сканирования: пространственная структура, размещения и формы помещений."""
+
+    def __init__(self):
+        # id -> (GlobalId, Name, Description, LongName, ObjectPlacement, Representation)
+        self.spaces = {}
+        self.structure = {}  # id -> (тип IFC, GlobalId, Name, Elevation)
+        self.parent = {}  # id -> RelatingObject / RelatingStructure
+        self.records = {}  # id -> (ТИП, аргументы) для записей, достижимых от помещений
+        self.wanted = set()
+        self.length_scale = 1.0
+        self._matrices = {}
+
+    def _want(self, *refs):
+        for ref in refs:
+            if isinstance(ref, Ref) and ref not in self.records:
+                self.wanted.add(int(ref))
+
+    def accept(self, rid, kind):
+        # записи размещений и геометрии разбираются, только если на них сослались
+        return kind not in ENTITIES or rid in self.wanted
+
+    def add(self, rid, kind, args):
+        if kind == "IFCSPACE":
+            self.spaces[rid] = (args[0], args[2], args[3], args[7], args[5], args[6])
+            self._want(args[5], args[6])
+        elif kind in SPATIAL_TYPES:
+            elevation = args[9] if kind == "IFCBUILDINGSTOREY" else None
+            self.structure[rid] = (SPATIAL_TYPES[kind], args[0], args[2], elevation)
+        elif kind == "IFCRELAGGREGATES":
+            for related in args[5] or ():
+                self.parent[int(related)] = int(args[4])
+        elif kind == "IFCRELCONTAINEDINSPATIALSTRUCTURE":
+            # в этаж вложены тысячи элементов — запоминаем только уже известные
+            # помещения и зоны (связи обычно записаны в конце файла)
+            for related in args[4] or ():
+                if related in self.spaces or related in self.structure:
+                    self.parent.setdefault(int(related), int(args[5]))
+        elif kind in ENTITIES:
+            self.records[rid] = (kind, args)
+            self.wanted.discard(rid)
+            if kind == "IFCSHAPEREPRESENTATION":
+                # из представлений помещения нужны только Body и Box
+                if args[1] in REPRESENTATIONS:
+                    self._want(*_refs(args[3]))
+            else:
+                self._want(*_refs(args))
+        elif kind == "IFCSIUNIT":
+            if args[1] == "LENGTHUNIT" and args[3] == "METRE":
+                self.length_scale = _SI_PREFIX.get(args[2], 1.0)
+        elif kind == "IFCCONVERSIONBASEDUNIT":
+            if args[1] == "LENGTHUNIT":
+                self.length_scale = _CONVERSION_UNITS.get(str(args[2]).upper(), 1.0)
+
+    def value(self, value):
+        """Аргумент записи в виде, привычном fast_geometry (ссылки — StepEntity)."""
+        if isinstance(value, Ref):
+            return StepEntity(self, int(value)) if int(value) in self.records else None
+        if isinstance(value, Typed):
+            inner = value[0] if len(value) == 1 else list(value)
+            if value.type in _INDEX_TYPES:
+                inner = tuple(int(i) for i in inner)
+            return TypedValue(value.type, inner)
+        if isinstance(value, list):
+            return tuple(self.value(v) for v in value)
+        if isinstance(value, Enum) and value in ("T", "F"):
+            return value == "T"
+        return value
+
+    def _args(self, ref, kind):
+        record = self.records.get(int(ref)) if ref is not None else None
+        return record[1] if record is not None and record[0] in kind else None
+
+    def _vector(self, ref, default):
+        args = self._args(ref, ("IFCCARTESIANPOINT", "IFCDIRECTION"))
+        if args is None:
+            return np.array(default, dtype=float)
+        coords = [float(c) for c in args[0]]
+        return np.array(coords + [0.0] * (3 - len(coords)), dtype=float)
+
+    def _axis_matrix(self, ref):
+        m = np.eye(4)
+        args = self._args(ref, ("IFCAXIS2PLACEMENT3D", "IFCAXIS2PLACEMENT2D"))
+        if args is None:
+            return m
+        if self.records[int(ref)][0] == "IFCAXIS2PLACEMENT2D":
+            location, axis, ref_direction = args[0], None, args[1]
+        else:
+            location, axis, ref_direction = args[:3]
+        z = self._vector(axis, (0.0, 0.0, 1.0))
+        x = self._vector(ref_direction, (1.0, 0.0, 0.0))
+        z /= np.linalg.norm(z)
+        x = x - np.dot(x, z) * z
+        x /= np.linalg.norm(x)
+        m[:3, 0] = x
+        m[:3, 1] = np.cross(z, x)
+        m[:3, 2] = z
+        m[:3, 3] = self._vector(location, (0.0, 0.0, 0.0))
+        return m
+
+    def _local_placement(self, ref):
+        return self._args(ref, ("IFCLOCALPLACEMENT",))
+
+    def placement_matrix(self, ref):
+        """Мировая матрица 4x4 IfcLocalPlacement (в единицах модели)."""
+        if self._local_placement(ref) is None:
+            return np.eye(4)
+        ref = int(ref)
+        cached = self._matrices.get(ref)
+        if cached is not None:
+            return cached
+        chain = []
+        while (
+            ref is not None and self._local_placement(ref) is not None and ref not in self._matrices
+        ):
+            if ref in chain:  # зацикленная цепочка в битом файле
+                break
+            chain.append(ref)
+            parent = self._local_placement(ref)[0]
+            ref = int(parent) if parent is not None else None
+        m = self._matrices.get(ref, np.eye(4)) if ref is not None else np.eye(4)
+        for pid in reversed(chain):
+            m = m @ self._axis_matrix(self._local_placement(pid)[1])
+            self._matrices[pid] = m
+        return m
+
+    def space_geometry(self, rid):
+        """
+        Статистика геометрии помещения (как fast_geometry.fast_space_geometry)
+        или None, если представление не распознано.
+        """
+        placement, shape = self.spaces[rid][4:6]
+        if shape is None or int(shape) not in self.records:
+            return None
+        try:
+            mesh = shape_mesh(StepEntity(self, int(shape)))
+            if mesh is None:
+                return None
+            return compute_stats(
+                *place_mesh(mesh, self.placement_matrix(placement), self.length_scale)
+            )
+        except Exception:
+            return None
+
+    def space_origins(self):
+        """
+        Помещения в порядке файла: (id записи, GlobalId, Name, Description,
+        LongName, начало ObjectPlacement в мировых координатах и метрах).
+        """
+        for rid in sorted(self.spaces):
+            global_id, name, description, longname, placement, _ = self.spaces[rid]
+            origin = self.placement_matrix(placement)[:3, 3] * self.length_scale
+            yield rid, global_id, name, description, longname, [float(x) for x in origin]
+
+
+def scan(path):
+    """
+    Сканирует IFC-файл (STEP) и возвращает StepScan. Первый проход — структура
+    и единицы; следующие — только записи, на которые сослались уже найденные,
+    пока такие остаются.
+    """
+    result = StepScan()
+    types = _STRUCTURE | _UNITS | set(ENTITIES)
+    while True:
+        tried = set(result.wanted)
+        for rid, kind, args in iter_records(path, types, result.accept):
+            result.add(rid, kind, args)
+        # файл просмотрен целиком: не найденные номера — записи других типов
+        result.wanted -= tried
+        if not result.wanted:
+            return result
+        types = set(ENTITIES)
@@ -0,0 +1,184 @@
+"""
+Поиск совпадающих заглушек (stubs) через пространственный хэш.
+
+Заглушки группируются по этажам; внутри этажа точки раскладываются по
+равномерной сетке с шагом, равным допуску, поэтому пара ближе допуска
+всегда лежит в соседних ячейках (3x3x3). Каждая точка сравнивается
+только с уже добавленными точками соседних ячеек — время почти линейное,
+без попарного перебора. Близкие пары объединяются в группы (union-find):
+цепочка A~B~C — одна группа, даже если A и C дальше допуска.
+
+Точно совпадающие точки объединяются по словарю координат и в сетку не
+добавляются — иначе десятки тысяч заглушек в одной точке (например,
+spaces.json старого формата без геометрии) давали бы квадратичный перебор.
+
+Заглушки помещений без геометрии (geometry_mode "failed" — координаты
+[0, 0, 0] — или без координат) в сетку не попадают: они не совпадают
+друг с другом, а просто не размещены, и отмечаются отдельно.
+"""
+
+import argparse
+import math
+import os
+
+STUB_TOLERANCE = float(os.environ.get("BIM_STUB_TOLERANCE", "0.3"))  # м
+
+COLLISION_MODES = ("flag", "merge")
+
+# объединять заглушки можно только в мировых координатах: в локальной системе
+# помещения одинаковые представления в разных местах дают одну и ту же точку
+MERGE_FRAMES = ("world",)
+
+
+def tolerance_arg(value):
+    """Тип argparse для допуска: положительное число метров."""
+    tolerance = float(value)
+    if not tolerance > 0:
+        raise argparse.ArgumentTypeError(f"допуск должен быть больше 0: {value}")
+    return tolerance
+
+
+class SpatialHash:
+    """Равномерная сетка {ячейка: [индексы точек]} с шагом cell."""
+
+    def __init__(self, cell):
+        if cell <= 0:
+            raise ValueError(f"Шаг сетки должен быть положительным: {cell}")
+        self.cell = cell
+        self.cells = {}
+
+    def key(self, point):
+        return tuple(math.floor(c / self.cell) for c in point)
+
+    def add(self, index, point):
+        self.cells.setdefault(self.key(point), []).append(index)
+
+    def nearby(self, point):
+        """Индексы точек в ячейке точки и 26 соседних."""
+        kx, ky, kz = self.key(point)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    yield from self.cells.get((kx + dx, ky + dy, kz + dz), ())
+
+
+def _point(coords):
+    x, y, z = (list(coords or ()) + [0.0, 0.0, 0.0])[:3]
+    return (float(x), float(y), float(z))
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def find_clusters(points, tolerance=STUB_TOLERANCE):
+    """
+    Группы индексов точек (размер > 1), связанных расстоянием <= tolerance.
+    Группы и индексы в них — в порядке первого появления.
+    """
+    grid = SpatialHash(tolerance)
+    parent = list(range(len(points)))
+    tol2 = tolerance * tolerance
+    exact = {}
+    for i, p in enumerate(points):
+        first = exact.setdefault(p, i)
+        if first != i:
+            parent[i] = _find(parent, first)
+            continue
+        for j in grid.nearby(p):
+            q = points[j]
+            if (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2 <= tol2:
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+        grid.add(i, p)
+    groups = {}
+    for i in range(len(points)):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def _spread(points):
+    """Наибольшее расстояние от первой точки группы (O(k), без перебора пар)."""
+    return max(math.dist(points[0], p) for p in points[1:])
+
+
+def resolve_collisions(stubs, spaces, tolerance=STUB_TOLERANCE, mode="flag", frame="world"):
+    """
+    stubs и spaces — параллельные списки (заглушка и её помещение из spaces.json).
+    Возвращает (заглушки после обработки, отчёт):
+      отчёт["collisions"] — группы совпадающих заглушек по этажам
+      (spread — наибольшее расстояние от первой заглушки группы);
+      отчёт["unplaced"] — заглушки помещений без геометрии.
+    В режиме "merge" группа заглушек одного помещения ТЗ сводится к первой
+    (ids остальных — в её "merged_ids"); группы разных помещений ТЗ
+    только отмечаются. frame — система координат spaces.json: вне мировой
+    (spaces.json старого формата, без поля "frame") "merge" не выполняется,
+    группы только отмечаются.
+    """
+    if mode not in COLLISION_MODES:
+        raise ValueError(f"Неизвестный режим: {mode}. Допустимо: {', '.join(COLLISION_MODES)}")
+    if not tolerance > 0:
+        raise ValueError(f"Допуск должен быть больше 0: {tolerance}")
+    if mode == "merge" and frame not in MERGE_FRAMES:
+        print(
+            f"⚠️ Координаты помещений не в мировой системе (frame: {frame}) — "
+            "совпадающие заглушки только отмечаются, без объединения"
+        )
+        mode = "flag"
+
+    unplaced = []
+    by_storey = {}
+    for i, (stub, space) in enumerate(zip(stubs, spaces)):
+        if space.get("geometry_mode") == "failed" or stub.get("coordinates") is None:
+            unplaced.append({"id": stub.get("id"), "name": space.get("name")})
+            continue
+        by_storey.setdefault(space.get("storey"), []).append(i)
+
+    collisions = []
+    dropped = set()
+    merged_ids = {}
+    for storey, members in by_storey.items():
+        points = [_point(stubs[i].get("coordinates")) for i in members]
+        for group in find_clusters(points, tolerance):
+            idx = [members[k] for k in group]
+            names = {stubs[i]["name"] for i in idx}
+            action = "merged" if mode == "merge" and len(names) == 1 else "flagged"
+            if action == "merged":
+                keep = idx[0]
+                merged_ids[keep] = [stubs[i].get("id") for i in idx[1:]]
+                dropped.update(idx[1:])
+            collisions.append(
+                {
+                    "storey": storey,
+                    "action": action,
+                    "spread": round(_spread([points[k] for k in group]), 6),
+                    "stubs": [
+                        {
+                            "id": stubs[i].get("id"),
+                            "name": stubs[i]["name"],
+                            "space": spaces[i].get("name"),
+                            "coordinates": stubs[i].get("coordinates"),
+                        }
+                        for i in idx
+                    ],
+                }
+            )
+
+    result = []
+    for i, stub in enumerate(stubs):
+        if i in dropped:
+            continue
+        if i in merged_ids:
+            stub = dict(stub, merged_ids=merged_ids[i])
+        result.append(stub)
+    return result, {
+        "tolerance": tolerance,
+        "mode": mode,
+        "frame": frame,
+        "collisions": collisions,
+        "unplaced": unplaced,
+    }
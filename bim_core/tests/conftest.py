@@ -0,0 +1,7 @@
+import os
+import sys
+
+# модули bim_core импортируют друг друга как верхнеуровневые (как run.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "bim_core"))
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "..", "samples")
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import batch_run
+
+
+def _write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    tz = _write_json(tmp_path / "tz.json", {"room_temperatures": {"Офис": 22, "Коридор": 16}})
+    spaces = _write_json(
+        tmp_path / "spaces.json",
+        {
+            "frame": "world",
+            "spaces": [
+                {"id": "S1", "name": "Офис 101", "coordinates": [0, 0, 0]},
+                {"id": "S2", "name": "Коридор", "coordinates": [5, 0, 0]},
+            ],
+        },
+    )
+    return tz, spaces
+
+
+OPTIONS = {"use_mappings": False, "geometry_workers": 1}
+
+
+def test_failed_jobs_do_not_stop_the_batch(tmp_path, inputs):
+    tz, spaces = inputs
+    jobs = [
+        {"spaces": spaces, "tz": tz, "out": str(tmp_path / "a")},
+        {"spaces": spaces, "tz": str(tmp_path / "missing.json"), "out": str(tmp_path / "b")},
+        # задание, которое нельзя передать в процесс пула
+        {"spaces": spaces, "tz": tz, "out": str(tmp_path / "c"), "note": lambda: None},
+        {"spaces": spaces, "tz": tz, "out": str(tmp_path / "d")},
+    ]
+    summary = batch_run.run_batch(jobs, workers=2, options=OPTIONS)
+
+    assert [r["status"] for r in summary["jobs"]] == ["ok", "error", "error", "ok"]
+    assert [r["out"] for r in summary["jobs"]] == [job["out"] for job in jobs]
+    assert "FileNotFoundError" in summary["jobs"][1]["error"]
+    assert summary["jobs"][2]["error"]
+    assert (summary["ok"], summary["failed"]) == (2, 2)
+    assert (summary["spaces"], summary["matched"]) == (4, 4)
+    for name in ("a", "d"):
+        assert (tmp_path / name / "match_report.json").exists()
+
+
+def test_summary_is_written_when_a_job_fails(tmp_path, inputs, monkeypatch):
+    tz, spaces = inputs
+    manifest = _write_json(
+        tmp_path / "jobs.json",
+        {
+            "jobs": [
+                {"spaces": spaces, "tz": tz, "out": "ok"},
+                {"spaces": spaces, "tz": "missing.json", "out": "broken"},
+            ]
+        },
+    )
+    monkeypatch.setattr(
+        "sys.argv", ["batch_run.py", "--manifest", manifest, "--jobs", "2", "--no-mappings"]
+    )
+    assert batch_run.main() == 1
+    summary = json.loads((tmp_path / "batch_summary.json").read_text(encoding="utf-8"))
+    assert [r["status"] for r in summary["jobs"]] == ["ok", "error"]
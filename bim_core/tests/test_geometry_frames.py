@@ -0,0 +1,40 @@
+import os
+
+import ifcopenshell
+import numpy as np
+import pytest
+
+from conftest import SAMPLES
+from ifc_reader import get_spaces_geometry, get_spaces_geometry_fast
+
+SAMPLE = os.path.join(SAMPLES, "OfficeBuilding_IFC1.ifc")
+
+
+@pytest.fixture
+def moved_model():
+    """Образец, в котором одно помещение сдвинуто на (20, 5, 0) своим ObjectPlacement."""
+    model = ifcopenshell.open(SAMPLE)
+    space = model.by_type("IfcSpace")[0]
+    placement = space.ObjectPlacement.RelativePlacement
+    x, y, z = placement.Location.Coordinates
+    placement.Location = model.createIfcCartesianPoint((x + 20.0, y + 5.0, z))
+    return model, space
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_exact_and_fast_share_world_frame(moved_model, workers):
+    model, moved = moved_model
+    spaces = model.by_type("IfcSpace")
+    exact = get_spaces_geometry(model, spaces, workers)
+    fast = get_spaces_geometry_fast(model, spaces, workers)
+    for space in spaces:
+        stats, _ = fast[space.id()]
+        np.testing.assert_allclose(
+            exact[space.id()]["centroid"], stats["centroid"], atol=1e-9
+        )
+    # сдвиг виден и в точном режиме: та же мировая система, что у fast
+    original = ifcopenshell.open(SAMPLE)
+    before = get_spaces_geometry(original, [original.by_id(moved.id())], 1)[moved.id()]
+    np.testing.assert_allclose(
+        np.subtract(exact[moved.id()]["centroid"], before["centroid"]), [20.0, 5.0, 0.0], atol=1e-9
+    )
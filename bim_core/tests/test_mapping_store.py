@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+import match_zones
+from mapping_store import SPACE_SPEC, ZONE_ROOM, MappingStore
+from run import run_pipeline
+
+
+def _run(tmp_path, rooms, db, name="Кабинет-коридор 101"):
+    tz = tmp_path / f"tz_{len(rooms)}.json"
+    tz.write_text(
+        json.dumps({"room_temperatures": {r: 20 for r in rooms}}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    spaces = tmp_path / "spaces.json"
+    spaces.write_text(
+        json.dumps(
+            {"frame": "world", "spaces": [{"id": "S1", "name": name, "coordinates": [0, 0, 0]}]},
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    out = tmp_path / "out"
+    run_pipeline(str(tz), str(out), spaces_path=str(spaces), mapping_db=str(db))
+    report = json.loads((out / "match_report.json").read_text(encoding="utf-8"))
+    return report["matched"][0]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "mappings.sqlite"
+
+
+def test_result_does_not_depend_on_run_history(tmp_path, db):
+    fresh = _run(tmp_path, ["Коридор", "Офис"], tmp_path / "fresh.sqlite")
+    _run(tmp_path, ["Офис"], db)
+    after = _run(tmp_path, ["Коридор", "Офис"], db)
+    assert fresh["tz_room"]["name"] == after["tz_room"]["name"] == "Коридор"
+    assert after["source"] == "classifier"
+    with MappingStore(db) as store:
+        assert store.stats() == {}
+
+
+def test_confirmed_mapping_overrides_classifier(tmp_path, db):
+    with MappingStore(db) as store:
+        store.record(SPACE_SPEC, "Кабинет-коридор 101", "Офис", confirmed=True)
+    hit = _run(tmp_path, ["Коридор", "Офис"], db)
+    assert hit["tz_room"]["name"] == "Офис"
+    assert hit["source"] == "store"
+
+
+def test_fuzzy_zone_matches_are_unconfirmed_suggestions(db):
+    zones, rooms = ["Офис 1", "Коридор", "Склад"], ["Офис", "Коридор"]
+    with MappingStore(db) as store:
+        _, first = match_zones.match(zones, rooms, store=store)
+        _, second = match_zones.match(zones, rooms, store=store)
+        assert store.lookup_many(ZONE_ROOM, zones) == {}
+        assert store.lookup(ZONE_ROOM, "Коридор", confirmed_only=False)[0] == "Коридор"
+    assert first == second
+    assert all("source" in pair for pair in first["pairs"])
+    assert [p["source"] for p in first["pairs"]] == ["fuzzy", "fuzzy", None]
+
+
+def test_evict_keeps_confirmed_rows_over_limit(db):
+    with MappingStore(db) as store:
+        confirmed = ["Кабинет", "Приёмная", "Переговорная"]
+        suggested = ["Кладовая", "Архив", "Серверная"]
+        store.record_many(SPACE_SPEC, [(n, "Офис", None, 1.0) for n in confirmed], confirmed=True)
+        store.record_many(SPACE_SPEC, [(n, "Склад", None, 1.0) for n in suggested])
+        assert store.evict(max_entries=2) == 3
+        assert store.stats()[SPACE_SPEC] == {"entries": 3, "confirmed": 3, "hits": 0}
+        assert store.evict(max_entries=2) == 0
@@ -0,0 +1,47 @@
+import itertools
+
+import numpy as np
+
+import match_zones
+
+
+def _brute_force(scores):
+    n, m = scores.shape
+    if n > m:
+        return _brute_force(scores.T)
+    return max(
+        sum(int(scores[i, p[i]]) for i in range(n)) for p in itertools.permutations(range(m), n)
+    )
+
+
+def test_assign_is_optimal_on_sparse_matrices():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n, m = rng.integers(1, 7, 2)
+        scores = rng.integers(0, 100, (n, m))
+        scores[rng.random((n, m)) < 0.6] = 0
+        rows, cols = match_zones.assign(scores)
+        assert len(set(rows)) == len(rows) and len(set(cols)) == len(cols)
+        assert int(scores[rows, cols].sum()) == _brute_force(scores)
+
+
+def test_components_split_unrelated_blocks():
+    mask = np.array(
+        [
+            [1, 0, 0, 0],
+            [0, 0, 1, 0],
+            [1, 1, 0, 0],
+            [0, 0, 0, 0],
+        ],
+        dtype=bool,
+    )
+    found = [(r.tolist(), c.tolist()) for r, c in match_zones.components(mask)]
+    assert sorted(found) == [([0, 2], [0, 1]), ([1], [2])]
+
+
+def test_match_does_not_depend_on_zone_order():
+    zones = ["Коридор 1 этаж", "Офис 101", "Склад"]
+    rooms = ["Офис", "Коридор"]
+    forward, _ = match_zones.match(zones, rooms)
+    backward, _ = match_zones.match(zones[::-1], rooms)
+    assert forward == backward == {"Коридор 1 этаж": "Коридор", "Офис 101": "Офис"}
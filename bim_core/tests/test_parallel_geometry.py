@@ -0,0 +1,62 @@
+import os
+
+import ifcopenshell
+import numpy as np
+import pytest
+
+import ifc_reader
+from conftest import SAMPLES
+
+SAMPLE = os.path.join(SAMPLES, "OfficeBuilding_IFC1.ifc")
+
+
+@pytest.fixture(scope="module")
+def model():
+    return ifcopenshell.open(SAMPLE)
+
+
+@pytest.fixture(scope="module")
+def sequential(model):
+    return ifc_reader.get_spaces_geometry(model, model.by_type("IfcSpace"), workers=1)
+
+
+def _assert_same(stats, expected):
+    assert stats.keys() == expected.keys()
+    for space_id, value in expected.items():
+        assert value is not None
+        for key in ("centroid", "floor_area", "volume"):
+            np.testing.assert_allclose(stats[space_id][key], value[key], atol=1e-9)
+        for corner in ("min", "max"):
+            np.testing.assert_allclose(
+                stats[space_id]["bbox"][corner], value["bbox"][corner], atol=1e-9
+            )
+
+
+@pytest.mark.parametrize("workers", [2, 4])
+def test_iterator_matches_create_shape(model, sequential, workers):
+    stats = ifc_reader.get_spaces_geometry(model, model.by_type("IfcSpace"), workers=workers)
+    _assert_same(stats, sequential)
+
+
+def test_spaces_missed_by_iterator_are_computed_sequentially(model, sequential, monkeypatch):
+    iterate = ifc_reader._iter_space_shapes
+
+    def every_other(*args, **kwargs):
+        for i, shape in enumerate(iterate(*args, **kwargs)):
+            if i % 2 == 0:
+                yield shape
+
+    monkeypatch.setattr(ifc_reader, "_iter_space_shapes", every_other)
+    stats = ifc_reader.get_spaces_geometry(model, model.by_type("IfcSpace"), workers=2)
+    _assert_same(stats, sequential)
+
+
+def test_iterator_failure_falls_back_to_sequential(model, sequential, monkeypatch, capsys):
+    def broken(*args, **kwargs):
+        yield from ()
+        raise RuntimeError("итератор недоступен")
+
+    monkeypatch.setattr(ifc_reader, "_iter_space_shapes", broken)
+    stats = ifc_reader.get_spaces_geometry(model, model.by_type("IfcSpace"), workers=2)
+    _assert_same(stats, sequential)
+    assert "итератор недоступен" in capsys.readouterr().out
@@ -0,0 +1,85 @@
+import random
+import re
+
+import pytest
+
+import params_adapter
+from room_classifier import spec_classifier
+from synonyms import SYNONYMS
+
+
+def _baseline_cls(n):
+    """Прежний линейный cls_from_name."""
+    s = (n or "").lower()
+    for k, v in params_adapter.SYN.items():
+        if k in s:
+            return v
+    return "Офис"
+
+
+def _normalize(s):
+    return re.sub(r"\d+", "", s or "").strip().lower()
+
+
+def _baseline_spec(space_name, specs):
+    """Прежний линейный run.find_spec_for_space."""
+    sname = _normalize(space_name)
+    for spec in specs:
+        base = _normalize(spec["name"])
+        if base and base in sname:
+            return spec["name"], spec["name"]
+        for syn in SYNONYMS.get(base, []):
+            if _normalize(syn) and _normalize(syn) in sname:
+                return spec["name"], syn
+    return None, None
+
+
+@pytest.mark.parametrize(
+    "name, cls",
+    [
+        ("Корпус А", "Офис"),
+        ("Кордегардия", "Офис"),
+        ("Декоративная мастерская", "Офис"),
+        ("WC 101", "Офис"),
+        ("Hall", "Офис"),
+        ("Холл 1 этажа", "Коридор"),
+        ("Кабинет-коридор 101", "Офис"),
+        ("Лестница 2", "Лестница"),
+        ("Веранда", "Веранда"),
+        ("", "Офис"),
+        (None, "Офис"),
+    ],
+)
+def test_cls_from_name_keeps_baseline(name, cls):
+    assert params_adapter.cls_from_name(name) == cls == _baseline_cls(name)
+
+
+def _random_names(count, seed=0):
+    rng = random.Random(seed)
+    words = [
+        "офис", "кабинет", "коридор", "вестибюль", "холл", "hall", "кор", "wc", "корпус",
+        "кордегардия", "декоративная", "лестница", "веранда", "терраса", "санузел",
+        "туалет", "meeting", "конференц", "переговорная", "склад", "тамбур", "мастерская",
+    ]
+    letters = "абвгдекорлстухwchal "
+    names = []
+    for _ in range(count):
+        parts = rng.sample(words, rng.randint(1, 3))
+        parts.append("".join(rng.choice(letters) for _ in range(rng.randint(0, 6))))
+        name = " ".join(parts) + f" {rng.randint(1, 999)}"
+        names.append(name.title() if rng.random() < 0.5 else name)
+    return names
+
+
+def test_cls_from_name_matches_baseline_on_random_names():
+    for name in _random_names(3000):
+        assert params_adapter.cls_from_name(name) == _baseline_cls(name), name
+
+
+def test_spec_classifier_matches_baseline_on_random_names():
+    specs = [{"name": n} for n in ("Санузел", "Коридор", "Офис", "Переговорная", "Склад 2")]
+    classifier = spec_classifier(specs)
+    for name in _random_names(3000, seed=1):
+        hit = classifier.classify(name)
+        got = (hit.label["name"], hit.synonym) if hit else (None, None)
+        assert got == _baseline_spec(name, specs), name
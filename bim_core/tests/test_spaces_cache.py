@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from spaces_cache import SpacesCache
+
+
+def _write_entry(directory, name="spaces", payload="[]", columnar=True):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{name}.json").write_text(payload)
+    (directory / f"{name}.spatial.json").write_text("{}")
+    if columnar:
+        (directory / f"{name}.bin").write_bytes(b"bin:" + payload.encode())
+    return directory / f"{name}.json"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SpacesCache(tmp_path / "cache", max_mb=1)
+
+
+def test_hit_copies_all_files(cache, tmp_path):
+    cache.put("k", _write_entry(tmp_path / "src", payload="[1]"), columnar=True)
+    out = tmp_path / "out" / "spaces.json"
+    out.parent.mkdir()
+    assert cache.get("k", out, columnar=True)
+    assert out.read_text() == "[1]"
+    assert (out.parent / "spaces.spatial.json").read_text() == "{}"
+    assert (out.parent / "spaces.bin").read_bytes() == b"bin:[1]"
+
+
+def test_miss_without_columnar_file(cache, tmp_path):
+    cache.put("k", _write_entry(tmp_path / "src", columnar=False))
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    # рядом лежит устаревший spaces.bin от прошлого запуска — его нельзя принять за кэш
+    (out_dir / "spaces.bin").write_bytes(b"stale")
+    assert cache.get("k", out_dir / "spaces.json")
+    assert not cache.get("k", out_dir / "spaces.json", columnar=True)
+    assert (out_dir / "spaces.bin").read_bytes() == b"stale"
+    assert not cache.get("missing", out_dir / "spaces.json")
+
+
+def test_put_without_columnar_source_writes_nothing(cache, tmp_path):
+    cache.put("k", _write_entry(tmp_path / "src", columnar=False), columnar=True)
+    assert list(cache.directory.iterdir()) == []
+
+
+def test_evict_removes_whole_entries(tmp_path):
+    cache = SpacesCache(tmp_path / "cache", max_mb=0)
+    cache.max_bytes = 2500
+    payload = "x" * 1000
+    cache.put("old", _write_entry(tmp_path / "a", payload=payload), columnar=True)
+    for path in cache.directory.iterdir():
+        os.utime(path, (1, 1))
+    cache.put("new", _write_entry(tmp_path / "b", payload=payload), columnar=True)
+    assert sorted(p.name for p in cache.directory.iterdir()) == [
+        "new.bin",
+        "new.json",
+        "new.spatial.json",
+    ]
@@ -0,0 +1,47 @@
+import numpy as np
+
+from spaces_columnar import ColumnarSpaces, write_spaces_columnar
+
+GEOMETRY = {
+    "centroid": [1.0, 2.0, 3.0],
+    "bbox": {"min": [0.0, 0.0, 0.0], "max": [2.0, 4.0, 6.0]},
+    "floor_area": 8.0,
+    "volume": 48.0,
+}
+
+SPACES = [
+    {
+        "id": "A",
+        "name": "Офис 101",
+        "storey": "Этаж 1",
+        "coordinates": [1.0, 2.0, 3.0],
+        "geometry": GEOMETRY,
+        "geometry_mode": "exact",
+    },
+    {
+        "id": None,
+        "name": None,
+        "storey": None,
+        "coordinates": None,
+        "geometry": None,
+        "geometry_mode": "failed",
+    },
+    {
+        "id": "C",
+        "name": "",
+        "storey": "Этаж 1",
+        "coordinates": [0.0, 0.0, 0.0],
+        "geometry": None,
+        "geometry_mode": None,
+    },
+]
+
+
+def test_records_round_trip_nulls(tmp_path):
+    path = str(tmp_path / "spaces.bin")
+    write_spaces_columnar(SPACES, path, frame="world")
+    with ColumnarSpaces(path) as table:
+        assert table.records() == SPACES
+        assert table.frame == "world"
+        assert table.column("name").tolist() == ["Офис 101", None, ""]
+        assert np.isnan(table.column("coordinates")[1]).all()
@@ -0,0 +1,97 @@
+import os
+
+import ifcopenshell
+import ifcopenshell.guid
+import pytest
+
+from conftest import SAMPLES
+from fast_geometry import unit_scale
+from spatial_index import SpatialIndex
+from step_scanner import scan
+
+SAMPLE = os.path.join(SAMPLES, "OfficeBuilding_IFC1.ifc")
+
+
+def _nested_model(path):
+    """Проект → участок → здание → этажи (мм) → помещения; помещение в помещении и без этажа."""
+    model = ifcopenshell.file(schema="IFC4")
+    mm = model.createIfcSIUnit(None, "LENGTHUNIT", "MILLI", "METRE")
+
+    def create(ifc_type, name, **attrs):
+        return model.create_entity(
+            ifc_type, GlobalId=ifcopenshell.guid.new(), Name=name, **attrs
+        )
+
+    project = create("IfcProject", "Проект", UnitsInContext=model.createIfcUnitAssignment([mm]))
+    site = create("IfcSite", "Участок")
+    building = create("IfcBuilding", "Корпус А")
+    first = create("IfcBuildingStorey", "Этаж 1", Elevation=0.0)
+    second = create("IfcBuildingStorey", "Этаж 2", Elevation=3300.0)
+    office = create("IfcSpace", "Офис 101")
+    pantry = create("IfcSpace", "Кладовая 101а")
+    hall = create("IfcSpace", "Холл 201")
+    create("IfcSpace", "Помещение без этажа")
+
+    def aggregate(parent, *children):
+        model.create_entity(
+            "IfcRelAggregates",
+            GlobalId=ifcopenshell.guid.new(),
+            RelatingObject=parent,
+            RelatedObjects=children,
+        )
+
+    aggregate(project, site)
+    aggregate(site, building)
+    aggregate(building, second, first)
+    aggregate(first, office)
+    aggregate(office, pantry)
+    model.create_entity(
+        "IfcRelContainedInSpatialStructure",
+        GlobalId=ifcopenshell.guid.new(),
+        RelatingStructure=second,
+        RelatedElements=[hall],
+    )
+    model.write(str(path))
+    return {e.Name: e.GlobalId for e in model.by_type("IfcRoot") if getattr(e, "Name", None)}
+
+
+@pytest.mark.parametrize("source", ["sample", "nested"])
+def test_model_and_scan_indexes_are_identical(tmp_path, source):
+    path = SAMPLE
+    if source == "nested":
+        path = str(tmp_path / "nested.ifc")
+        _nested_model(path)
+    model = ifcopenshell.open(path)
+    from_model = SpatialIndex.from_model(model, unit_scale(model))
+    from_scan = SpatialIndex.from_scan(scan(path))
+    assert from_model.to_dict() == from_scan.to_dict()
+    assert list(from_model.nodes) == list(from_scan.nodes)
+
+
+def test_nested_structure_queries(tmp_path):
+    path = str(tmp_path / "nested.ifc")
+    ids = _nested_model(path)
+    index = SpatialIndex.from_scan(scan(path))
+    pantry = ids["Кладовая 101а"]
+    assert index.parent(pantry) == ids["Офис 101"]
+    assert index.storey(pantry) == ids["Этаж 1"]
+    assert index.building(pantry) == ids["Корпус А"]
+    assert index.site(pantry) == ids["Участок"]
+    assert index.storey_name(ids["Холл 201"]) == "Этаж 2"
+    assert index.elevation(ids["Холл 201"]) == pytest.approx(3.3)
+    assert index.storeys() == [ids["Этаж 1"], ids["Этаж 2"]]
+    groups = index.spaces_by_storey()
+    assert sorted(groups[ids["Этаж 1"]]) == sorted([ids["Офис 101"], pantry])
+    assert groups[None] == [ids["Помещение без этажа"]]
+    assert index.storey(ids["Этаж 1"]) is None
+    assert index.building(ids["Этаж 1"]) == ids["Корпус А"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    model = ifcopenshell.open(SAMPLE)
+    index = SpatialIndex.from_model(model, unit_scale(model))
+    path = tmp_path / "spaces.spatial.json"
+    index.save(path)
+    assert SpatialIndex.load(path).to_dict() == index.to_dict()
+    with pytest.raises(ValueError):
+        SpatialIndex.from_dict({"version": 0, "nodes": {}})
@@ -0,0 +1,73 @@
+import json
+import os
+
+import ifcopenshell
+import numpy as np
+import pytest
+
+import step_scanner
+from conftest import SAMPLES
+from ifc_reader import export_spaces
+
+SAMPLE = os.path.join(SAMPLES, "OfficeBuilding_IFC1.ifc")
+
+
+def _spaces(ifc_path, out_dir, geometry):
+    out = os.path.join(out_dir, geometry, "spaces.json")
+    export_spaces(ifc_path, out, workers=1, geometry=geometry)
+    with open(out, "r", encoding="utf-8") as f:
+        return {sp["id"]: sp for sp in json.load(f)["spaces"]}
+
+
+def _assert_same_spaces(stream, fast):
+    assert stream.keys() == fast.keys()
+    for gid, sp in fast.items():
+        got = stream[gid]
+        assert got["geometry_mode"] == sp["geometry_mode"] == "fast"
+        assert (got["name"], got["storey"]) == (sp["name"], sp["storey"])
+        np.testing.assert_allclose(got["coordinates"], sp["coordinates"], atol=1e-9)
+        for key in ("floor_area", "volume"):
+            assert got["geometry"][key] == pytest.approx(sp["geometry"][key], abs=1e-9)
+        for key in ("min", "max"):
+            np.testing.assert_allclose(got["geometry"]["bbox"][key], sp["geometry"]["bbox"][key])
+
+
+def test_stream_matches_fast_on_sample(tmp_path):
+    stream = _spaces(SAMPLE, tmp_path, "stream")
+    assert len(stream) == 12
+    assert all(sp["coordinates"] != [0.0, 0.0, 0.0] for sp in stream.values())
+    _assert_same_spaces(stream, _spaces(SAMPLE, tmp_path, "fast"))
+
+
+def test_stream_follows_moved_placement(tmp_path):
+    model = ifcopenshell.open(SAMPLE)
+    placement = model.by_type("IfcSpace")[0].ObjectPlacement.RelativePlacement
+    x, y, z = placement.Location.Coordinates
+    # новая точка записывается в конец файла — после ссылки на неё
+    placement.Location = model.createIfcCartesianPoint((x + 20.0, y + 5.0, z))
+    moved = str(tmp_path / "moved.ifc")
+    model.write(moved)
+    _assert_same_spaces(_spaces(moved, tmp_path, "stream"), _spaces(moved, tmp_path, "fast"))
+
+
+def test_unreferenced_placements_are_not_kept(tmp_path):
+    baseline = step_scanner.scan(SAMPLE)
+    with open(SAMPLE, "r", encoding="utf-8") as f:
+        text = f.read()
+    # тысяча «стен» со своими размещениями и точками, на которые помещения не ссылаются
+    extra = []
+    for i in range(1000):
+        n = 100000 + 5 * i
+        extra += [
+            f"#{n}=IFCCARTESIANPOINT(({i}.,0.,0.));",
+            f"#{n + 1}=IFCAXIS2PLACEMENT3D(#{n},$,$);",
+            f"#{n + 2}=IFCLOCALPLACEMENT($,#{n + 1});",
+            f"#{n + 3}=IFCWALL('w{i}',$,'Wall',$,$,#{n + 2},$,$,$);",
+        ]
+    padded = tmp_path / "padded.ifc"
+    padded.write_text(text.replace("ENDSEC;\nEND-ISO", "\n".join(extra) + "\nENDSEC;\nEND-ISO", 1))
+
+    result = step_scanner.scan(str(padded))
+    assert result.records.keys() == baseline.records.keys()
+    assert not any(rid >= 100000 for rid in result.records)
+    assert not result.wanted
@@ -0,0 +1,40 @@
+import pytest
+
+from stub_collisions import find_clusters, resolve_collisions
+
+
+def _stub(i, name, coords):
+    return {"id": i, "name": name, "coordinates": coords}
+
+
+STUBS = [
+    _stub("a", "Офис", [0.0, 0.0, 0.0]),
+    _stub("b", "Офис", [0.1, 0.0, 0.0]),
+    _stub("c", "Коридор", [5.0, 0.0, 0.0]),
+]
+SPACES = [{"name": s["id"], "storey": "1", "geometry_mode": "exact"} for s in STUBS]
+
+
+def test_find_clusters_chains_neighbours():
+    points = [(0.0, 0.0, 0.0), (0.25, 0.0, 0.0), (0.5, 0.0, 0.0), (3.0, 0.0, 0.0)]
+    assert find_clusters(points, 0.3) == [[0, 1, 2]]
+
+
+def test_merge_in_world_frame():
+    stubs, report = resolve_collisions(STUBS, SPACES, tolerance=0.3, mode="merge")
+    assert [s["id"] for s in stubs] == ["a", "c"]
+    assert stubs[0]["merged_ids"] == ["b"]
+    assert report["collisions"][0]["action"] == "merged"
+
+
+def test_merge_refused_without_world_frame():
+    stubs, report = resolve_collisions(STUBS, SPACES, tolerance=0.3, mode="merge", frame=None)
+    assert [s["id"] for s in stubs] == ["a", "b", "c"]
+    assert report["mode"] == "flag"
+    assert report["collisions"][0]["action"] == "flagged"
+
+
+@pytest.mark.parametrize("tolerance", [0, -1.0])
+def test_tolerance_must_be_positive(tolerance):
+    with pytest.raises(ValueError):
+        resolve_collisions(STUBS, SPACES, tolerance=tolerance)
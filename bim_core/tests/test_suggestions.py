@@ -0,0 +1,64 @@
+import random
+
+import pytest
+from rapidfuzz import fuzz, process, utils
+
+from run import suggest_match, suggest_matches
+
+SPECS = [
+    {"name": name}
+    for name in ("Офис", "Коридор", "Кабинет директора", "Склад", "Санузел", "Офис открытый")
+]
+
+
+def _baseline(name, specs, limit, cutoff):
+    """Прежний поиск: process.extract отдельно для каждого названия."""
+    candidates = [spec["name"] for spec in specs]
+    found = process.extract(
+        name or "",
+        candidates,
+        scorer=fuzz.WRatio,
+        processor=utils.default_process,
+        limit=None,
+        score_cutoff=cutoff,
+    )
+    # process.extract при равных оценках сохраняет порядок кандидатов
+    return [{"name": name, "score": int(score + 0.5)} for name, score, _ in found[:limit]]
+
+
+def test_top_k_matches_per_name_extract():
+    rng = random.Random(5)
+    words = ["офис", "коридор", "кабинет", "склад", "сан", "узел", "директор", "101", "2", "эт"]
+    names = [" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(300)]
+    names += ["", None, "ОФИС", "Офис 101", "склад!"]
+    for limit in (1, 3, 10):
+        got = suggest_matches(names, SPECS, limit=limit, cutoff=60)
+        assert got == [_baseline(n, SPECS, limit, 60) for n in names]
+
+
+def test_top_k_order_and_limits():
+    [office] = suggest_matches(["Офис 204"], SPECS, limit=2, cutoff=0)
+    assert [s["name"] for s in office] == ["Офис", "Офис открытый"]
+    assert office[0]["score"] >= office[1]["score"]
+    assert suggest_matches(["Офис"], SPECS, limit=0) == [[]]
+    assert suggest_matches(["Офис"], [], limit=3) == [[]]
+    assert suggest_matches([], SPECS) == []
+    assert suggest_matches(["zzz"], SPECS, cutoff=90) == [[]]
+    assert suggest_match("коридор 2 этажа", SPECS) == "Коридор"
+    assert suggest_match("zzz", SPECS) is None
+
+
+@pytest.mark.parametrize("limit", [1, 6])
+def test_ties_keep_tz_order(limit):
+    specs = [{"name": "Офис"}, {"name": "офис"}, {"name": "ОФИС"}]
+    [found] = suggest_matches(["офис"], specs, limit=limit)
+    assert [s["name"] for s in found] == ["Офис", "офис", "ОФИС"][:limit]
+
+
+def test_rounded_ties_are_ranked_by_exact_score():
+    # 89.7 и 90.0 округляются до 90, но лучшим остаётся точная оценка 90.0
+    specs = [{"name": "1 открытый Санузел"}, {"name": "2 Санузел"}]
+    [found] = suggest_matches(["2 Санузел открытый"], specs, limit=2)
+    assert [s["name"] for s in found] == ["2 Санузел", "1 открытый Санузел"]
+    assert [s["score"] for s in found] == [90, 90]
+    assert suggest_match("2 Санузел открытый", specs) == "2 Санузел"
@@ -0,0 +1,146 @@
+"""
+Пакетная обработка ТЗ: папка или манифест docx/pdf/txt за один запуск.
+
+Модель spaCy загружается один раз, тексты прогоняются через nlp.pipe
+(batch_size / n_process настраиваются), на каждый входной файл пишется
+отдельный JSON, а в конце — сводный index.json.
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+
+from . import run
+from .run import analyze_document, extract_all_parameters, get_nlp, read_input_file
+
+SUPPORTED_SUFFIXES = (".docx", ".pdf", ".txt")
+
+
+def collect_from_dir(directory, recursive=False):
+    directory = Path(directory)
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        p
+        for p in directory.glob(pattern)
+        if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES
+    )
+
+
+def collect_from_manifest(manifest):
+    """
+    Манифест — JSON (список путей или {"inputs": [...]}) либо текстовый файл
+    с одним путём на строку (# — комментарий). Относительные пути считаются
+    от папки манифеста.
+    """
+    manifest = Path(manifest)
+    raw = manifest.read_text(encoding="utf-8")
+    if manifest.suffix.lower() == ".json":
+        data = json.loads(raw)
+        entries = data.get("inputs", []) if isinstance(data, dict) else data
+    else:
+        entries = [
+            line.strip()
+            for line in raw.splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        ]
+    paths = []
+    for entry in entries:
+        p = Path(entry)
+        paths.append(p if p.is_absolute() else manifest.parent / p)
+    return paths
+
+
+def _output_name(path, used):
+    name = f"{path.stem}.json"
+    n = 1
+    while name in used:
+        n += 1
+        name = f"{path.stem}_{n}.json"
+    used.add(name)
+    return name
+
+
+def run_batch(inputs, out_dir, batch_size=8, n_process=1):
+    """
+    Записи index.json идут в порядке входных файлов, независимо от того,
+    размечался ли текст через общий nlp.pipe или по фрагментам. Ошибка
+    одного файла записывается в его запись и не прерывает пакет.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    inputs = [Path(p) for p in inputs]
+    items = [None] * len(inputs)
+    used_names = set()
+    # имена выходных файлов — по порядку входа, а не завершения
+    out_paths = [out_dir / _output_name(path, used_names) for path in inputs]
+
+    def fail(i, error):
+        items[i] = {"input": str(inputs[i]), "status": "error", "error": error}
+
+    def write_result(i, text, read_s, doc=None):
+        path = inputs[i]
+        t0 = time.perf_counter()
+        try:
+            # параллельность пакета — n_process у nlp.pipe; фрагменты — в этом процессе
+            data = extract_all_parameters(text, analyze_document(text, doc=doc, n_process=1))
+            with out_paths[i].open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+        except Exception as e:
+            logging.exception("Не удалось обработать %s", path)
+            fail(i, f"{type(e).__name__}: {e}")
+            return
+        items[i] = {
+            "input": str(path),
+            "output": str(out_paths[i]),
+            "status": "ok",
+            "chars": len(text),
+            "read_s": round(read_s, 4),
+            "extract_s": round(time.perf_counter() - t0, 4),
+        }
+        logging.info("%s -> %s", path, out_paths[i])
+
+    def texts():
+        for i, path in enumerate(inputs):
+            if not path.exists() or path.suffix.lower() not in SUPPORTED_SUFFIXES:
+                fail(i, "not found or unsupported")
+                continue
+            t0 = time.perf_counter()
+            try:
+                text = read_input_file(str(path))
+            except Exception as e:
+                logging.exception("Не удалось прочитать %s", path)
+                fail(i, str(e))
+                continue
+            read_s = time.perf_counter() - t0
+            if len(text) > run.NER_CHUNK_CHARS:
+                # длинные тексты размечаются по фрагментам, мимо общего nlp.pipe
+                write_result(i, text, read_s)
+                continue
+            yield text, {"index": i, "read_s": read_s}
+
+    try:
+        for doc, meta in get_nlp().pipe(
+            texts(), as_tuples=True, batch_size=batch_size, n_process=n_process
+        ):
+            write_result(meta["index"], doc.text, meta["read_s"], doc=doc)
+    except Exception as e:
+        # сбой самого nlp.pipe: необработанные файлы помечаются ошибкой
+        logging.exception("Пакетная разметка прервана")
+        for i, item in enumerate(items):
+            if item is None:
+                fail(i, f"{type(e).__name__}: {e}")
+
+    summary = {
+        "total": len(items),
+        "ok": sum(1 for it in items if it["status"] == "ok"),
+        "failed": sum(1 for it in items if it["status"] != "ok"),
+        "batch_size": batch_size,
+        "n_process": n_process,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "items": items,
+    }
+    with (out_dir / "index.json").open("w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=4)
+    return summary
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+CLI wrapper for nlp_core/batch.py
+
+Usage examples:
+  python batch_cli.py --dir nlp_core/input --out-dir nlp_core/OUT/batch
+  python batch_cli.py --manifest archive.txt --out-dir nlp_core/OUT/batch --batch-size 16 --n-process 4
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+sys.path.insert(0, str(HERE.parents[1]))
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="NLP Core batch CLI")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--dir", help="Folder with TZ files (docx/pdf/txt)")
+    src.add_argument(
+        "--manifest",
+        help="Manifest: JSON list of paths or text file with one path per line",
+    )
+    p.add_argument(
+        "--recursive", action="store_true", help="Search --dir recursively"
+    )
+    p.add_argument(
+        "--out-dir",
+        help="Output folder (one JSON per input + index.json)",
+        default="nlp_core/OUT/batch",
+    )
+    p.add_argument("--batch-size", type=int, default=8, help="nlp.pipe batch_size")
+    p.add_argument("--n-process", type=int, default=1, help="nlp.pipe n_process")
+    p.add_argument(
+        "--spacy-components",
+        help="Comma-separated pipeline components to keep enabled (default: NLP_SPACY_COMPONENTS or ner)",
+        default=None,
+    )
+    p.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
+    return p.parse_args()
+
+
+def setup_logging(verbose: bool):
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(format="%(asctime)s %(levelname)s: %(message)s", level=level)
+
+
+def main():
+    args = parse_args()
+    setup_logging(args.verbose)
+
+    from nlp_core import batch, run
+
+    if args.spacy_components:
+        run.configure_nlp(
+            components=[c.strip() for c in args.spacy_components.split(",") if c.strip()]
+        )
+
+    if args.dir:
+        if not Path(args.dir).is_dir():
+            logging.error("Папка не найдена: %s", args.dir)
+            sys.exit(1)
+        inputs = batch.collect_from_dir(args.dir, recursive=args.recursive)
+    else:
+        if not Path(args.manifest).exists():
+            logging.error("Манифест не найден: %s", args.manifest)
+            sys.exit(1)
+        inputs = batch.collect_from_manifest(args.manifest)
+
+    if not inputs:
+        logging.error("Не найдено ни одного входного файла.")
+        sys.exit(1)
+
+    logging.info("Файлов к обработке: %d", len(inputs))
+    try:
+        summary = batch.run_batch(
+            inputs,
+            args.out_dir,
+            batch_size=args.batch_size,
+            n_process=args.n_process,
+        )
+    except RuntimeError as e:
+        logging.error("%s", e)
+        sys.exit(1)
+    logging.info(
+        "Готово: %d ok, %d с ошибками за %.1f с. Сводка: %s",
+        summary["ok"],
+        summary["failed"],
+        summary["elapsed_s"],
+        Path(args.out_dir) / "index.json",
+    )
+    sys.exit(0 if summary["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Бенчмарк NLP Core: поэтапные тайминги извлечения на наборе документов.
+
+Для каждого документа отдельно замеряются этапы: чтение файла, NER spaCy
+(построение DocumentContext), проход шаблонов, каждая функция extract_*
+и запись JSON. Каждый документ прогоняется repeat раз, в отчёт идут
+медиана и минимум. Пиковая память считается отдельным прогоном под
+tracemalloc (чтобы не искажать тайминги) и по ru_maxrss процесса.
+
+Отчёт — JSON, пригодный для сравнения прогонов между собой.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import run
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+EXTRACTORS = (
+    ("extract_entities_with_spacy", run.extract_entities_with_spacy),
+    ("extract_projects", run.extract_projects),
+    ("extract_locations", run.extract_locations),
+    ("extract_heating_system", run.extract_heating_system),
+    ("extract_rooms", run.extract_rooms),
+    ("extract_room_temperatures", run.extract_room_temperatures),
+)
+STAGES = ("read", "ner", "patterns") + tuple(n for n, _ in EXTRACTORS) + ("write_json",)
+
+
+def _run_once(path, out_path):
+    """Один полный прогон документа; возвращает (timings, text)."""
+    timings = {}
+
+    t0 = time.perf_counter()
+    text = run.read_input_file(str(path))
+    timings["read"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ctx = run.analyze_document(text)
+    timings["ner"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ctx.matches
+    timings["patterns"] = time.perf_counter() - t0
+
+    for name, func in EXTRACTORS:
+        t0 = time.perf_counter()
+        func(text, ctx)
+        timings[name] = time.perf_counter() - t0
+
+    data = run.extract_all_parameters(text, ctx)
+    t0 = time.perf_counter()
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    timings["write_json"] = time.perf_counter() - t0
+    return timings, text
+
+
+def _peak_mb(path, out_path):
+    tracemalloc.start()
+    try:
+        _run_once(path, out_path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux — КБ, macOS — байты
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _package_version(name):
+    try:
+        from importlib import metadata
+
+        return metadata.version(name)
+    except Exception:
+        return None
+
+
+def bench_document(path, repeat=3, memory=True):
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = Path(tmp) / "result.json"
+        # прогревочный прогон: загрузка модели и импорт зависимостей не входят в замер
+        _, text = _run_once(path, out_path)
+        runs = [_run_once(path, out_path)[0] for _ in range(max(1, repeat))]
+        peak = _peak_mb(path, out_path) if memory else None
+
+    stages = {}
+    for stage in STAGES:
+        values = [r[stage] for r in runs]
+        stages[stage] = {
+            "median_s": round(statistics.median(values), 6),
+            "min_s": round(min(values), 6),
+        }
+    total = statistics.median(sum(r.values()) for r in runs)
+    return {
+        "file": str(path),
+        "format": Path(path).suffix.lstrip(".").lower(),
+        "bytes": os.path.getsize(path),
+        "chars": len(text),
+        "stages": stages,
+        "total_s": round(total, 6),
+        "chars_per_s": round(len(text) / total, 1) if total else None,
+        "peak_mb": peak,
+    }
+
+
+def run_benchmark(paths, repeat=3, memory=True, label=None, config=None):
+    documents = []
+    for path in paths:
+        documents.append(bench_document(path, repeat=repeat, memory=memory))
+
+    total_s = sum(d["total_s"] for d in documents)
+    total_chars = sum(d["chars"] for d in documents)
+    by_format = {}
+    for d in documents:
+        fmt = by_format.setdefault(d["format"], {"docs": 0, "chars": 0, "total_s": 0.0})
+        fmt["docs"] += 1
+        fmt["chars"] += d["chars"]
+        fmt["total_s"] += d["total_s"]
+    for fmt in by_format.values():
+        fmt["total_s"] = round(fmt["total_s"], 6)
+        fmt["chars_per_s"] = round(fmt["chars"] / fmt["total_s"], 1) if fmt["total_s"] else None
+        fmt["docs_per_s"] = round(fmt["docs"] / fmt["total_s"], 3) if fmt["total_s"] else None
+
+    return {
+        "meta": {
+            "label": label,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "spacy": _package_version("spacy"),
+            "spacy_model": run.SPACY_MODEL,
+            "spacy_model_version": _package_version(run.SPACY_MODEL),
+            "spacy_components": list(run.SPACY_COMPONENTS),
+            "repeat": repeat,
+        },
+        "config": config or {},
+        "summary": {
+            "docs": len(documents),
+            "chars": total_chars,
+            "total_s": round(total_s, 6),
+            "docs_per_s": round(len(documents) / total_s, 3) if total_s else None,
+            "chars_per_s": round(total_chars / total_s, 1) if total_s else None,
+            "stages_s": {
+                stage: round(sum(d["stages"][stage]["median_s"] for d in documents), 6)
+                for stage in STAGES
+            },
+            "peak_mb": max((d["peak_mb"] or 0 for d in documents), default=None),
+            "max_rss_mb": _max_rss_mb(),
+            "by_format": by_format,
+        },
+        "documents": documents,
+    }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+CLI wrapper for nlp_core/bench.py
+
+Usage examples:
+  python bench_cli.py --sizes 20000,200000 --rooms 50 --layout sections --out nlp_core/OUT/bench/bench.json
+  python bench_cli.py --inputs nlp_core/input --repeat 5 --label after-cache
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+sys.path.insert(0, str(HERE.parents[1]))
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="NLP Core benchmark")
+    p.add_argument(
+        "--inputs",
+        help="Benchmark existing documents (folder or file) instead of generated ones",
+        default=None,
+    )
+    p.add_argument(
+        "--formats", default="txt,docx,pdf", help="Generated formats (comma-separated)"
+    )
+    p.add_argument(
+        "--sizes",
+        default="20000,100000",
+        help="Generated document sizes in characters (comma-separated)",
+    )
+    p.add_argument("--rooms", type=int, default=20, help="Rooms per generated document")
+    p.add_argument(
+        "--layout",
+        default="sections",
+        choices=("flat", "sections", "labels"),
+        help="Section layout of generated documents",
+    )
+    p.add_argument("--docs", type=int, default=1, help="Documents per size")
+    p.add_argument("--seed", type=int, default=0, help="Generator seed")
+    p.add_argument(
+        "--work-dir",
+        default=None,
+        help="Folder for generated documents (default: temporary folder)",
+    )
+    p.add_argument("--repeat", type=int, default=3, help="Timed runs per document")
+    p.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run"
+    )
+    p.add_argument("--label", default=None, help="Free-form run label stored in the report")
+    p.add_argument(
+        "--out", default="nlp_core/OUT/bench/bench.json", help="Report JSON path"
+    )
+    p.add_argument(
+        "--spacy-components",
+        help="Comma-separated pipeline components to keep enabled (default: NLP_SPACY_COMPONENTS or ner)",
+        default=None,
+    )
+    p.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
+    return p.parse_args()
+
+
+def setup_logging(verbose: bool):
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(format="%(asctime)s %(levelname)s: %(message)s", level=level)
+
+
+def main():
+    args = parse_args()
+    setup_logging(args.verbose)
+
+    from nlp_core import bench, run, synth
+    from nlp_core.batch import collect_from_dir
+
+    if args.spacy_components:
+        run.configure_nlp(
+            components=[c.strip() for c in args.spacy_components.split(",") if c.strip()]
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.inputs:
+            source = Path(args.inputs)
+            paths = collect_from_dir(source, False) if source.is_dir() else [source]
+            config = {"inputs": str(source)}
+        else:
+            config = {
+                "formats": [f.strip() for f in args.formats.split(",") if f.strip()],
+                "sizes": [int(s) for s in args.sizes.split(",") if s.strip()],
+                "rooms": args.rooms,
+                "layout": args.layout,
+                "docs": args.docs,
+                "seed": args.seed,
+            }
+            paths = synth.generate_corpus(args.work_dir or tmp, **config)
+        if not paths:
+            logging.error("Нет документов для бенчмарка")
+            sys.exit(1)
+
+        logging.info("Документов: %d, прогонов на документ: %d", len(paths), args.repeat)
+        try:
+            report = bench.run_benchmark(
+                paths,
+                repeat=args.repeat,
+                memory=not args.no_memory,
+                label=args.label,
+                config=config,
+            )
+        except RuntimeError as e:
+            # например, модель spaCy не установлена
+            logging.error("%s", e)
+            sys.exit(1)
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    summary = report["summary"]
+    logging.info(
+        "Итого: %d док., %.2f с, %.1f симв/с, %.3f док/с, пик памяти %s МБ",
+        summary["docs"],
+        summary["total_s"],
+        summary["chars_per_s"] or 0,
+        summary["docs_per_s"] or 0,
+        summary["peak_mb"],
+    )
+    for stage, seconds in summary["stages_s"].items():
+        logging.info("  %-28s %.4f с", stage, seconds)
+    logging.info("Отчёт: %s", out_path)
+
+
+if __name__ == "__main__":
+    main()
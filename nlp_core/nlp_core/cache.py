@@ -0,0 +1,117 @@
+"""
+Кэш результатов извлечения, адресуемый по содержимому.
+
+Ключ — sha256 входного файла плюс отпечаток экстрактора: исходники модулей
+nlp_core, имя/версия модели spaCy, набор компонентов и настройки чтения PDF.
+Любая правка кода или смена модели даёт новый ключ, поэтому старые записи
+просто перестают находиться и со временем вытесняются.
+
+Записи — отдельные JSON-файлы; время изменения файла служит меткой
+последнего использования (LRU). При превышении лимита размера удаляются
+самые давно использованные записи.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from importlib import metadata
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("NLP_CACHE_DIR", Path.home() / ".cache" / "draftai" / "nlp")
+)
+DEFAULT_MAX_MB = int(os.environ.get("NLP_CACHE_MAX_MB", "256"))
+
+_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def extractor_fingerprint(model, components, extra=()):
+    """Отпечаток всего, что влияет на результат, кроме самого входного файла."""
+    h = hashlib.sha256()
+    for src in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        h.update(src.name.encode())
+        h.update(src.read_bytes())
+    for part in (
+        model,
+        _package_version(model),
+        _package_version("spacy"),
+        ",".join(components),
+        *extra,
+    ):
+        h.update(repr(part).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=None, max_mb=None):
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.max_bytes = (DEFAULT_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+
+    def key(self, input_path, fingerprint):
+        return hashlib.sha256(
+            f"{file_digest(input_path)}:{fingerprint}".encode()
+        ).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self.evict()
+        except OSError as e:
+            logging.warning("Не удалось записать кэш NLP в %s: %s", self.directory, e)
+
+    def evict(self):
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
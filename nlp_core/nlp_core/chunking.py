@@ -0,0 +1,80 @@
+"""
+Разбиение длинных текстов ТЗ на ограниченные фрагменты для NER.
+
+Текст режется по границам абзацев, затем строк, затем предложений
+(в крайнем случае — по пробелу или жёстко). У каждого фрагмента есть
+«ядро» — непересекающийся участок документа — и поля перекрытия слева
+и справа, чтобы сущность на стыке целиком попала хотя бы в один фрагмент.
+
+Фрагменты прогоняются через nlp.pipe (при необходимости в нескольких
+процессах), смещения сущностей переводятся в координаты документа.
+Сущность принадлежит фрагменту, в ядре которого она начинается; дубли
+и пересекающиеся на стыках сущности отбрасываются.
+"""
+
+import re
+from collections import namedtuple
+
+Entity = namedtuple("Entity", "start end label text")
+Chunk = namedtuple("Chunk", "start end core_start core_end")
+
+_SENTENCE_END = re.compile(r"[.!?…][»\"')\]]*\s+")
+
+
+def _cut_point(text, lo, hi):
+    """Лучшая граница разреза в text[lo:hi]: абзац > строка > предложение > пробел."""
+    for sep in ("\n\n", "\n"):
+        idx = text.rfind(sep, lo, hi)
+        if idx != -1:
+            return idx + len(sep)
+    last = None
+    for m in _SENTENCE_END.finditer(text, lo, hi):
+        last = m.end()
+    if last is not None:
+        return last
+    idx = text.rfind(" ", lo, hi)
+    return idx + 1 if idx != -1 else hi
+
+
+def split_into_chunks(text, max_chars, overlap=200):
+    """Фрагменты длиной не более max_chars (включая поля перекрытия)."""
+    n = len(text)
+    if n <= max_chars:
+        return [Chunk(0, n, 0, n)]
+    overlap = max(0, min(overlap, max_chars // 4))
+    core_len = max_chars - 2 * overlap
+    chunks = []
+    pos = 0
+    while pos < n:
+        hi = min(n, pos + core_len)
+        cut = hi if hi == n else _cut_point(text, pos + core_len // 2, hi)
+        chunks.append(Chunk(max(0, pos - overlap), min(n, cut + overlap), pos, cut))
+        pos = cut
+    return chunks
+
+
+def merge_entities(entities):
+    """Сортирует сущности и убирает дубли/пересечения (остаётся более ранняя и длинная)."""
+    merged = []
+    for ent in sorted(entities, key=lambda e: (e.start, -(e.end - e.start))):
+        if merged and ent.start < merged[-1].end:
+            continue
+        merged.append(ent)
+    return merged
+
+
+def extract_entities_chunked(text, nlp, max_chars, overlap=200, n_process=1):
+    chunks = split_into_chunks(text, max_chars, overlap)
+    n_process = max(1, min(n_process, len(chunks)))
+    found = []
+    docs = nlp.pipe(
+        (text[c.start : c.end] for c in chunks), batch_size=1, n_process=n_process
+    )
+    for chunk, doc in zip(chunks, docs):
+        for ent in doc.ents:
+            start = chunk.start + ent.start_char
+            if chunk.core_start <= start < chunk.core_end:
+                found.append(
+                    Entity(start, chunk.start + ent.end_char, ent.label_, ent.text)
+                )
+    return merge_entities(found)
@@ -0,0 +1,220 @@
+"""
+Индекс структуры текста ТЗ: смещения строк, дерево разделов по заголовкам
+и участки нумерованных/маркированных списков.
+
+Индекс строится один раз на документ и не зависит от конкретного
+экстрактора: по нему можно найти разделы по словам заголовка
+(«Отопление», «Помещения») и ограничить поиск их телом.
+
+Заголовком считается строка:
+  - с многоуровневым номером («2.1 Источник теплоснабжения»);
+  - с одноуровневым номером («3. Отопление»), если соседние строки не
+    продолжают его нумерацию (иначе это элемент нумерованного списка);
+  - написанная целиком заглавными буквами или вида «Раздел 2 ...»;
+  - короткая строка, оканчивающаяся двоеточием («Помещения:») —
+    такие подзаголовки вкладываются в текущий нумерованный раздел.
+"""
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+ListSpan = namedtuple("ListSpan", "start end items")
+
+_MAX_HEADING = 80
+# уровень подзаголовков «Текст:» — глубже любого нумерованного раздела
+LABEL_LEVEL = 9
+
+_NUMBERED = re.compile(r"^\s*(\d+(?:\.\d+)*)[.)]?\s+(\S.*?)\s*$")
+_LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[a-zа-яё]\)|[-–—•*·])\s+\S")
+_CHAPTER = re.compile(r"^\s*(?:раздел|глава|часть)\s+\d+", re.IGNORECASE)
+_LABEL = re.compile(r"^\s*([^\W\d_][^:]*?):\s*$")
+
+
+class Section:
+    """Раздел документа: [start, end) — от строки заголовка до следующего заголовка того же или более высокого уровня."""
+
+    def __init__(self, title, level, start, body_start, end=None, number=None, line=None):
+        self.title = title
+        self.level = level
+        self.number = number
+        self.start = start
+        self.body_start = body_start
+        self.end = end
+        self.line = line
+        self.parent = None
+        self.children = []
+
+    def walk(self):
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+    def path(self):
+        node, titles = self, []
+        while node is not None and node.parent is not None:
+            titles.append(node.title)
+            node = node.parent
+        return list(reversed(titles))
+
+    def __repr__(self):
+        return f"Section({self.title!r}, level={self.level}, {self.start}:{self.end})"
+
+
+class DocumentIndex:
+    def __init__(self, text):
+        self.text = text
+        self.line_starts = [0]
+        self.line_starts.extend(m.end() for m in re.finditer("\n", text))
+        self.root = Section("", 0, 0, 0, len(text))
+        self.sections = []
+        self.lists = []
+        self._build()
+
+    # --- строки ---
+
+    @property
+    def line_count(self):
+        return len(self.line_starts)
+
+    def line_of(self, offset):
+        """Номер строки (с нуля), в которой находится смещение."""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def line_span(self, i):
+        start = self.line_starts[i]
+        if i + 1 < len(self.line_starts):
+            return start, self.line_starts[i + 1] - 1
+        return start, len(self.text)
+
+    def line(self, i):
+        start, end = self.line_span(i)
+        return self.text[start:end]
+
+    # --- построение ---
+
+    def _heading(self, i, lines):
+        """(title, level, number) для строки-заголовка или None."""
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped or len(stripped) > _MAX_HEADING:
+            return None
+
+        m = _NUMBERED.match(line)
+        if m:
+            number, title = m.group(1), m.group(2)
+            # «1. Площадь здания: 3000 м2» — пункт с данными, а не заголовок
+            if ":" in title.rstrip(":") or title.endswith((";", ",")):
+                return None
+            if not title[0].isupper():
+                return None
+            depth = number.count(".") + 1
+            if depth == 1 and self._in_list(i, lines, int(number)):
+                return None
+            return title.rstrip(".:"), depth, number
+
+        if _LIST_ITEM.match(line):
+            return None
+        letters = [ch for ch in stripped if ch.isalpha()]
+        if _CHAPTER.match(line) or (
+            len(letters) >= 4 and all(ch.isupper() for ch in letters)
+        ):
+            return stripped.rstrip(".:"), 1, None
+        m = _LABEL.match(line)
+        if m and len(stripped) <= 60:
+            return m.group(1).strip(), LABEL_LEVEL, None
+        return None
+
+    @staticmethod
+    def _in_list(i, lines, number):
+        """Пункт продолжает нумерацию соседнего непустого пункта (n-1 перед ним или n+1 после)."""
+        for step, expected in ((-1, number - 1), (1, number + 1)):
+            j = i + step
+            while 0 <= j < len(lines) and not lines[j].strip():
+                j += step
+            if 0 <= j < len(lines):
+                m = _NUMBERED.match(lines[j])
+                if m and m.group(1) == str(expected):
+                    return True
+        return False
+
+    def _build(self):
+        lines = [self.line(i) for i in range(self.line_count)]
+        stack = [self.root]
+        list_start = list_end = None
+        items = 0
+
+        for i, line in enumerate(lines):
+            start, end = self.line_span(i)
+            heading = self._heading(i, lines)
+            if heading is not None:
+                title, level, number = heading
+                while stack[-1] is not self.root and stack[-1].level >= level:
+                    stack.pop().end = start
+                body_start = min(end + 1, len(self.text))
+                section = Section(title, level, start, body_start, number=number, line=i)
+                section.parent = stack[-1]
+                stack[-1].children.append(section)
+                self.sections.append(section)
+                stack.append(section)
+
+            if heading is None and _LIST_ITEM.match(line):
+                if list_start is None:
+                    list_start, items = start, 0
+                list_end = end
+                items += 1
+            elif line.strip() or heading is not None:
+                if list_start is not None:
+                    self.lists.append(ListSpan(list_start, list_end, items))
+                list_start = None
+
+        if list_start is not None:
+            self.lists.append(ListSpan(list_start, list_end, items))
+        while len(stack) > 1:
+            stack.pop().end = len(self.text)
+
+    # --- запросы ---
+
+    def find_sections(self, keywords):
+        """Разделы, в заголовке которых (без учёта регистра) встречается одно из слов."""
+        keywords = [k.lower() for k in keywords]
+        return [s for s in self.sections if any(k in s.title.lower() for k in keywords)]
+
+    def section_spans(self, keywords, body_only=True):
+        """
+        Отсортированные непересекающиеся участки [start, end) найденных разделов
+        (вместе с подразделами). body_only — без строки самого заголовка.
+        """
+        spans = sorted(
+            (s.body_start if body_only else s.start, s.end)
+            for s in self.find_sections(keywords)
+        )
+        merged = []
+        for start, end in spans:
+            if start >= end:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def section_text(self, section, body_only=True):
+        start = section.body_start if body_only else section.start
+        return self.text[start : section.end]
+
+    def section_at(self, offset):
+        """Самый глубокий раздел, содержащий смещение (root, если вне разделов)."""
+        node = self.root
+        while True:
+            for child in node.children:
+                if child.start <= offset < child.end:
+                    node = child
+                    break
+            else:
+                return node
+
+    def lists_in(self, start=0, end=None):
+        end = len(self.text) if end is None else end
+        return [ls for ls in self.lists if ls.start < end and ls.end > start]
+
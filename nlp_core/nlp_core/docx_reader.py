@@ -0,0 +1,97 @@
+"""
+Потоковое чтение DOCX без построения DOM python-docx.
+
+word/document.xml читается из архива инкрементально (iterparse); в порядке
+документа отдаются абзацы и строки таблиц (ячейки через табуляцию,
+абзацы внутри ячейки — через пробел). Обработанные элементы сразу
+очищаются и отцепляются от родителя, поэтому потребление памяти не
+зависит от размера документа.
+
+Текст абзаца собирается так же, как paragraph.text в python-docx:
+w:t — текст, w:tab — табуляция, w:br (перенос строки) и w:cr — перевод строки.
+"""
+
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_P = _W + "p"
+_R = _W + "r"
+_T = _W + "t"
+_TAB = _W + "tab"
+_BR = _W + "br"
+_CR = _W + "cr"
+_TBL = _W + "tbl"
+_TR = _W + "tr"
+_TC = _W + "tc"
+_BODY = _W + "body"
+_BR_TYPE = _W + "type"
+
+_RUN_CONTENT = {_T, _TAB, _BR, _CR}
+# элементы, которые после обработки можно удалить из дерева
+_BLOCK_TAGS = {_P, _TBL, _TR, _TC, _W + "sdt"}
+
+
+def iter_docx_blocks(file_path):
+    with zipfile.ZipFile(file_path) as zf, zf.open("word/document.xml") as xml:
+        stack = []
+        paragraphs = []  # буферы открытых абзацев (абзацы в надписях вложены)
+        rows = []  # ячейки открытых строк таблиц
+        cells = []  # абзацы открытых ячеек
+        skip = 0  # внутри mc:Fallback — дубль содержимого mc:Choice
+
+        for event, elem in iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                stack.append(elem)
+                if tag == _MC_FALLBACK:
+                    skip += 1
+                elif skip:
+                    pass
+                elif tag == _P:
+                    paragraphs.append([])
+                elif tag == _TR:
+                    rows.append([])
+                elif tag == _TC:
+                    cells.append([])
+                continue
+
+            stack.pop()
+            if tag == _MC_FALLBACK:
+                skip -= 1
+            elif skip:
+                pass
+            elif tag in _RUN_CONTENT:
+                # w:tab встречается и в описании позиций табуляции (w:pPr/w:tabs)
+                if paragraphs and stack and stack[-1].tag == _R:
+                    if tag == _T:
+                        paragraphs[-1].append(elem.text or "")
+                    elif tag == _TAB:
+                        paragraphs[-1].append("\t")
+                    elif tag == _CR or elem.get(_BR_TYPE) in (None, "textWrapping"):
+                        paragraphs[-1].append("\n")
+            elif tag == _P:
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+            elif tag == _TC:
+                rows[-1].append(" ".join(t for t in cells.pop() if t))
+            elif tag == _TR:
+                text = "\t".join(rows.pop())
+                if cells:
+                    # строка вложенной таблицы становится частью внешней ячейки
+                    cells[-1].append(text)
+                else:
+                    yield text
+
+            if stack and (tag in _BLOCK_TAGS or stack[-1].tag == _BODY):
+                elem.clear()
+                stack[-1].remove(elem)
+
+
+def read_docx_text(file_path):
+    return "\n".join(iter_docx_blocks(file_path))
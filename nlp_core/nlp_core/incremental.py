@@ -0,0 +1,193 @@
+"""
+Инкрементальное извлечение для новых редакций одного и того же ТЗ.
+
+Текст делится на абзацы (строки). Рядом с выходным JSON сохраняется
+состояние <out>.paragraphs.json: для каждого абзаца по хэшу его текста —
+сущности NER в координатах абзаца, а также итоговый результат. На новой
+редакции NER (самая дорогая часть) прогоняется только по абзацам, которых
+нет в состоянии; сущности остальных берутся из него, переводятся в
+координаты документа и собираются в DocumentContext, по которому работают
+обычные экстракторы run.py.
+
+Реестр шаблонов и поиск по разделам каждый раз выполняются по всему
+собранному тексту, как в extract_all_parameters: параметры, переходящие
+через границу строки («Мощность котла:\n120 кВт»), находятся так же.
+Через границу строки не находятся только сущности NER.
+
+Изменения параметров относительно прошлого результата пишутся в
+<out>.diff.json.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from . import run
+from .cache import extractor_fingerprint
+from .chunking import Entity, extract_entities_chunked
+
+# 2 — в состоянии только сущности NER, без совпадений шаблонов
+STATE_VERSION = 2
+
+
+def split_paragraphs(text):
+    """Абзацы как участки [start, end) без завершающего перевода строки."""
+    spans = []
+    pos = 0
+    while True:
+        end = text.find("\n", pos)
+        if end == -1:
+            spans.append((pos, len(text)))
+            return spans
+        spans.append((pos, end))
+        pos = end + 1
+
+
+def paragraph_hash(paragraph):
+    return hashlib.sha1(paragraph.encode("utf-8")).hexdigest()
+
+
+def _analyze_paragraphs(paragraphs):
+    """NER для абзацев {hash: text} -> {hash: {"entities"}}."""
+    results = {h: {"entities": []} for h in paragraphs}
+    if not paragraphs:
+        return results
+    nlp = run.get_nlp()
+    short = [
+        (p, h)
+        for h, p in paragraphs.items()
+        if p.strip() and len(p) <= run.NER_CHUNK_CHARS
+    ]
+    for h, paragraph in paragraphs.items():
+        if len(paragraph) > run.NER_CHUNK_CHARS:
+            spans = extract_entities_chunked(
+                paragraph, nlp, run.NER_CHUNK_CHARS, n_process=run.NER_PROCESSES
+            )
+            results[h]["entities"] = [list(e) for e in spans]
+    for doc, h in nlp.pipe(short, as_tuples=True, batch_size=64):
+        results[h]["entities"] = [
+            [ent.start_char, ent.end_char, ent.label_, ent.text] for ent in doc.ents
+        ]
+    return results
+
+
+class IncrementalContext(run.DocumentContext):
+    """
+    DocumentContext с сущностями из сохранённых результатов абзацев, без
+    повторного NER. Шаблоны ищутся по всему тексту, как у DocumentContext.
+    """
+
+    def __init__(self, text, paragraphs):
+        # paragraphs: [(start, end, stored)] в порядке документа
+        spans = [
+            Entity(start + s, start + e, label, ent_text)
+            for start, _, stored in paragraphs
+            for s, e, label, ent_text in stored["entities"]
+        ]
+        super().__init__(text, spans=spans)
+
+
+def _flatten(data, prefix=""):
+    flat = {}
+    for key, value in (data or {}).items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def diff_results(old, new):
+    """Изменившиеся параметры: {"heating_system.boiler_power": {"old": ..., "new": ...}}."""
+    old_flat, new_flat = _flatten(old), _flatten(new)
+    diff = {}
+    for key in list(new_flat) + [k for k in old_flat if k not in new_flat]:
+        if old_flat.get(key) != new_flat.get(key):
+            diff[key] = {"old": old_flat.get(key), "new": new_flat.get(key)}
+    return diff
+
+
+def state_path_for(output_file):
+    out = Path(output_file)
+    return out.with_name(out.stem + ".paragraphs.json")
+
+
+def diff_path_for(output_file):
+    out = Path(output_file)
+    return out.with_name(out.stem + ".diff.json")
+
+
+def _load_json(path):
+    try:
+        with Path(path).open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def extract_incremental(input_file, output_file):
+    """
+    Извлекает параметры, переиспользуя результаты неизменённых абзацев.
+    Возвращает (data, diff, stats) и записывает результат, состояние и diff рядом с output_file.
+    """
+    text = run.read_input_file(input_file)
+    fingerprint = extractor_fingerprint(
+        run.SPACY_MODEL,
+        run.SPACY_COMPONENTS,
+        (run.PDF_PAGES, run.PDF_REQUIRED_SECTIONS, run.NER_CHUNK_CHARS, STATE_VERSION),
+    )
+    state = _load_json(state_path_for(output_file)) or {}
+    known = state.get("paragraphs", {}) if state.get("fingerprint") == fingerprint else {}
+    previous = state.get("result")
+    if previous is None:
+        previous = _load_json(output_file)
+
+    spans = split_paragraphs(text)
+    hashes = [paragraph_hash(text[start:end]) for start, end in spans]
+    todo = {}
+    for (start, end), h in zip(spans, hashes):
+        if h not in known and h not in todo:
+            todo[h] = text[start:end]
+    fresh = _analyze_paragraphs(todo)
+
+    stored = {h: known.get(h) or fresh[h] for h in hashes}
+    ctx = IncrementalContext(
+        text, [(start, end, stored[h]) for (start, end), h in zip(spans, hashes)]
+    )
+    data = run.extract_all_parameters(text, ctx)
+    diff = diff_results(previous, data) if previous is not None else {}
+
+    output_path = Path(output_file)
+    with output_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    with state_path_for(output_file).open("w", encoding="utf-8") as f:
+        json.dump(
+            {"fingerprint": fingerprint, "paragraphs": stored, "result": data},
+            f,
+            ensure_ascii=False,
+        )
+    with diff_path_for(output_file).open("w", encoding="utf-8") as f:
+        json.dump(diff, f, ensure_ascii=False, indent=4)
+
+    extracted = sum(1 for h in hashes if h in todo)
+    stats = {
+        "paragraphs": len(spans),
+        "reused": len(spans) - extracted,
+        "extracted": extracted,
+    }
+    return data, diff, stats
+
+
+def main(input_file, output_file):
+    data, diff, stats = extract_incremental(input_file, output_file)
+    print(
+        f"Абзацев: {stats['paragraphs']}, переиспользовано: {stats['reused']}, "
+        f"проанализировано заново: {stats['extracted']}"
+    )
+    print(f"Данные успешно сохранены в {output_file}")
+    if diff:
+        print("Изменившиеся параметры:")
+        print(json.dumps(diff, ensure_ascii=False, indent=4))
+    else:
+        print("Параметры не изменились")
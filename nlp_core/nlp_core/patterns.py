@@ -0,0 +1,342 @@
+"""
+Декларативный реестр регулярных выражений NLP Core и движок, который
+компилирует его один раз при импорте модуля.
+
+Каждая запись реестра описывает параметр: список шаблонов (в порядке
+приоритета), флаги и режим:
+  - "first" — нужен один результат: побеждает самый приоритетный шаблон,
+    у которого есть совпадение, и его первое вхождение в тексте
+    (как в прежнем extract_parameter);
+  - "all"   — нужны все непересекающиеся вхождения каждого шаблона
+    (как re.findall), сначала все совпадения первого шаблона, затем второго и т.д.
+
+У большинства шаблонов есть литеральный префикс («мощность котла», «этап»...).
+Из таких префиксов строится один сканер-автомат (префиксное дерево ключевых
+слов), который за один проход по тексту находит позиции возможных совпадений;
+сами шаблоны проверяются только там через compiled.match(text, pos).
+Шаблоны без литерального префикса (номера списков, индексы, координаты)
+ищутся отдельными проходами.
+"""
+
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+IM = re.IGNORECASE | re.MULTILINE
+
+_NUM = r"\d+[.,]?\d*"
+_AREA_UNITS = r"\s*(?:м2|м²|кв\.м)"
+_SCHEDULE = rf"({_NUM}(?:/{_NUM})?)\s*°?C?"
+
+PATTERNS = {
+    "project_name": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [r"название проекта[:\-]\s*(.+)", r"проект[:\-]\s*(.+)"],
+    },
+    "object_name": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [r"объект[:\-]\s*(.+)"],
+    },
+    "building_area": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [
+            rf"площадь здания[:\-]?\s*({_NUM}){_AREA_UNITS}",
+            rf"общая площадь[:\-]?\s*({_NUM}){_AREA_UNITS}",
+        ],
+    },
+    "floor_area": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [rf"площадь этажа[:\-]?\s*({_NUM}){_AREA_UNITS}"],
+    },
+    "levels": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [
+            r"этажность[:\-]?\s*(\d+)",
+            r"этажей[:\-]?\s*(\d+)",
+            r"количество этажей[:\-]?\s*(\d+)",
+        ],
+    },
+    "boiler_power": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [
+            rf"мощность котла[:\-]?\s*({_NUM})\s*кВт",
+            rf"мощность отопительного котла[:\-]?\s*({_NUM})\s*кВт",
+        ],
+    },
+    "temperature": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [
+            rf"температура[:\-]?\s*{_SCHEDULE}",
+            rf"температура теплоносителя[:\-]?\s*{_SCHEDULE}",
+            rf"температура воды[:\-]?\s*{_SCHEDULE}",
+            rf"температура отопительного контура[:\-]?\s*{_SCHEDULE}",
+        ],
+    },
+    "radiator_type": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [r"тип радиаторов[:\-]?\s*(.+)", r"вид радиаторов[:\-]?\s*(.+)"],
+    },
+    "heat_source": {
+        "mode": "first",
+        "flags": IM,
+        "patterns": [
+            r"источник теплоснабжения[:\-]?\s*(.+)",
+            r"теплоснабжение[:\-]?\s*(.+)",
+            r"система теплоснабжения[:\-]?\s*(.+)",
+        ],
+    },
+    "rooms": {
+        "mode": "all",
+        "flags": IM,
+        "patterns": [
+            r"^(?:помещение|комната|зал|офис|наименование помещений)[:\-]?\s*(.+)$",
+            r"^\d+\.\s*(.+)$",
+            r"^\-\s*(.+)$",
+        ],
+    },
+    "projects": {
+        "mode": "all",
+        "flags": re.IGNORECASE,
+        "patterns": [
+            r"этап[:\-]\s*(.+)|стройка[:\-]\s*(.+)|наименование объекта[:\-]\s*(.+)"
+        ],
+    },
+    "zip_codes": {
+        "mode": "all",
+        "flags": 0,
+        "patterns": [r"\b\d{6}\b"],
+    },
+    "coordinates": {
+        "mode": "all",
+        "flags": 0,
+        "patterns": [r"(-?\d{1,3}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)"],
+    },
+    "room_temperatures.Офис": {
+        "mode": "first",
+        "flags": re.IGNORECASE,
+        "patterns": [rf"в\s+офисах?\s+({_NUM})\s*°?C"],
+    },
+    "room_temperatures.Коридор": {
+        "mode": "first",
+        "flags": re.IGNORECASE,
+        "patterns": [rf"в\s+коридорах?\s+({_NUM})\s*°?C"],
+    },
+    "room_temperatures.Веранда": {
+        "mode": "first",
+        "flags": re.IGNORECASE,
+        "patterns": [rf"на\s+веранде\s+({_NUM})\s*°?C"],
+    },
+}
+
+
+_MIN_KEYWORD = 3
+
+
+def _literal_prefixes(items):
+    """
+    Литеральные префиксы, с которых обязано начинаться любое совпадение
+    разобранного шаблона; None, если такого набора нет.
+    """
+    prefixes = [""]
+    for op, av in items:
+        if op is sre_parse.AT:
+            continue
+        if op is sre_parse.LITERAL:
+            prefixes = [p + chr(av) for p in prefixes]
+            continue
+        if op is sre_parse.IN and len(av) == 1 and av[0][0] is sre_parse.LITERAL:
+            prefixes = [p + chr(av[0][1]) for p in prefixes]
+            continue
+        if op is sre_parse.SUBPATTERN:
+            branches = [av[-1]]
+        elif op is sre_parse.BRANCH:
+            branches = av[1]
+        else:
+            break
+        tails = []
+        for branch in branches:
+            sub = _literal_prefixes(branch)
+            if sub is None:
+                return None
+            tails.extend(sub)
+        prefixes = [p + t for p in prefixes for t in tails]
+        break
+    if any(len(p) < _MIN_KEYWORD for p in prefixes):
+        return None
+    return [p.lower() for p in prefixes]
+
+
+class PatternMatches:
+    """Совпадения одного прохода PatternEngine.scan, сгруппированные по параметрам."""
+
+    def __init__(self, engine, fallback=None):
+        self._engine = engine
+        self._hits = {name: {} for name in engine.names}
+        # функция, возвращающая PatternMatches для параметров без совпадений
+        self._fallback = fallback
+
+    def _by_priority(self, name):
+        by_priority = self._hits.get(name)
+        if not by_priority and self._fallback is not None:
+            return self._fallback()._by_priority(name)
+        return by_priority or {}
+
+    def _add(self, name, priority, match):
+        self._hits[name].setdefault(priority, []).append(match)
+
+    def _merge(self, other):
+        """Дописывает совпадения other (участка, идущего в документе дальше)."""
+        for name, by_priority in other._hits.items():
+            for priority, found in by_priority.items():
+                self._hits[name].setdefault(priority, []).extend(found)
+
+    def items(self):
+        """Собственные совпадения без запасного поиска: (name, priority, match)."""
+        for name, by_priority in self._hits.items():
+            for priority, found in by_priority.items():
+                for m in found:
+                    yield name, priority, m
+
+    def match(self, name):
+        """Первое совпадение самого приоритетного шаблона параметра или None."""
+        by_priority = self._by_priority(name)
+        if not by_priority:
+            return None
+        return by_priority[min(by_priority)][0]
+
+    def first(self, name, default="Нет данных"):
+        m = self.match(name)
+        return m.group(1).strip() if m else default
+
+    def all(self, name):
+        """Все совпадения параметра: по приоритету шаблона, затем по позиции."""
+        by_priority = self._by_priority(name)
+        return [m for p in sorted(by_priority) for m in by_priority[p]]
+
+    def names(self, prefix=""):
+        return [n for n in self._engine.names if n.startswith(prefix)]
+
+
+class PatternEngine:
+    """Компилирует реестр шаблонов и извлекает все параметры за один проход сканера."""
+
+    def __init__(self, registry):
+        self.names = list(registry)
+        self._entries = []
+        self._residual = []
+        by_keyword = {}
+        for name, spec in registry.items():
+            mode = spec.get("mode", "first")
+            flags = spec.get("flags", 0)
+            for priority, pattern in enumerate(spec["patterns"]):
+                idx = len(self._entries)
+                self._entries.append((name, priority, mode, re.compile(pattern, flags)))
+                keywords = _literal_prefixes(sre_parse.parse(pattern, flags).data)
+                if keywords is None:
+                    self._residual.append(idx)
+                    continue
+                for kw in keywords:
+                    by_keyword.setdefault(kw, []).append(idx)
+
+        self._keywords = list(by_keyword)
+        self._keyword_entries = [by_keyword[kw] for kw in self._keywords]
+        self._by_first_char = {}
+        for i, kw in enumerate(self._keywords):
+            self._by_first_char.setdefault(kw[0], []).append(i)
+        # ветки сгруппированы по первому символу и потребляют только его,
+        # поэтому ключевые слова, начинающиеся внутри другого, не теряются;
+        # групп захвата в сканере нет — они заметно замедляют sre
+        self._scanner = re.compile(
+            "|".join(
+                re.escape(ch)
+                + "(?="
+                + "|".join(re.escape(self._keywords[i][1:]) for i in idxs)
+                + ")"
+                for ch, idxs in self._by_first_char.items()
+            )
+            or "(?!)"
+        )
+
+    def scan(self, text, pos=0, endpos=None, folded=None):
+        endpos = len(text) if endpos is None else endpos
+        result = PatternMatches(self)
+        entries = self._entries
+        # для "first": лучший найденный приоритет параметра; шаблоны
+        # с приоритетом не выше него больше не проверяются
+        resolved = {}
+        # для "all": позиция, с которой шаблон может совпасть снова (как в findall)
+        next_pos = [pos] * len(entries)
+
+        def try_entry(idx, start):
+            name, priority, mode, regex = entries[idx]
+            if mode == "first":
+                if name in resolved and resolved[name] <= priority:
+                    return
+            elif start < next_pos[idx]:
+                return
+            m = regex.match(text, start, endpos)
+            if m is None:
+                return
+            result._add(name, priority, m)
+            if mode == "first":
+                resolved[name] = priority
+            else:
+                next_pos[idx] = m.end() if m.end() > start else start + 1
+
+        folded = folded if folded is not None else fold_case(text)
+        keywords = self._keywords
+        for hit in self._scanner.finditer(folded, pos, endpos):
+            start = hit.start()
+            # в одной позиции может начинаться несколько ключевых слов
+            for k in self._by_first_char[folded[start]]:
+                if folded.startswith(keywords[k], start):
+                    for idx in self._keyword_entries[k]:
+                        try_entry(idx, start)
+
+        for idx in self._residual:
+            name, priority, mode, regex = entries[idx]
+            if mode == "first":
+                m = regex.search(text, pos, endpos)
+                if m:
+                    result._add(name, priority, m)
+            else:
+                for m in regex.finditer(text, pos, endpos):
+                    result._add(name, priority, m)
+        return result
+
+    def scan_spans(self, text, spans, fallback=None):
+        """
+        Поиск только в участках spans ([(start, end), ...] по порядку документа).
+        Параметры, не найденные в участках, берутся из fallback(), если он задан.
+        """
+        result = PatternMatches(self, fallback)
+        folded = fold_case(text)
+        for start, end in spans:
+            result._merge(self.scan(text, start, end, folded=folded))
+        return result
+
+
+def fold_case(text):
+    """text.lower() с сохранением длины (смещения совпадают с исходным текстом)."""
+    folded = text.lower()
+    if len(folded) != len(text):
+        folded = "".join(ch.lower()[0] for ch in text)
+    return folded
+
+
+ENGINE = PatternEngine(PATTERNS)
+
+
+def scan_patterns(text):
+    return ENGINE.scan(text)
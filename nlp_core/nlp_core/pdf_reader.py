@@ -0,0 +1,119 @@
+"""
+Потоковое извлечение текста из PDF постранично.
+
+Вместо одного блокирующего pdfminer.extract_text по всему файлу страницы
+обходятся лениво и отдаются по одной, в порядке следования. Разбор
+разметки (самая дорогая часть) можно распределить по пулу процессов:
+каждый процесс обрабатывает свой непрерывный блок страниц.
+
+Режим ранней остановки: если переданы required_sections, чтение
+прекращается, как только в прочитанных страницах все эти разделы найдены
+по заголовкам (DocumentIndex, а не по упоминанию в тексте) и закрыты —
+после каждого встретился следующий заголовок того же или более высокого
+уровня. Тело раздела, продолжающееся на следующих страницах, дочитывается.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+from .document_index import DocumentIndex
+
+
+def count_pages(file_path):
+    with open(file_path, "rb") as fp:
+        document = PDFDocument(PDFParser(fp))
+        return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def _iter_page_texts(file_path, page_numbers=None):
+    """Текст страниц по одной (с завершающим \\f, как у extract_text)."""
+    with open(file_path, "rb") as fp, StringIO() as output:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, output, laparams=LAParams())
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp, page_numbers, caching=True):
+            interpreter.process_page(page)
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+
+
+def _extract_page_block(file_path, page_numbers):
+    return list(_iter_page_texts(file_path, set(page_numbers)))
+
+
+def _iter_parallel(file_path, pages, workers, block_size):
+    blocks = [pages[i : i + block_size] for i in range(0, len(pages), block_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        queued = 0
+        try:
+            # держим в работе ограниченное окно блоков, чтобы при ранней
+            # остановке не разбирать весь документ
+            while queued < len(blocks) or pending:
+                while queued < len(blocks) and len(pending) < workers * 2:
+                    pending.append(
+                        pool.submit(_extract_page_block, file_path, blocks[queued])
+                    )
+                    queued += 1
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def sections_closed(text, required_sections):
+    """
+    Для каждой группы слов required_sections есть раздел с таким словом в
+    заголовке, и все такие разделы закрыты следующим заголовком до конца text.
+    """
+    index = DocumentIndex(text)
+    for keywords in required_sections:
+        found = index.find_sections(keywords)
+        if not found or any(section.end >= len(text) for section in found):
+            return False
+    return True
+
+
+def iter_pdf_pages(
+    file_path, workers=1, pages=None, required_sections=None, block_size=4
+):
+    """
+    Отдаёт текст PDF постранично в порядке страниц.
+
+    pages — необязательный набор номеров страниц (с нуля);
+    workers > 1 — разбор страниц в пуле процессов блоками по block_size;
+    required_sections — группы слов заголовка (как SECTION_SCOPES), по
+    группе на раздел; как только все разделы найдены и закрыты
+    (sections_closed), чтение прекращается.
+    """
+    if workers and workers > 1:
+        page_list = sorted(pages) if pages is not None else list(range(count_pages(file_path)))
+        texts = _iter_parallel(file_path, page_list, workers, block_size)
+    else:
+        texts = _iter_page_texts(file_path, pages)
+
+    groups = [[k.lower() for k in keywords] for keywords in required_sections or ()]
+    read = []
+    # индекс строится, только когда все слова уже встретились хотя бы в тексте
+    unseen = list(groups)
+    try:
+        for text in texts:
+            yield text
+            if not groups:
+                continue
+            read.append(text)
+            lowered = text.lower()
+            unseen = [g for g in unseen if not any(k in lowered for k in g)]
+            if not unseen and sections_closed("".join(read), groups):
+                return
+    finally:
+        texts.close()
@@ -1,49 +1,146 @@
 import json
+import os
 import re
 import sys
 from pathlib import Path
-import spacy
-from pdfminer.high_level import extract_text as extract_pdf_text
-import docx
-
-try:
-    nlp = spacy.load("ru_core_news_sm")
-except OSError:
-    print(
-        "Модель spaCy 'ru_core_news_sm' не найдена. Установите командой: python -m spacy download ru_core_news_sm"
-    )
-    sys.exit(1)
+
+from .cache import ResultCache, extractor_fingerprint
+from .chunking import Entity, extract_entities_chunked
+from .document_index import DocumentIndex
+from .docx_reader import iter_docx_blocks, read_docx_text
+from .patterns import ENGINE, scan_patterns
+from .pdf_reader import iter_pdf_pages
+
+SPACY_MODEL = os.environ.get("NLP_SPACY_MODEL", "ru_core_news_sm")
+# Компоненты пайплайна, которые остаются включёнными (экстракторам нужен только doc.ents).
+# Переопределяется через NLP_SPACY_COMPONENTS="tok2vec,ner" или configure_nlp().
+SPACY_COMPONENTS = tuple(
+    c.strip()
+    for c in os.environ.get("NLP_SPACY_COMPONENTS", "ner").split(",")
+    if c.strip()
+)
+# Стандартные компоненты spaCy: всё, что не в SPACY_COMPONENTS, не загружается вовсе
+_KNOWN_COMPONENTS = (
+    "tok2vec",
+    "transformer",
+    "tagger",
+    "morphologizer",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+)
+
+_nlp = None
+
+# Тексты длиннее этого размера размечаются NER по фрагментам (граница абзаца/предложения)
+NER_CHUNK_CHARS = int(os.environ.get("NLP_CHUNK_CHARS", "100000"))
+# Процессов для NER по фрагментам длинного текста (1 — в текущем процессе).
+# Сервис и пакетный режим сами параллельны и всегда передают n_process=1.
+NER_PROCESSES = int(os.environ.get("NLP_NER_PROCESSES", "1"))
+
+# Число процессов для разбора страниц PDF (1 — последовательно, без пула)
+PDF_WORKERS = int(os.environ.get("NLP_PDF_WORKERS", "1"))
+# Необязательный набор страниц PDF (с нуля); None — весь документ
+PDF_PAGES = None
+# Разделы (ключи SECTION_SCOPES): чтение PDF прекращается, когда их заголовки
+# найдены и после каждого встретился следующий заголовок — последующие
+# страницы не разбираются; None — весь документ
+PDF_REQUIRED_SECTIONS = None
+
+# Разделы ТЗ, которыми ограничивается поиск параметров (фрагменты заголовков).
+# Если таких разделов нет или параметр в них не найден — ищем по всему тексту.
+SECTION_SCOPES = {
+    "heating": ("отоплен", "теплоснабж", "теплоносител"),
+    "rooms": ("помещени", "экспликаци"),
+    "room_temperatures": ("температур", "микроклимат", "отоплен", "помещени"),
+}
+
+
+def configure_nlp(model=None, components=None):
+    """Меняет модель/набор компонентов; модель будет перезагружена при следующем get_nlp()."""
+    global SPACY_MODEL, SPACY_COMPONENTS, _nlp
+    if model:
+        SPACY_MODEL = model
+    if components:
+        SPACY_COMPONENTS = tuple(components)
+    _nlp = None
+
+
+def get_nlp():
+    """Загружает модель spaCy при первом обращении, исключая неиспользуемые компоненты."""
+    global _nlp
+    if _nlp is None:
+        import spacy
+
+        exclude = [c for c in _KNOWN_COMPONENTS if c not in SPACY_COMPONENTS]
+        try:
+            model = spacy.load(SPACY_MODEL, exclude=exclude)
+        except OSError as e:
+            raise RuntimeError(
+                f"Модель spaCy '{SPACY_MODEL}' не найдена. Установите командой: python -m spacy download {SPACY_MODEL}"
+            ) from e
+        for name in model.pipe_names:
+            if name not in SPACY_COMPONENTS:
+                model.disable_pipe(name)
+        _nlp = model
+    return _nlp
 
 
 def read_text_file(file_path):
     return Path(file_path).read_text(encoding="utf-8")
 
 
-def read_pdf_file(file_path):
-    return extract_pdf_text(file_path)
+
+
+def _iter_pdf(file_path, workers=None, pages=None, required_sections=None):
+    if required_sections is None:
+        required_sections = PDF_REQUIRED_SECTIONS
+    return iter_pdf_pages(
+        file_path,
+        workers=PDF_WORKERS if workers is None else workers,
+        pages=PDF_PAGES if pages is None else pages,
+        # слова заголовков раздела — те же, что ограничивают поиск параметров
+        required_sections=[SECTION_SCOPES[scope] for scope in required_sections or ()],
+    )
+
+
+def read_pdf_file(file_path, workers=None, pages=None, required_sections=None):
+    """required_sections — ключи SECTION_SCOPES (по умолчанию PDF_REQUIRED_SECTIONS)."""
+    return "".join(_iter_pdf(file_path, workers, pages, required_sections))
 
 
 def read_docx_file(file_path):
-    doc = docx.Document(file_path)
-    return "\n".join([para.text for para in doc.paragraphs])
+    return read_docx_text(file_path)
 
 
-def read_input_file(file_path):
+def iter_input_file(file_path, required_sections=None):
+    """
+    Текст входного файла частями: PDF — постранично, DOCX — по абзацам/строкам таблиц, TXT — целиком.
+    required_sections — ключи SECTION_SCOPES для ранней остановки чтения PDF
+    (по умолчанию PDF_REQUIRED_SECTIONS).
+    """
     path = Path(file_path)
     if not path.exists():
         print(f"Файл {file_path} не найден!")
         sys.exit(1)
     if file_path.lower().endswith(".txt"):
-        return read_text_file(file_path)
+        yield read_text_file(file_path)
     elif file_path.lower().endswith(".pdf"):
-        return read_pdf_file(file_path)
+        yield from _iter_pdf(file_path, required_sections=required_sections)
     elif file_path.lower().endswith(".docx"):
-        return read_docx_file(file_path)
+        for i, block in enumerate(iter_docx_blocks(file_path)):
+            yield block if i == 0 else "\n" + block
     else:
         print("Поддерживаются только форматы: .txt, .pdf, .docx")
         sys.exit(1)
 
 
+def read_input_file(file_path, required_sections=None):
+    return "".join(iter_input_file(file_path, required_sections))
+
+
 def extract_parameter(patterns, text, default="Нет данных"):
     for pattern in patterns:
         match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
@@ -52,29 +149,124 @@ def extract_parameter(patterns, text, default="Нет данных"):
     return default
 
 
-def extract_entities_with_spacy(text):
-    doc = nlp(text)
+class DocumentContext:
+    """
+    Результат однократного анализа документа: текст, сущности spaCy и
+    производные списки по меткам. Создаётся один раз на документ и
+    передаётся всем экстракторам, чтобы модель не вызывалась повторно.
+
+    spans — сущности в координатах документа (Entity: start, end, label, text).
+    doc — разобранный spaCy Doc; для длинных текстов, которые размечаются
+    по фрагментам (длиннее NER_CHUNK_CHARS), он равен None.
+    n_process — процессов для NER по фрагментам (по умолчанию NER_PROCESSES).
+    """
+
+    def __init__(self, text, doc=None, spans=None, n_process=None):
+        self.text = text
+        self._matches = None
+        self._index = None
+        self._section_matches = {}
+        self.doc = doc
+        if spans is None:
+            if doc is None and len(text) > NER_CHUNK_CHARS:
+                spans = extract_entities_chunked(
+                    text,
+                    get_nlp(),
+                    NER_CHUNK_CHARS,
+                    n_process=NER_PROCESSES if n_process is None else n_process,
+                )
+            else:
+                if doc is None:
+                    self.doc = get_nlp()(text)
+                spans = [
+                    Entity(ent.start_char, ent.end_char, ent.label_, ent.text)
+                    for ent in self.doc.ents
+                ]
+        self.spans = spans
+        self.entities = {}
+        for ent in spans:
+            self.entities.setdefault(ent.label, []).append(ent.text)
+
+    @property
+    def matches(self):
+        """Совпадения реестра шаблонов; вычисляются один раз за документ."""
+        if self._matches is None:
+            self._matches = scan_patterns(self.text)
+        return self._matches
+
+    @property
+    def index(self):
+        """Индекс строк, разделов и списков документа (DocumentIndex)."""
+        if self._index is None:
+            self._index = DocumentIndex(self.text)
+        return self._index
+
+    def section_matches(self, scope):
+        """Совпадения только в разделах SECTION_SCOPES[scope] (с запасным поиском по всему тексту)."""
+        if scope not in self._section_matches:
+            self._section_matches[scope] = _scan_sections(
+                self.index, scope, self.scan_spans, lambda: self.matches
+            )
+        return self._section_matches[scope]
+
+    def scan_spans(self, spans, fallback=None):
+        return ENGINE.scan_spans(self.text, spans, fallback)
+
+    def ents(self, label):
+        return list(self.entities.get(label, []))
+
+
+def analyze_document(text, doc=None, spans=None, n_process=None):
+    return DocumentContext(text, doc=doc, spans=spans, n_process=n_process)
+
+
+def _scan_sections(index, scope, scan, fallback):
+    spans = index.section_spans(SECTION_SCOPES[scope])
+    if not spans:
+        return fallback()
+    return scan(spans, fallback)
+
+
+def _pattern_matches(text, ctx, scope=None):
+    if ctx is not None:
+        return ctx.section_matches(scope) if scope else ctx.matches
+    if scope:
+        full = []
+
+        def fallback():
+            if not full:
+                full.append(scan_patterns(text))
+            return full[0]
+
+        return _scan_sections(
+            DocumentIndex(text),
+            scope,
+            lambda spans, fb: ENGINE.scan_spans(text, spans, fb),
+            fallback,
+        )
+    return scan_patterns(text)
+
+
+def extract_entities_with_spacy(text, ctx=None):
+    ctx = ctx or analyze_document(text)
     entities = {"ORG": [], "PROJECT": [], "LOC": []}
-    for ent in doc.ents:
-        if ent.label_ in entities:
-            entities[ent.label_].append(ent.text)
+    for label in entities:
+        entities[label] = ctx.ents(label)
     return entities
 
 
-def extract_locations(text):
-    loc_entities = []
-    doc = nlp(text)
-    for ent in doc.ents:
-        if ent.label_ == "LOC":
-            loc_entities.append(ent.text)
+def extract_locations(text, ctx=None):
+    ctx = ctx or analyze_document(text)
+    loc_entities = ctx.ents("LOC")
 
-    zip_codes = re.findall(r"\b\d{6}\b", text)
-    for z in zip_codes:
+    matches = ctx.matches
+    for m in matches.all("zip_codes"):
+        z = m.group(0)
         if z not in loc_entities:
             loc_entities.append(z)
 
-    coords = re.findall(r"(-?\d{1,3}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)", text)
-    for lat, lon in coords:
+    for m in matches.all("coordinates"):
+        lat, lon = m.groups()
         coord_str = f"{lat},{lon}"
         if coord_str not in loc_entities:
             loc_entities.append(coord_str)
@@ -82,73 +274,35 @@ def extract_locations(text):
     return loc_entities if loc_entities else ["Нет данных"]
 
 
-def extract_heating_system(text):
-    boiler_power = extract_parameter(
-        [
-            r"мощность котла[:\-]?\s*(\d+[.,]?\d*)\s*кВт",
-            r"мощность отопительного котла[:\-]?\s*(\d+[.,]?\d*)\s*кВт",
-        ],
-        text,
-    )
-    temperature = extract_parameter(
-        [
-            r"температура[:\-]?\s*(\d+[.,]?\d*(?:/\d+[.,]?\d*)?)\s*°?C?",
-            r"температура теплоносителя[:\-]?\s*(\d+[.,]?\d*(?:/\d+[.,]?\d*)?)\s*°?C?",
-            r"температура воды[:\-]?\s*(\d+[.,]?\d*(?:/\d+[.,]?\d*)?)\s*°?C?",
-            r"температура отопительного контура[:\-]?\s*(\d+[.,]?\d*(?:/\d+[.,]?\d*)?)\s*°?C?",
-        ],
-        text,
-    )
-    radiator_type = extract_parameter(
-        [r"тип радиаторов[:\-]?\s*(.+)", r"вид радиаторов[:\-]?\s*(.+)"], text
-    )
-    heat_source = extract_parameter(
-        [
-            r"источник теплоснабжения[:\-]?\s*(.+)",
-            r"теплоснабжение[:\-]?\s*(.+)",
-            r"система теплоснабжения[:\-]?\s*(.+)",
-        ],
-        text,
-    )
-
+def extract_heating_system(text, ctx=None):
+    matches = _pattern_matches(text, ctx, "heating")
     heating_system = {
         "system_name": "отопление",
-        "boiler_power": boiler_power,
-        "radiator_type": radiator_type,
-        "temperature": temperature,
-        "heat_source": heat_source,
+        "boiler_power": matches.first("boiler_power"),
+        "radiator_type": matches.first("radiator_type"),
+        "temperature": matches.first("temperature"),
+        "heat_source": matches.first("heat_source"),
     }
     return heating_system
 
 
-def extract_rooms(text):
-    room_patterns = [
-        r"^(?:помещение|комната|зал|офис|наименование помещений)[:\-]?\s*(.+)$",
-        r"^\d+\.\s*(.+)$",
-        r"^\-\s*(.+)$",
-    ]
-    matches = []
-    for pat in room_patterns:
-        matches.extend(re.findall(pat, text, re.IGNORECASE | re.MULTILINE))
+def extract_rooms(text, ctx=None):
+    matches = _pattern_matches(text, ctx, "rooms")
     seen = set()
     unique_rooms = []
-    for room in matches:
-        room_clean = room.strip()
+    for m in matches.all("rooms"):
+        room_clean = m.group(1).strip()
         if room_clean and room_clean not in seen:
             seen.add(room_clean)
             unique_rooms.append(room_clean)
     return unique_rooms if unique_rooms else ["Нет данных"]
 
 
-def extract_projects(text):
-    project_matches = re.findall(
-        r"этап[:\-]\s*(.+)|стройка[:\-]\s*(.+)|наименование объекта[:\-]\s*(.+)",
-        text,
-        re.IGNORECASE,
-    )
+def extract_projects(text, ctx=None):
+    matches = _pattern_matches(text, ctx)
     projects = []
-    for tup in project_matches:
-        for val in tup:
+    for m in matches.all("projects"):
+        for val in m.groups():
             if val:
                 val_clean = val.strip()
                 if val_clean not in projects:
@@ -156,62 +310,90 @@ def extract_projects(text):
     return projects if projects else ["Нет данных"]
 
 
-def extract_room_temperatures(text):
+def extract_room_temperatures(text, ctx=None):
+    matches = _pattern_matches(text, ctx, "room_temperatures")
     results = {}
-    patterns = {
-        "Офис": r"в\s+офисах?\s+(\d+[.,]?\d*)\s*°?C",
-        "Коридор": r"в\s+коридорах?\s+(\d+[.,]?\d*)\s*°?C",
-        "Веранда": r"на\s+веранде\s+(\d+[.,]?\d*)\s*°?C",
-    }
-    for room, pattern in patterns.items():
-        match = re.search(pattern, text, re.IGNORECASE)
+    for name in matches.names("room_temperatures."):
+        match = matches.match(name)
         if match:
-            results[room] = match.group(1)
+            results[name.split(".", 1)[1]] = match.group(1)
     return results if results else {"Нет данных": "Нет данных"}
 
 
-def extract_all_parameters(text):
+def extract_all_parameters(text, ctx=None, n_process=None):
+    ctx = ctx or analyze_document(text, n_process=n_process)
     data = {}
-    data["project_name"] = extract_parameter(
-        [r"название проекта[:\-]\s*(.+)", r"проект[:\-]\s*(.+)"], text
-    )
-    data["object_name"] = extract_parameter([r"объект[:\-]\s*(.+)"], text)
-
-    data["building_area"] = extract_parameter(
-        [
-            r"площадь здания[:\-]?\s*(\d+[.,]?\d*)\s*(?:м2|м²|кв\.м)",
-            r"общая площадь[:\-]?\s*(\d+[.,]?\d*)\s*(?:м2|м²|кв\.м)",
-        ],
-        text,
-    )
-    data["floor_area"] = extract_parameter(
-        [r"площадь этажа[:\-]?\s*(\d+[.,]?\d*)\s*(?:м2|м²|кв\.м)"], text
-    )
-
-    data["levels"] = extract_parameter(
-        [
-            r"этажность[:\-]?\s*(\d+)",
-            r"этажей[:\-]?\s*(\d+)",
-            r"количество этажей[:\-]?\s*(\d+)",
-        ],
-        text,
-    )
-
-    spacy_entities = extract_entities_with_spacy(text)
+    matches = ctx.matches
+    data["project_name"] = matches.first("project_name")
+    data["object_name"] = matches.first("object_name")
+    data["building_area"] = matches.first("building_area")
+    data["floor_area"] = matches.first("floor_area")
+    data["levels"] = matches.first("levels")
+
+    spacy_entities = extract_entities_with_spacy(text, ctx)
     data["ORG"] = spacy_entities.get("ORG", [])
-    data["PROJECT"] = extract_projects(text)
-    data["LOC"] = extract_locations(text)
+    data["PROJECT"] = extract_projects(text, ctx)
+    data["LOC"] = extract_locations(text, ctx)
 
-    data["heating_system"] = extract_heating_system(text)
-    data["rooms"] = extract_rooms(text)
-    data["room_temperatures"] = extract_room_temperatures(text)
+    data["heating_system"] = extract_heating_system(text, ctx)
+    data["rooms"] = extract_rooms(text, ctx)
+    data["room_temperatures"] = extract_room_temperatures(text, ctx)
 
     return data
 
 
-def main(input_file, output_file):
+def extract_file(
+    input_file,
+    use_cache=True,
+    refresh=False,
+    cache_dir=None,
+    cache_max_mb=None,
+    n_process=None,
+):
+    """
+    Извлекает параметры из файла с учётом кэша; возвращает (data, from_cache).
+    n_process — процессов для NER по фрагментам (по умолчанию NER_PROCESSES).
+    """
+    cache = None
+    if use_cache and Path(input_file).exists():
+        cache = ResultCache(cache_dir, cache_max_mb)
+        key = cache.key(
+            input_file,
+            extractor_fingerprint(
+                SPACY_MODEL,
+                SPACY_COMPONENTS,
+                (PDF_PAGES, PDF_REQUIRED_SECTIONS, NER_CHUNK_CHARS),
+            ),
+        )
+        if not refresh:
+            extracted_data = cache.get(key)
+            if extracted_data is not None:
+                return extracted_data, True
+
     text = read_input_file(input_file)
-    extracted_data = extract_all_parameters(text)
+    extracted_data = extract_all_parameters(text, n_process=n_process)
+    if cache is not None:
+        cache.put(key, extracted_data)
+    return extracted_data, False
+
+
+def main(
+    input_file,
+    output_file,
+    use_cache=True,
+    refresh=False,
+    cache_dir=None,
+    cache_max_mb=None,
+):
+    extracted_data, from_cache = extract_file(
+        input_file,
+        use_cache=use_cache,
+        refresh=refresh,
+        cache_dir=cache_dir,
+        cache_max_mb=cache_max_mb,
+    )
+    if from_cache:
+        print("Результат взят из кэша")
     output_path = Path(output_file)
     with output_path.open("w", encoding="utf-8") as f:
         json.dump(extracted_data, f, ensure_ascii=False, indent=4)
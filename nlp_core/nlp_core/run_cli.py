@@ -7,6 +7,7 @@ import sys
 Usage examples:
   python run_cli.py --tz nlp_core/input/my_tz.docx --out nlp_core/OUT/result.json
   python run_cli.py --out nlp_core/OUT/result.json   # ищет файл в nlp_core/input/
+  python run_cli.py --tz nlp_core/input/my_tz_v2.docx --out nlp_core/OUT/result.json --incremental
 """
 
 import argparse
@@ -29,10 +30,69 @@ def parse_args():
     p.add_argument(
         "--out", help="Output JSON file path", default="nlp_core/OUT/result.json"
     )
+    p.add_argument(
+        "--spacy-model",
+        help="spaCy model name (default: NLP_SPACY_MODEL or ru_core_news_sm)",
+        default=None,
+    )
+    p.add_argument(
+        "--spacy-components",
+        help="Comma-separated pipeline components to keep enabled (default: NLP_SPACY_COMPONENTS or ner)",
+        default=None,
+    )
+    p.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=None,
+        help="Processes for PDF page layout analysis (default: NLP_PDF_WORKERS or 1)",
+    )
+    p.add_argument(
+        "--pdf-pages",
+        default=None,
+        help="PDF page range to read, 1-based inclusive, e.g. 1-20",
+    )
+    p.add_argument(
+        "--pdf-stop-after",
+        default=None,
+        help="Comma-separated sections (heating, rooms, room_temperatures); PDF reading stops "
+        "on the page where headings of all of them have been found, later pages are not parsed",
+    )
+    p.add_argument(
+        "--no-cache", action="store_true", help="Do not read or write the result cache"
+    )
+    p.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore a cached result, re-extract and overwrite the cache entry",
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Result cache folder (default: NLP_CACHE_DIR or ~/.cache/draftai/nlp)",
+    )
+    p.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=None,
+        help="Result cache size limit in MB, LRU eviction (default: NLP_CACHE_MAX_MB or 256)",
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-analyse only paragraphs changed since the previous run for this --out "
+        "(state in <out>.paragraphs.json, changed parameters in <out>.diff.json)",
+    )
     p.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
     return p.parse_args()
 
 
+def parse_page_range(spec: str) -> range:
+    start, _, end = spec.partition("-")
+    first = int(start)
+    last = int(end) if end else first
+    return range(first - 1, last)
+
+
 def setup_logging(verbose: bool):
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(format="%(asctime)s %(levelname)s: %(message)s", level=level)
@@ -62,9 +122,8 @@ def ensure_out_dir(out_path: Path):
 
 def import_nlp_module():
     """
-    Импортируем модуль nlp_core.run. Поскольку в твоём run.py при импортe
-    происходит попытка загрузить модель spacy (и возможный sys.exit),
-    перехватываем SystemExit для аккуратного сообщения.
+    Импортируем модуль nlp_core.run. Модель spaCy загружается лениво при первом
+    анализе, но SystemExit при импорте по-прежнему перехватываем для аккуратного сообщения.
     """
     try:
         module = importlib.import_module("nlp_core.run")
@@ -115,13 +174,54 @@ def main():
     except Exception:
         sys.exit(2)
 
+    if hasattr(nlp_mod, "configure_nlp"):
+        components = (
+            [c.strip() for c in args.spacy_components.split(",") if c.strip()]
+            if args.spacy_components
+            else None
+        )
+        nlp_mod.configure_nlp(model=args.spacy_model, components=components)
+
+    if args.pdf_workers is not None:
+        setattr(nlp_mod, "PDF_WORKERS", args.pdf_workers)
+    if args.pdf_pages:
+        try:
+            setattr(nlp_mod, "PDF_PAGES", parse_page_range(args.pdf_pages))
+        except ValueError:
+            logging.error("Неверный диапазон страниц: %s (ожидается, например, 1-20)", args.pdf_pages)
+            sys.exit(1)
+    if args.pdf_stop_after:
+        sections = tuple(s.strip() for s in args.pdf_stop_after.split(",") if s.strip())
+        unknown = [s for s in sections if s not in nlp_mod.SECTION_SCOPES]
+        if unknown:
+            logging.error(
+                "Неизвестные разделы: %s (допустимо: %s)",
+                ", ".join(unknown),
+                ", ".join(nlp_mod.SECTION_SCOPES),
+            )
+            sys.exit(1)
+        setattr(nlp_mod, "PDF_REQUIRED_SECTIONS", sections)
+
     # Проверяем, что в модуле есть callable main(input, output) или run(...)
     try:
-        if hasattr(nlp_mod, "main"):
+        if args.incremental:
+            from nlp_core import incremental
+
+            logging.info("Инкрементальный режим: %s -> %s", input_path, out_path)
+            incremental.main(str(input_path), str(out_path))
+            sys.exit(0)
+        elif hasattr(nlp_mod, "main"):
             logging.info(
                 "Вызов %s.main(%s, %s)", nlp_mod.__name__, input_path, out_path
             )
-            rc = nlp_mod.main(str(input_path), str(out_path))
+            rc = nlp_mod.main(
+                str(input_path),
+                str(out_path),
+                use_cache=not args.no_cache,
+                refresh=args.refresh,
+                cache_dir=args.cache_dir,
+                cache_max_mb=args.cache_max_mb,
+            )
             # Если main вернул код — используем его как exit code
             if isinstance(rc, int):
                 sys.exit(rc)
@@ -136,6 +236,10 @@ def main():
                 "В модуле nlp_core.run не найдено expected entrypoint (main или run)."
             )
             sys.exit(3)
+    except RuntimeError as e:
+        # например, модель spaCy не установлена (поднимается при первой загрузке)
+        logging.error("%s", e)
+        sys.exit(1)
     except SystemExit as se:
         # Если run.py сделал sys.exit(0) — считаем это успешным завершением.
         # Если sys.exit(c) где c != 0 — считаем ошибкой и возвращаем код.
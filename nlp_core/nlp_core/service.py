@@ -0,0 +1,238 @@
+"""
+Долгоживущий NLP-сервис: модель spaCy загружается один раз при старте,
+задания принимаются по HTTP и выполняются ограниченным пулом потоков.
+
+Эндпоинты:
+  GET  /health  — состояние сервиса, модель, загрузка пула;
+  POST /extract — JSON {"path": "...", "out": "...", "use_cache": true, "refresh": false}
+                  или {"text": "..."}; в ответе результат и тайминги запроса.
+
+"path" читается только из входной папки (NLP_SERVICE_INPUT_ROOT или
+--input-root), "out" пишется только в выходную (NLP_SERVICE_OUTPUT_ROOT или
+--output-root); относительные пути считаются от этих папок, пути за их
+пределами (в том числе через "..") отклоняются с ответом 403.
+
+Если все рабочие потоки заняты и очередь заполнена, сервис сразу отвечает 503,
+а не копит запросы без ограничения. Место в очереди освобождается, только
+когда задание действительно завершилось: после ответа 504 по таймауту оно
+остаётся занятым, пока рабочий поток не закончит.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from . import run
+
+SUPPORTED_SUFFIXES = (".docx", ".pdf", ".txt")
+
+_NLP_ROOT = Path(__file__).resolve().parents[1]
+INPUT_ROOT = Path(os.environ.get("NLP_SERVICE_INPUT_ROOT", _NLP_ROOT / "input"))
+OUTPUT_ROOT = Path(os.environ.get("NLP_SERVICE_OUTPUT_ROOT", _NLP_ROOT / "OUT"))
+
+
+class JobError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def resolve_under(root, path, what):
+    """Абсолютный путь path внутри root (относительный — от root); иначе JobError 403."""
+    root = Path(root).resolve()
+    resolved = (root / path).resolve()
+    if not resolved.is_relative_to(root):
+        raise JobError(403, f"Путь '{what}' вне разрешённой папки {root}: {path}")
+    return resolved
+
+
+class ExtractionService:
+    def __init__(self, workers=2, queue_size=8, timeout=300, input_root=None, output_root=None):
+        self.workers = workers
+        self.timeout = timeout
+        self.input_root = Path(input_root or INPUT_ROOT).resolve()
+        self.output_root = Path(output_root or OUTPUT_ROOT).resolve()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nlp")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.started = time.time()
+        self.processed = 0
+        self.failed = 0
+
+    def warm_up(self):
+        t0 = time.perf_counter()
+        run.get_nlp()("Прогрев модели.")
+        logging.info("Модель %s загружена за %.2f с", run.SPACY_MODEL, time.perf_counter() - t0)
+
+    def health(self):
+        return {
+            "status": "ok",
+            "model": run.SPACY_MODEL,
+            "components": list(run.SPACY_COMPONENTS),
+            "model_loaded": run._nlp is not None,
+            "workers": self.workers,
+            "input_root": str(self.input_root),
+            "output_root": str(self.output_root),
+            "in_flight": self._in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "uptime_s": round(time.time() - self.started, 1),
+        }
+
+    def _run_job(self, job, queued_at):
+        started = time.perf_counter()
+        timing = {"queue_ms": round((started - queued_at) * 1000, 2)}
+        cached = False
+        if "text" in job:
+            # параллельность сервиса — воркеры; NER по фрагментам — в потоке задания
+            data = run.extract_all_parameters(str(job["text"]), n_process=1)
+        else:
+            data, cached = run.extract_file(
+                job["path"],
+                use_cache=bool(job.get("use_cache", True)),
+                refresh=bool(job.get("refresh", False)),
+                n_process=1,
+            )
+        if job.get("out"):
+            out_path = Path(job["out"])
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            with out_path.open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+        timing["run_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return data, cached, timing
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def submit(self, job):
+        job = dict(job)
+        if "text" not in job:
+            path = job.get("path")
+            if not path:
+                raise JobError(400, "Нужно указать 'path' или 'text'")
+            path = resolve_under(self.input_root, str(path), "path")
+            if not path.is_file():
+                raise JobError(404, f"Файл не найден: {job['path']}")
+            if not path.name.lower().endswith(SUPPORTED_SUFFIXES):
+                raise JobError(400, "Поддерживаются только форматы: .txt, .pdf, .docx")
+            job["path"] = str(path)
+        if job.get("out"):
+            job["out"] = str(resolve_under(self.output_root, str(job["out"]), "out"))
+
+        if not self._slots.acquire(blocking=False):
+            raise JobError(503, "Сервис занят, повторите позже")
+        queued_at = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._pool.submit(self._run_job, job, queued_at)
+        except BaseException:
+            self._release()
+            raise
+        # место освобождается по завершении задания, а не по таймауту ответа
+        future.add_done_callback(self._release)
+        try:
+            data, cached, timing = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.failed += 1
+            raise JobError(504, f"Превышено время ожидания ({self.timeout} с)")
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logging.exception("Ошибка обработки задания")
+            raise JobError(500, str(e))
+        timing["total_ms"] = round((time.perf_counter() - queued_at) * 1000, 2)
+        with self._lock:
+            self.processed += 1
+        return {"result": data, "cached": cached, "timing": timing}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                self._send(200, service.health())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/extract":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                job = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(job, dict):
+                    raise ValueError("ожидается JSON-объект")
+            except ValueError as e:
+                self._send(400, {"error": f"Некорректный JSON: {e}"})
+                return
+            try:
+                response = service.submit(job)
+            except JobError as e:
+                self._send(e.status, {"error": str(e)})
+                return
+            logging.info(
+                "extract %s: %.1f мс (очередь %.1f мс)%s",
+                job.get("path", "<text>"),
+                response["timing"]["total_ms"],
+                response["timing"]["queue_ms"],
+                " [кэш]" if response["cached"] else "",
+            )
+            self._send(200, response)
+
+        def log_message(self, fmt, *args):
+            logging.debug("%s - %s", self.address_string(), fmt % args)
+
+    return Handler
+
+
+def serve(
+    host="127.0.0.1",
+    port=8085,
+    workers=2,
+    queue_size=8,
+    timeout=300,
+    input_root=None,
+    output_root=None,
+):
+    service = ExtractionService(
+        workers=workers,
+        queue_size=queue_size,
+        timeout=timeout,
+        input_root=input_root,
+        output_root=output_root,
+    )
+    service.warm_up()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    logging.info("NLP-сервис слушает http://%s:%s (workers=%d)", host, port, workers)
+    logging.info("Вход: %s, выход: %s", service.input_root, service.output_root)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Остановка NLP-сервиса")
+    finally:
+        server.server_close()
+        service.shutdown()
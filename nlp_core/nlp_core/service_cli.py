@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+CLI wrapper for nlp_core/service.py
+
+Usage examples:
+  python service_cli.py --port 8085 --workers 2 -v
+  curl -s http://127.0.0.1:8085/health
+  curl -s -X POST http://127.0.0.1:8085/extract -d '{"path": "TZ_object.docx", "out": "result.json"}'
+
+"path" is resolved under --input-root and "out" under --output-root; anything
+outside them is rejected.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+sys.path.insert(0, str(HERE.parents[1]))
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="NLP Core extraction service")
+    p.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    p.add_argument("--port", type=int, default=8085, help="Port to bind")
+    p.add_argument("--workers", type=int, default=2, help="Extraction worker threads")
+    p.add_argument(
+        "--queue-size",
+        type=int,
+        default=8,
+        help="Requests allowed to wait for a worker before answering 503",
+    )
+    p.add_argument(
+        "--timeout", type=int, default=300, help="Per-request timeout in seconds"
+    )
+    p.add_argument(
+        "--input-root",
+        default=None,
+        help="Only files under this folder can be read (default: NLP_SERVICE_INPUT_ROOT or nlp_core/input)",
+    )
+    p.add_argument(
+        "--output-root",
+        default=None,
+        help="Results can be written only under this folder (default: NLP_SERVICE_OUTPUT_ROOT or nlp_core/OUT)",
+    )
+    p.add_argument(
+        "--spacy-components",
+        help="Comma-separated pipeline components to keep enabled (default: NLP_SPACY_COMPONENTS or ner)",
+        default=None,
+    )
+    p.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
+    return p.parse_args()
+
+
+def setup_logging(verbose: bool):
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(format="%(asctime)s %(levelname)s: %(message)s", level=level)
+
+
+def main():
+    args = parse_args()
+    setup_logging(args.verbose)
+
+    from nlp_core import run, service
+
+    if args.spacy_components:
+        run.configure_nlp(
+            components=[c.strip() for c in args.spacy_components.split(",") if c.strip()]
+        )
+
+    try:
+        service.serve(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            timeout=args.timeout,
+            input_root=args.input_root,
+            output_root=args.output_root,
+        )
+    except RuntimeError as e:
+        # например, модель spaCy не установлена
+        logging.error("%s", e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Генератор синтетических ТЗ на русском языке для бенчмарков NLP Core.
+
+Документ содержит те же параметры, что и реальное ТЗ (проект, объект,
+площади, этажность, перечень помещений, отопление, температуры), и
+заполняется типовыми абзацами требований до нужного размера.
+
+Раскладка разделов (layout):
+  - "flat"     — без заголовков, строки «Параметр: значение» (как input/TZ_object.docx);
+  - "sections" — нумерованные разделы «1. Общие данные», «2. Помещения», «3. Отопление»...;
+  - "labels"   — подзаголовки вида «Помещения:» без нумерации.
+
+Файлы пишутся без сторонних библиотек: DOCX — минимальный пакет OOXML,
+PDF — по строке на строку текста, кириллица через /Differences однобайтового
+Type1-шрифта (важно только извлечение текста pdfminer, а не отображение).
+"""
+
+import random
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+LAYOUTS = ("flat", "sections", "labels")
+FORMATS = ("txt", "docx", "pdf")
+
+_ROOM_TYPES = (
+    "Офис",
+    "Коридор",
+    "Веранда",
+    "Переговорная",
+    "Санузел",
+    "Кладовая",
+    "Серверная",
+    "Тамбур",
+    "Лестничная клетка",
+    "Комната отдыха",
+)
+_CITIES = ("Москва", "Санкт-Петербург", "Казань", "Екатеринбург", "Новосибирск")
+_SUBJECTS = (
+    "Система отопления",
+    "Проектная документация",
+    "Подрядчик",
+    "Оборудование",
+    "Трубопроводная арматура",
+    "Тепловая изоляция",
+    "Узел учёта тепловой энергии",
+)
+_VERBS = (
+    "должна соответствовать",
+    "разрабатывается с учётом",
+    "выполняется в соответствии с",
+    "согласовывается с учётом",
+    "принимается по результатам",
+)
+_OBJECTS = (
+    "требований СП 60.13330.2020",
+    "действующих норм и правил",
+    "технических условий ресурсоснабжающей организации",
+    "задания на проектирование",
+    "результатов обследования объекта",
+    "требований пожарной безопасности",
+)
+_TAILS = (
+    "Изменения согласовываются с заказчиком.",
+    "Сроки выполнения определяются договором.",
+    "Решения обосновываются расчётом.",
+    "Материалы предоставляются в электронном виде.",
+    "",
+)
+
+
+def _filler_paragraph(rng):
+    sentences = []
+    for _ in range(rng.randint(2, 4)):
+        sentence = f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}."
+        tail = rng.choice(_TAILS)
+        sentences.append(f"{sentence} {tail}".strip())
+    return " ".join(sentences)
+
+
+def generate_tz(target_chars=20000, rooms=20, layout="sections", seed=0):
+    """Текст ТЗ не короче target_chars символов с rooms помещениями."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Неизвестная раскладка: {layout} (ожидается одна из {LAYOUTS})")
+    rng = random.Random(seed)
+    city = rng.choice(_CITIES)
+    levels = rng.randint(1, 9)
+    floor_area = rng.randint(200, 3000)
+    power = rng.randint(50, 900)
+    supply = rng.choice((80, 90, 95, 105))
+
+    general = [
+        "Название проекта: «Проект системы отопления офисного здания»",
+        f"Объект: «Офисное здание № {rng.randint(1, 99)}»",
+        f"Заказчик: ООО «Проектное бюро {rng.randint(1, 999)}»",
+        f"Месторасположения: {rng.randint(100000, 999999)}, г. {city}",
+        f"Этап: Площадка № {rng.randint(1, 9)}",
+        f"Площадь здания: {floor_area * levels} м2",
+        f"Площадь этажа: {floor_area} м2",
+        f"Количество этажей: {levels}",
+    ]
+    room_lines = []
+    for i in range(1, rooms + 1):
+        name = f"{rng.choice(_ROOM_TYPES)} {100 * rng.randint(1, levels) + i}"
+        room_lines.append(f"{i}. {name}" if layout != "flat" else f"Помещение: {name}")
+    heating = [
+        "Система отопления двухтрубная с радиаторами.",
+        f"Тип радиаторов: {rng.choice(('напольные', 'стальные панельные', 'биметаллические'))}",
+        f"Источник теплоснабжения: {rng.choice(('ИТП.', 'котельная.', 'тепловая сеть.'))}",
+        f"Мощность котла: {power} кВт.",
+        f"Температура теплоносителя: {supply}/{supply - 25} °C",
+        f"Температура: в офисах {rng.randint(20, 24)}°C, в коридорах {rng.randint(14, 18)}°C, "
+        f"на веранде {rng.randint(12, 18)}°C",
+    ]
+
+    def heading(number, title):
+        if layout == "sections":
+            return [f"{number}. {title}"]
+        if layout == "labels":
+            return [f"{title}:"]
+        return []
+
+    lines = []
+    if layout != "flat":
+        lines.append("ТЕХНИЧЕСКОЕ ЗАДАНИЕ")
+    lines += heading(1, "Общие данные") + general
+    lines += heading(2, "Помещения") + room_lines
+    lines += heading(3, "Отопление") + heating
+    lines += heading(4, "Общие требования")
+
+    size = sum(len(line) + 1 for line in lines)
+    while size < target_chars:
+        paragraph = _filler_paragraph(rng)
+        lines.append(paragraph)
+        size += len(paragraph) + 1
+    return "\n".join(lines) + "\n"
+
+
+def write_txt(path, text):
+    Path(path).write_text(text, encoding="utf-8")
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+
+def write_docx(path, text):
+    """Минимальный DOCX: по абзацу w:p на каждую строку текста."""
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        if line
+        else "<w:p/>"
+        for line in text.rstrip("\n").split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _RELS)
+        zf.writestr("word/document.xml", document)
+
+
+def _pdf_encoding():
+    """Однобайтовая кодировка: ASCII как есть, кириллица и знаки — коды 128+ с именами глифов."""
+    names = []
+    # имена глифов Adobe: А..Е = afii10017..10022, Ё = afii10023, Ж..Я = afii10024..10049
+    for base, yo, first in ((0x410, 0x401, 10017), (0x430, 0x451, 10065)):
+        names.append((chr(yo), f"afii{first + 6}"))
+        for k in range(32):
+            names.append((chr(base + k), f"afii{first + k + (1 if k >= 6 else 0)}"))
+    names += [
+        ("°", "degree"),
+        ("«", "guillemotleft"),
+        ("»", "guillemotright"),
+        ("№", "afii61352"),
+        ("—", "emdash"),
+        ("–", "endash"),
+        ("²", "twosuperior"),
+    ]
+    table = {ch: 128 + i for i, (ch, _) in enumerate(names)}
+    differences = "[128 " + " ".join(f"/{name}" for _, name in names) + "]"
+    return table, differences
+
+
+def _pdf_string(line, table):
+    out = bytearray()
+    for ch in line:
+        code = table.get(ch)
+        if code is None:
+            code = ord(ch) if ord(ch) < 128 else ord("?")
+        if code in (0x28, 0x29, 0x5C):  # ( ) \
+            out += b"\\"
+        out.append(code)
+    return bytes(out)
+
+
+def write_pdf(path, text, lines_per_page=50):
+    table, differences = _pdf_encoding()
+    lines = text.rstrip("\n").split("\n")
+    pages = [lines[i : i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    objs.append(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /SynthSans "
+        # не стандартный шрифт: pdfminer берёт ширины из /Widths, а не из метрик Helvetica
+        b"/FirstChar 32 /LastChar 255 /Widths [" + b" ".join([b"560"] * 224) + b"] "
+        b"/Encoding << /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences "
+        + differences.encode("ascii")
+        + b" >> /FontDescriptor 4 0 R >>"
+    )
+    objs.append(
+        b"<< /Type /FontDescriptor /FontName /SynthSans /Flags 32 "
+        b"/FontBBox [0 -200 1000 900] /ItalicAngle 0 /Ascent 900 /Descent -200 "
+        b"/CapHeight 700 /StemV 80 >>"
+    )
+    kids = []
+    for page in pages:
+        stream = b"BT /F1 9 Tf 40 800 Td 14 TL " + b" ".join(
+            b"(" + _pdf_string(line, table) + b") Tj T*" for line in page
+        ) + b" ET"
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objs)
+        objs.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objs))
+    objs[1] = (
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(b"%d 0 R" % k for k in kids)
+        + b"] /Count %d >>" % len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1,
+        xref,
+    )
+    Path(path).write_bytes(bytes(out))
+
+
+WRITERS = {"txt": write_txt, "docx": write_docx, "pdf": write_pdf}
+
+
+def generate_corpus(
+    out_dir, formats=FORMATS, sizes=(20000,), rooms=20, layout="sections", docs=1, seed=0
+):
+    """Пишет набор ТЗ (формат x размер x docs) в out_dir и возвращает список путей."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for size in sizes:
+        for n in range(docs):
+            text = generate_tz(size, rooms=rooms, layout=layout, seed=seed + n)
+            for fmt in formats:
+                path = out_dir / f"tz_{layout}_{size}_{n}.{fmt}"
+                WRITERS[fmt](path, text)
+                paths.append(path)
+    return paths
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# пакет nlp_core импортируется из папки nlp_core/, как в *_cli.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
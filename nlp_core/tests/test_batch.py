@@ -0,0 +1,64 @@
+import json
+
+import pytest
+import spacy
+
+from nlp_core import batch, run
+
+
+@pytest.fixture
+def blank_nlp(monkeypatch):
+    # без модели ru_core_news_sm: пустой пайплайн, сущностей нет
+    monkeypatch.setattr(run, "_nlp", spacy.blank("ru"))
+    monkeypatch.setattr(run, "NER_CHUNK_CHARS", 200)
+    monkeypatch.setattr(run, "NER_PROCESSES", 1)
+
+
+def test_index_follows_input_order_and_records_errors(tmp_path, blank_nlp, monkeypatch):
+    inputs = []
+    for name, text in [
+        ("long.txt", "Мощность котла: 120 кВт\n" * 20),
+        ("short.txt", "Мощность котла: 90 кВт"),
+        ("broken.txt", "СБОЙ"),
+        ("other.txt", "Тип радиаторов: биметаллические"),
+    ]:
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        inputs.append(path)
+    inputs.insert(2, tmp_path / "missing.txt")
+
+    extract = batch.extract_all_parameters
+
+    def flaky(text, ctx=None):
+        if text == "СБОЙ":
+            raise ValueError("битый файл")
+        return extract(text, ctx)
+
+    monkeypatch.setattr(batch, "extract_all_parameters", flaky)
+    summary = batch.run_batch(inputs, tmp_path / "out", batch_size=2)
+
+    assert [it["input"] for it in summary["items"]] == [str(p) for p in inputs]
+    assert [it["status"] for it in summary["items"]] == ["ok", "ok", "error", "error", "ok"]
+    assert "битый файл" in summary["items"][3]["error"]
+    assert (summary["ok"], summary["failed"]) == (3, 2)
+    index = json.loads((tmp_path / "out" / "index.json").read_text(encoding="utf-8"))
+    assert index["items"] == summary["items"]
+    result = json.loads((tmp_path / "out" / "short.json").read_text(encoding="utf-8"))
+    assert result["heating_system"]["boiler_power"] == "90"
+
+
+def test_long_texts_are_not_chunked_in_parallel(tmp_path, blank_nlp, monkeypatch):
+    monkeypatch.setattr(run, "NER_PROCESSES", 4)
+    seen = []
+    chunked = run.extract_entities_chunked
+
+    def spy(text, nlp, max_chars, n_process=1):
+        seen.append(n_process)
+        return chunked(text, nlp, max_chars, n_process=n_process)
+
+    monkeypatch.setattr(run, "extract_entities_chunked", spy)
+    path = tmp_path / "long.txt"
+    path.write_text("Мощность котла: 120 кВт\n" * 20, encoding="utf-8")
+    summary = batch.run_batch([path], tmp_path / "out", n_process=2)
+    assert summary["ok"] == 1
+    assert seen == [1]
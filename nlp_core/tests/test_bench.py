@@ -0,0 +1,42 @@
+import pytest
+import spacy
+
+from nlp_core import bench, run, synth
+
+
+@pytest.fixture(autouse=True)
+def blank_nlp(monkeypatch):
+    # без модели ru_core_news_sm: пустой пайплайн, сущностей нет
+    monkeypatch.setattr(run, "_nlp", spacy.blank("ru"))
+
+
+@pytest.mark.parametrize("layout", synth.LAYOUTS)
+def test_generated_tz_has_requested_size_and_parameters(layout):
+    text = synth.generate_tz(5000, rooms=7, layout=layout, seed=4)
+    assert len(text) >= 5000
+    assert text == synth.generate_tz(5000, rooms=7, layout=layout, seed=4)
+    data = run.extract_all_parameters(text)
+    assert len(data["rooms"]) == 7
+    assert data["heating_system"]["boiler_power"] != "Нет данных"
+    assert set(data["room_temperatures"]) == {"Офис", "Коридор", "Веранда"}
+
+
+def test_corpus_formats_extract_the_same(tmp_path):
+    paths = synth.generate_corpus(tmp_path, sizes=(3000,), rooms=5, seed=1)
+    assert sorted(p.suffix for p in paths) == sorted(f".{fmt}" for fmt in synth.FORMATS)
+    results = [run.extract_all_parameters(run.read_input_file(str(p))) for p in paths]
+    assert all(r == results[0] for r in results[1:])
+
+
+def test_benchmark_report(tmp_path):
+    paths = synth.generate_corpus(tmp_path, formats=("txt", "docx"), sizes=(2000,), seed=2)
+    report = bench.run_benchmark(paths, repeat=2, memory=False, label="test")
+    summary = report["summary"]
+    assert report["meta"]["label"] == "test"
+    assert summary["docs"] == 2
+    assert set(summary["stages_s"]) == set(bench.STAGES)
+    assert set(summary["by_format"]) == {"txt", "docx"}
+    for doc in report["documents"]:
+        assert set(doc["stages"]) == set(bench.STAGES)
+        assert doc["chars"] >= 2000
+        assert doc["peak_mb"] is None
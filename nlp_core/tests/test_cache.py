@@ -0,0 +1,62 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import spacy
+
+from nlp_core import cache, run
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """Копия исходников nlp_core, по которой считается отпечаток экстрактора."""
+    package = tmp_path / "nlp_core"
+    shutil.copytree(
+        Path(cache.__file__).parent, package, ignore=shutil.ignore_patterns("__pycache__")
+    )
+    monkeypatch.setattr(cache, "__file__", str(package / "cache.py"))
+    return package
+
+
+def test_fingerprint_follows_extractor_sources(sources):
+    before = cache.extractor_fingerprint("ru_core_news_sm", ("ner",))
+    assert cache.extractor_fingerprint("ru_core_news_sm", ("ner",)) == before
+
+    patterns = sources / "patterns.py"
+    patterns.write_text(patterns.read_text(encoding="utf-8") + "\n# правка\n", "utf-8")
+    after = cache.extractor_fingerprint("ru_core_news_sm", ("ner",))
+    assert after != before
+
+    (sources / "extra_extractor.py").write_text("", encoding="utf-8")
+    assert cache.extractor_fingerprint("ru_core_news_sm", ("ner",)) != after
+
+
+@pytest.mark.parametrize(
+    "model, components, extra",
+    [
+        ("ru_core_news_md", ("ner",), (None, (), 100000)),
+        ("ru_core_news_sm", ("tok2vec", "ner"), (None, (), 100000)),
+        ("ru_core_news_sm", ("ner",), ([0, 1], (), 100000)),
+        ("ru_core_news_sm", ("ner",), (None, ("rooms",), 100000)),
+        ("ru_core_news_sm", ("ner",), (None, (), 50000)),
+    ],
+)
+def test_fingerprint_follows_settings(model, components, extra):
+    base = cache.extractor_fingerprint("ru_core_news_sm", ("ner",), (None, (), 100000))
+    assert cache.extractor_fingerprint(model, components, extra) != base
+
+
+def test_extract_file_misses_after_source_change(tmp_path, sources, monkeypatch):
+    monkeypatch.setattr(run, "_nlp", spacy.blank("ru"))
+    tz = tmp_path / "tz.txt"
+    tz.write_text("Мощность котла: 120 кВт", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    data, cached = run.extract_file(str(tz), cache_dir=cache_dir)
+    assert not cached
+    assert run.extract_file(str(tz), cache_dir=cache_dir) == (data, True)
+
+    run_py = sources / "run.py"
+    run_py.write_text(run_py.read_text(encoding="utf-8") + "\n# правка\n", encoding="utf-8")
+    assert run.extract_file(str(tz), cache_dir=cache_dir) == (data, False)
+    assert len(list(cache_dir.glob("*.json"))) == 2
@@ -0,0 +1,89 @@
+import pytest
+
+from nlp_core import run, synth
+from nlp_core.document_index import LABEL_LEVEL, DocumentIndex
+
+TZ = (
+    "ТЕХНИЧЕСКОЕ ЗАДАНИЕ\n"
+    "1. Общие данные\n"
+    "Объект: Школа\n"
+    "2. Помещения\n"
+    "1. Офис\n"
+    "2. Коридор\n"
+    "Экспликация помещений:\n"
+    "- Склад\n"
+    "3. Отопление\n"
+    "3.1 Источник теплоснабжения\n"
+    "Мощность котла: 120 кВт\n"
+    "3.2 Отопительные приборы\n"
+    "Тип радиаторов: стальные\n"
+    "4. Температуры в помещениях\n"
+    "в офисах 22 °C"
+)
+
+
+def _text(index, span):
+    return index.text[span[0] : span[1]]
+
+
+@pytest.fixture
+def index():
+    return DocumentIndex(TZ)
+
+
+def test_sections_tree(index):
+    titles = [(s.title, s.level, s.number) for s in index.sections]
+    assert titles == [
+        ("ТЕХНИЧЕСКОЕ ЗАДАНИЕ", 1, None),
+        ("Общие данные", 1, "1"),
+        ("Помещения", 1, "2"),
+        ("Экспликация помещений", LABEL_LEVEL, None),
+        ("Отопление", 1, "3"),
+        ("Источник теплоснабжения", 2, "3.1"),
+        ("Отопительные приборы", 2, "3.2"),
+        ("Температуры в помещениях", 1, "4"),
+    ]
+    heating = index.find_sections(["отоп"])
+    assert [s.title for s in heating] == ["Отопление", "Отопительные приборы"]
+    assert [s.title for s in heating[0].children] == [
+        "Источник теплоснабжения",
+        "Отопительные приборы",
+    ]
+    assert heating[1].path() == ["Отопление", "Отопительные приборы"]
+    assert index.section_at(TZ.index("120 кВт")).title == "Источник теплоснабжения"
+
+
+def test_section_spans_cover_bodies_with_subsections(index):
+    spans = index.section_spans(["отоп"])
+    # подраздел «Отопительные приборы» лежит внутри «Отопление» — один участок
+    assert [_text(index, s) for s in spans] == [
+        "3.1 Источник теплоснабжения\n"
+        "Мощность котла: 120 кВт\n"
+        "3.2 Отопительные приборы\n"
+        "Тип радиаторов: стальные\n"
+    ]
+    assert _text(index, index.section_spans(["отоп"], body_only=False)[0]).startswith(
+        "3. Отопление\n"
+    )
+
+
+def test_section_spans_merge_and_sort(index):
+    spans = index.section_spans(["помещени"])
+    assert spans == sorted(spans)
+    assert [_text(index, s) for s in spans] == [
+        "1. Офис\n2. Коридор\nЭкспликация помещений:\n- Склад\n",
+        "в офисах 22 °C",
+    ]
+    assert index.section_spans(["вентиляц"]) == []
+    # пункты «1. Офис», «2. Коридор» — нумерованный список, а не разделы
+    assert [ls.items for ls in index.lists] == [2, 1]
+
+
+def test_section_spans_on_synthetic_layouts():
+    for layout in ("sections", "labels"):
+        text = synth.generate_tz(4000, rooms=6, layout=layout, seed=2)
+        index = DocumentIndex(text)
+        spans = index.section_spans(run.SECTION_SCOPES["heating"])
+        assert spans, layout
+        assert all(a < b <= c < d for (a, b), (c, d) in zip(spans, spans[1:]))
+        assert any("Мощность котла" in _text(index, s) for s in spans), layout
@@ -0,0 +1,109 @@
+import zipfile
+
+import pytest
+
+from nlp_core import run, synth
+from nlp_core.docx_reader import iter_docx_blocks
+
+
+def _p(*runs, props=""):
+    return f"<w:p>{props}{''.join(f'<w:r>{r}</w:r>' for r in runs)}</w:p>"
+
+
+def _t(text):
+    return f'<w:t xml:space="preserve">{text}</w:t>'
+
+
+def _tc(*content, props=""):
+    props = f"<w:tcPr>{props}</w:tcPr>" if props else ""
+    return f"<w:tc>{props}{''.join(content) or '<w:p/>'}</w:tc>"
+
+
+def _tbl(*rows):
+    return "<w:tbl>" + "".join(f"<w:tr>{''.join(cells)}</w:tr>" for cells in rows) + "</w:tbl>"
+
+
+def _write_docx(path, body):
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">'
+        f"<w:body>{body}<w:sectPr/></w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("[Content_Types].xml", synth._CONTENT_TYPES)
+        zf.writestr("_rels/.rels", synth._RELS)
+        zf.writestr("word/document.xml", document)
+
+
+@pytest.fixture
+def tz_docx(tmp_path):
+    path = tmp_path / "tz.docx"
+    _write_docx(
+        path,
+        _p(_t("Объект: Школа"))
+        # позиции табуляции в свойствах абзаца — не текст
+        + _p(
+            _t("Тип"),
+            "<w:tab/>",
+            _t("радиаторов: стальные"),
+            props="<w:pPr><w:tabs><w:tab/></w:tabs></w:pPr>",
+        )
+        + _p(_t("Строка 1"), '<w:br/>', _t("Строка 2"), '<w:br w:type="page"/>')
+        + _tbl(
+            [_tc(_p(_t("Помещение"))), _tc(_p(_t("Температура")))],
+            [_tc(_p(_t("Офис")), _p(_t("101"))), _tc(_p(_t("22 °C")))],
+            # объединение по горизонтали: одна ячейка на две колонки
+            [_tc(_p(_t("Коридор, холл")), props='<w:gridSpan w:val="2"/>')],
+            # объединение по вертикали: продолжение пустое
+            [_tc(_p(_t("Склад")), props='<w:vMerge w:val="restart"/>'), _tc(_p(_t("12 °C")))],
+            [_tc(props="<w:vMerge/>"), _tc(_p(_t("14 °C")))],
+            [
+                _tc(_p(_t("Веранда"))),
+                _tc(
+                    _tbl(
+                        [_tc(_p(_t("день"))), _tc(_p(_t("18")))],
+                        [_tc(_p(_t("ночь"))), _tc(_p(_t("15")))],
+                    )
+                ),
+            ],
+        )
+        + "<mc:AlternateContent><mc:Choice>"
+        + _p(_t("Надпись"))
+        + "</mc:Choice><mc:Fallback>"
+        + _p(_t("Надпись"))
+        + "</mc:Fallback></mc:AlternateContent>"
+        + _p(_t("Этажность: 3")),
+    )
+    return path
+
+
+def test_blocks_follow_document_order(tz_docx):
+    assert list(iter_docx_blocks(tz_docx)) == [
+        "Объект: Школа",
+        "Тип\tрадиаторов: стальные",
+        "Строка 1\nСтрока 2",
+        "Помещение\tТемпература",
+        "Офис 101\t22 °C",
+        "Коридор, холл",
+        "Склад\t12 °C",
+        "\t14 °C",
+        "Веранда\tдень\t18 ночь\t15",
+        "Надпись",
+        "Этажность: 3",
+    ]
+
+
+def test_tables_reach_extraction(tz_docx):
+    text = run.read_input_file(str(tz_docx))
+    assert text.startswith("Объект: Школа\n")
+    assert "\nОфис 101\t22 °C\n" in text
+    assert run.scan_patterns(text).first("levels") == "3"
+
+
+def test_paragraphs_match_python_docx(tmp_path):
+    docx = pytest.importorskip("docx")
+    path = tmp_path / "plain.docx"
+    synth.write_docx(path, synth.generate_tz(3000, rooms=5, layout="sections", seed=1))
+    paragraphs = [p.text for p in docx.Document(str(path)).paragraphs]
+    assert list(iter_docx_blocks(path)) == paragraphs
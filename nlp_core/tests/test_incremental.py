@@ -0,0 +1,45 @@
+import json
+
+import pytest
+import spacy
+
+from nlp_core import incremental, run
+
+TZ = (
+    "Техническое задание\n"
+    "Тип радиаторов:\nбиметаллические / Мощность котла:\n{power} кВт\n"
+    "Температура теплоносителя:\n90/70\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def blank_nlp(monkeypatch):
+    # без модели ru_core_news_sm: пустой пайплайн, сущностей нет
+    monkeypatch.setattr(run, "_nlp", spacy.blank("ru"))
+
+
+def _write(path, power):
+    path.write_text(TZ.format(power=power), encoding="utf-8")
+    return str(path)
+
+
+def test_multiline_parameters_match_full_extraction(tmp_path):
+    tz = _write(tmp_path / "tz.txt", 120)
+    out = str(tmp_path / "result.json")
+    data, _, _ = incremental.extract_incremental(tz, out)
+    expected = run.extract_all_parameters(TZ.format(power=120))
+    assert data == expected
+    assert data["heating_system"]["boiler_power"] == "120"
+    assert data["heating_system"]["radiator_type"] != ":"
+
+
+def test_edit_across_line_break_appears_in_diff(tmp_path):
+    tz = tmp_path / "tz.txt"
+    out = str(tmp_path / "result.json")
+    incremental.extract_incremental(_write(tz, 120), out)
+    data, diff, stats = incremental.extract_incremental(_write(tz, 150), out)
+    assert data == run.extract_all_parameters(TZ.format(power=150))
+    assert diff["heating_system.boiler_power"] == {"old": "120", "new": "150"}
+    assert stats["extracted"] == 1
+    saved = json.loads(incremental.diff_path_for(out).read_text(encoding="utf-8"))
+    assert saved == diff
@@ -0,0 +1,79 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from nlp_core import run, synth
+from nlp_core.patterns import ENGINE, PATTERNS, scan_patterns
+
+SAMPLE_TZ = Path(__file__).resolve().parents[1] / "input" / "TZ_object.docx"
+
+
+def _baseline(text):
+    """Прежний поиск: каждый шаблон реестра отдельным re.search / re.finditer."""
+    result = {}
+    for name, spec in PATTERNS.items():
+        if spec["mode"] == "first":
+            found = []
+            for pattern in spec["patterns"]:
+                m = re.search(pattern, text, spec["flags"])
+                if m:
+                    found = [m]
+                    break
+        else:
+            found = [
+                m for pattern in spec["patterns"] for m in re.finditer(pattern, text, spec["flags"])
+            ]
+        result[name] = [(m.span(), m.groups()) for m in found]
+    return result
+
+
+def _engine(text):
+    matches = scan_patterns(text)
+    result = {}
+    for name, spec in PATTERNS.items():
+        found = matches.all(name)
+        if spec["mode"] == "first":
+            m = matches.match(name)
+            found = [m] if m else []
+        result[name] = [(m.span(), m.groups()) for m in found]
+    return result
+
+
+def _texts():
+    yield "sample", run.read_input_file(str(SAMPLE_TZ))
+    for layout in synth.LAYOUTS:
+        yield f"synth-{layout}", synth.generate_tz(6000, rooms=12, layout=layout, seed=3)
+    # ключевые слова, вложенные друг в друга и начинающиеся внутри другого
+    yield "overlap", (
+        "Температура теплоносителя: 95/70 °C\n"
+        "температура воды 80/60\n"
+        "Мощность отопительного котла: 90 кВт; мощность котла: 75 кВт\n"
+        "Наименование объекта: Школа; этап: 2; стройка: корпус Б\n"
+        "площадь зданияплощадь здания: 120 м2\n"
+    )
+    # регистр: заглавные, смешанный, Ё и символы, меняющие длину при lower()
+    yield "case", (
+        "ОБЪЕКТ: СКЛАД\n"
+        "НаЗвАнИе ПрОеКтА: Ёлка\n"
+        "İ ТИП РАДИАТОРОВ: Стальные\n"
+        "ЭТАЖНОСТЬ: 5\n"
+        "Источник ТЕПЛОСНАБЖЕНИЯ: котельная\n"
+    )
+    # совпадения в самом начале и в самом конце текста, без перевода строки
+    yield "edges", "Помещение: Офис 1\n2. Склад\n- Коридор\nв офисах 22 °C, в коридорах 18°C"
+    yield "tail", "Координаты: 55.75, 37.61 индекс 101000\nМощность котла: 12,5 кВт"
+    yield "empty", ""
+
+
+@pytest.mark.parametrize("text", [t for _, t in _texts()], ids=[n for n, _ in _texts()])
+def test_engine_matches_per_regex_search(text):
+    assert _engine(text) == _baseline(text)
+
+
+def test_scan_is_bounded_by_span():
+    text = "Объект: А\nОбъект: Б\nОбъект: В"
+    start = text.index("Объект: Б")
+    matches = ENGINE.scan(text, start, start + len("Объект: Б"))
+    assert matches.first("object_name") == "Б"
+    assert matches.all("rooms") == []
@@ -0,0 +1,105 @@
+import pytest
+from pdfminer.pdfinterp import PDFPageInterpreter
+
+from nlp_core import run
+
+
+def _write_pdf(path, pages):
+    """Минимальный PDF: на каждой странице строки латиницы (Helvetica) сверху вниз."""
+    n = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(n))
+        + b"] /Count %d >>" % n,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        stream = b"BT /F1 12 Tf 72 720 Td " + b" 0 -40 Td ".join(
+            b"(%s) Tj" % line.encode("latin-1") for line in lines
+        ) + b" ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(out))
+
+
+PAGES = [
+    ["1. Intro", "Heating and rooms are described below."],
+    ["2. Heating", "Radiators 90/70"],
+    ["3. Rooms list", "Office 101"],
+    # тело раздела «Rooms list» продолжается на следующей странице
+    ["Office 102", "Corridor 103"],
+    ["4. Appendix A", "Drawings"],
+    ["5. Appendix B", "Photos"],
+]
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    monkeypatch.setitem(run.SECTION_SCOPES, "heating", ("heating",))
+    monkeypatch.setitem(run.SECTION_SCOPES, "rooms", ("rooms",))
+    path = tmp_path / "tz.pdf"
+    _write_pdf(path, PAGES)
+    return path
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    calls = []
+    original = PDFPageInterpreter.process_page
+
+    def process_page(self, page):
+        calls.append(page)
+        return original(self, page)
+
+    monkeypatch.setattr(PDFPageInterpreter, "process_page", process_page)
+    return calls
+
+
+def test_reading_stops_after_last_required_section_is_closed(pdf, parsed):
+    text = run.read_input_file(str(pdf), required_sections=("heating", "rooms"))
+    # тело раздела на следующей странице дочитано, раздел закрыт «4. Appendix A»
+    assert "Corridor 103" in text
+    assert "Appendix B" not in text
+    assert len(parsed) == 5
+
+
+def test_mentions_outside_headings_do_not_stop_reading(pdf, parsed):
+    # «rooms» есть в тексте первой страницы, но заголовок раздела — только на третьей
+    text = run.read_input_file(str(pdf), required_sections=("rooms",))
+    assert "Corridor 103" in text
+    assert len(parsed) == 5
+
+
+def test_module_setting_is_used_by_default(pdf, parsed, monkeypatch):
+    monkeypatch.setattr(run, "PDF_REQUIRED_SECTIONS", ("heating",))
+    text = run.read_input_file(str(pdf))
+    assert "Radiators 90/70" in text
+    assert "Office 102" not in text
+    assert len(parsed) == 3
+
+
+def test_whole_document_without_required_sections(pdf, parsed):
+    assert "Appendix B" in run.read_input_file(str(pdf))
+    assert len(parsed) == 6
+
+
+def test_unclosed_section_reads_to_the_end(pdf, parsed, monkeypatch):
+    monkeypatch.setitem(run.SECTION_SCOPES, "rooms", ("appendix b",))
+    assert "Photos" in run.read_input_file(str(pdf), required_sections=("rooms",))
+    assert len(parsed) == 6
@@ -0,0 +1,115 @@
+import pytest
+import spacy
+
+from nlp_core import run
+
+TZ = (
+    "Название проекта: Школа\n"
+    "Заказчик: ООО Ромашка, г. Москва, 101000\n"
+    "Отопление\n"
+    "Мощность котла: 120 кВт\n"
+    "Помещения\n"
+    "Помещение: Офис\n"
+    "Температура: в офисах 22 °C\n"
+)
+
+
+class CountingNlp:
+    """Пустой пайплайн ru с entity_ruler; считает вызовы модели."""
+
+    def __init__(self):
+        self.nlp = spacy.blank("ru")
+        ruler = self.nlp.add_pipe("entity_ruler")
+        ruler.add_patterns(
+            [
+                {"label": "ORG", "pattern": "ООО Ромашка"},
+                {"label": "LOC", "pattern": "Москва"},
+            ]
+        )
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return self.nlp(text)
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    nlp = CountingNlp()
+    monkeypatch.setattr(run, "_nlp", nlp)
+    return nlp
+
+
+def test_document_is_parsed_once(nlp):
+    data = run.extract_all_parameters(TZ)
+    assert nlp.calls == 1
+    assert data["ORG"] == ["ООО Ромашка"]
+    assert data["LOC"] == ["Москва", "101000"]
+    assert data["heating_system"]["boiler_power"] == "120"
+
+
+def test_shared_context_matches_standalone_extractors(nlp):
+    ctx = run.analyze_document(TZ)
+    for extract in (
+        run.extract_entities_with_spacy,
+        run.extract_locations,
+        run.extract_heating_system,
+        run.extract_rooms,
+        run.extract_projects,
+        run.extract_room_temperatures,
+    ):
+        calls = nlp.calls
+        shared = extract(TZ, ctx)
+        assert nlp.calls == calls
+        assert shared == extract(TZ)
+    calls = nlp.calls
+    run.extract_all_parameters(TZ, ctx)
+    assert nlp.calls == calls
+
+
+@pytest.fixture
+def fake_load(monkeypatch):
+    monkeypatch.setattr(run, "_nlp", None)
+    monkeypatch.setattr(run, "SPACY_MODEL", run.SPACY_MODEL)
+    monkeypatch.setattr(run, "SPACY_COMPONENTS", run.SPACY_COMPONENTS)
+    loads = []
+
+    def load(name, exclude=()):
+        loads.append((name, tuple(exclude)))
+        model = spacy.blank("ru")
+        for component in ("sentencizer", "entity_ruler"):
+            if component not in exclude:
+                model.add_pipe(component)
+        return model
+
+    monkeypatch.setattr(spacy, "load", load)
+    return loads
+
+
+def test_model_is_loaded_lazily_once(fake_load):
+    run.configure_nlp("fake_model", ["ner"])
+    assert fake_load == []
+    nlp = run.get_nlp()
+    assert run.get_nlp() is nlp
+    assert fake_load == [
+        ("fake_model", tuple(c for c in run._KNOWN_COMPONENTS if c != "ner"))
+    ]
+
+
+def test_components_outside_configuration_are_disabled(fake_load, monkeypatch):
+    # компоненты, неизвестные _KNOWN_COMPONENTS, не исключаются при загрузке, но отключаются
+    monkeypatch.setattr(run, "_KNOWN_COMPONENTS", ("entity_ruler",))
+    run.configure_nlp("fake_model", ["entity_ruler"])
+    nlp = run.get_nlp()
+    assert nlp.pipe_names == ["entity_ruler"]
+    assert nlp.disabled == ["sentencizer"]
+    run.configure_nlp(components=["entity_ruler", "sentencizer"])
+    assert run.get_nlp().pipe_names == ["sentencizer", "entity_ruler"]
+    assert len(fake_load) == 2
+
+
+def test_missing_model_is_reported(monkeypatch):
+    monkeypatch.setattr(run, "_nlp", None)
+    monkeypatch.setattr(run, "SPACY_MODEL", "no_such_model_xx")
+    with pytest.raises(RuntimeError, match="python -m spacy download no_such_model_xx"):
+        run.get_nlp()
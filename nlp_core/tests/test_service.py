@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+import spacy
+
+from nlp_core import run
+from nlp_core.service import ExtractionService, JobError
+
+
+@pytest.fixture
+def service(tmp_path):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "tz.txt").write_text("ТЗ", encoding="utf-8")
+    (tmp_path / "secret.txt").write_text("секрет", encoding="utf-8")
+    service = ExtractionService(
+        workers=1,
+        queue_size=0,
+        timeout=0.05,
+        input_root=tmp_path / "in",
+        output_root=tmp_path / "out",
+    )
+    yield service
+    service.shutdown()
+
+
+@pytest.mark.parametrize(
+    "job",
+    [
+        {"path": "../secret.txt"},
+        {"path": "{root}/secret.txt"},
+        {"path": "tz.txt", "out": "../result.json"},
+        {"path": "tz.txt", "out": "/etc/result.json"},
+    ],
+)
+def test_paths_outside_roots_are_rejected(service, tmp_path, job):
+    job = {k: v.format(root=tmp_path) for k, v in job.items()}
+    with pytest.raises(JobError) as e:
+        service.submit(job)
+    assert e.value.status == 403
+
+
+def test_relative_paths_resolve_under_roots(service, tmp_path, monkeypatch):
+    seen = {}
+
+    def fake_run(job, queued_at):
+        seen.update(job)
+        return {}, False, {"queue_ms": 0.0}
+
+    monkeypatch.setattr(service, "_run_job", fake_run)
+    service.submit({"path": "tz.txt", "out": "sub/result.json"})
+    assert seen["path"] == str(tmp_path / "in" / "tz.txt")
+    assert seen["out"] == str(tmp_path / "out" / "sub" / "result.json")
+
+
+def test_slot_is_held_until_timed_out_job_finishes(service, monkeypatch):
+    done = threading.Event()
+    finished = threading.Event()
+
+    def slow_run(job, queued_at):
+        done.wait(5)
+        return {}, False, {"queue_ms": 0.0}
+
+    monkeypatch.setattr(service, "_run_job", slow_run)
+    with pytest.raises(JobError) as e:
+        service.submit({"path": "tz.txt"})
+    assert e.value.status == 504
+    # рабочий поток ещё занят — новое задание получает 503, а не встаёт в очередь
+    with pytest.raises(JobError) as e:
+        service.submit({"path": "tz.txt"})
+    assert e.value.status == 503
+    assert service.health()["in_flight"] == 1
+
+    monkeypatch.setattr(service, "_run_job", lambda job, queued_at: finished.set() or ({}, False, {}))
+    done.set()
+    service._pool.submit(lambda: None).result()
+    assert service.health()["in_flight"] == 0
+    service.submit({"path": "tz.txt"})
+    assert finished.is_set()
+
+
+def test_jobs_chunk_ner_in_a_single_process(service, tmp_path, monkeypatch):
+    monkeypatch.setattr(run, "_nlp", spacy.blank("ru"))
+    monkeypatch.setattr(run, "NER_CHUNK_CHARS", 200)
+    monkeypatch.setattr(run, "NER_PROCESSES", 4)
+    seen = []
+
+    def spy(text, nlp, max_chars, n_process=1):
+        seen.append(n_process)
+        return []
+
+    monkeypatch.setattr(run, "extract_entities_chunked", spy)
+    text = "Мощность котла: 120 кВт\n" * 20
+    (tmp_path / "in" / "long.txt").write_text(text, encoding="utf-8")
+    service._run_job({"text": text}, 0.0)
+    service._run_job({"path": str(tmp_path / "in" / "long.txt"), "use_cache": False}, 0.0)
+    assert seen == [1, 1]